@@ -0,0 +1,159 @@
+"""
+Fixtures for the benchmark suite.
+
+Benchmarks run offline: instead of a Consul container they talk to a
+minimal in-process HTTP server answering every request with a canned KV
+entry, which keeps the measured time focused on the client side, or
+decode canned `consul.base.Response` of realistic sizes.
+
+Results can be tracked over time with pytest-benchmark's storage, e.g.
+``tox -e benchmark -- --benchmark-autosave`` on a baseline, then
+``tox -e benchmark -- --benchmark-compare --benchmark-compare-fail=mean:10%``
+to fail on a regression.
+"""
+
+from __future__ import annotations
+
+import base64
+import http.server
+import json
+import os
+import tempfile
+import threading
+
+import pytest
+
+from consul.base import Response
+from tests.utils import CannedHandler, serve_unix
+
+KV_BODY = json.dumps([
+    {
+        "CreateIndex": 100,
+        "ModifyIndex": 200,
+        "LockIndex": 0,
+        "Key": "foo",
+        "Flags": 0,
+        "Value": base64.b64encode(b"bar").decode("utf-8"),
+        "Session": None,
+    }
+]).encode("utf-8")
+
+
+#: number of entries of the canned responses: a single key, a service of a
+#: large deployment and a whole catalog
+SIZES = (1, 1_000, 50_000)
+
+HEADERS = {
+    "Content-Type": "application/json",
+    "X-Consul-Index": "4242",
+    "X-Consul-KnownLeader": "true",
+    "X-Consul-LastContact": "0",
+}
+
+
+def kv_entries(count: int) -> list[dict]:
+    return [
+        {
+            "CreateIndex": 100 + i,
+            "ModifyIndex": 200 + i,
+            "LockIndex": 0,
+            "Key": f"config/service-{i % 100}/key-{i}",
+            "Flags": 0,
+            "Value": base64.b64encode(f"value of key {i}".encode()).decode("utf-8"),
+            "Session": None,
+        }
+        for i in range(count)
+    ]
+
+
+def health_entries(count: int) -> list[dict]:
+    return [
+        {
+            "Node": {
+                "ID": f"40e4a748-2192-161a-0510-{i:012d}",
+                "Node": f"node-{i}",
+                "Address": f"10.{i // 65536 % 256}.{i // 256 % 256}.{i % 256}",
+                "Datacenter": "dc1",
+                "TaggedAddresses": {"lan": f"10.0.{i // 256 % 256}.{i % 256}", "wan": "198.18.0.1"},
+                "Meta": {"rack": f"rack-{i % 16}", "consul-network-segment": ""},
+                "CreateIndex": 10 + i,
+                "ModifyIndex": 20 + i,
+            },
+            "Service": {
+                "ID": f"web-{i}",
+                "Service": "web",
+                "Tags": ["v1", "primary"],
+                "Address": "",
+                "Meta": {"version": "1.2.3"},
+                "Port": 8080,
+                "Weights": {"Passing": 10, "Warning": 1},
+                "EnableTagOverride": False,
+                "CreateIndex": 30 + i,
+                "ModifyIndex": 40 + i,
+            },
+            "Checks": [
+                {
+                    "Node": f"node-{i}",
+                    "CheckID": "serfHealth",
+                    "Name": "Serf Health Status",
+                    "Status": "passing",
+                    "Notes": "",
+                    "Output": "Agent alive and reachable",
+                    "ServiceID": "",
+                    "ServiceName": "",
+                    "ServiceTags": [],
+                },
+                {
+                    "Node": f"node-{i}",
+                    "CheckID": f"service:web-{i}",
+                    "Name": "Service 'web' check",
+                    "Status": "passing",
+                    "Notes": "",
+                    "Output": "HTTP GET http://localhost:8080/health: 200 OK",
+                    "ServiceID": f"web-{i}",
+                    "ServiceName": "web",
+                    "ServiceTags": ["v1", "primary"],
+                },
+            ],
+        }
+        for i in range(count)
+    ]
+
+
+@pytest.fixture(scope="session", params=SIZES, ids=lambda size: f"{size}-entries")
+def kv_response(request) -> Response:
+    """Response of a recursive KV read, the body being text as passed to the callbacks"""
+    return Response(200, HEADERS, json.dumps(kv_entries(request.param)))
+
+
+@pytest.fixture(scope="session", params=SIZES, ids=lambda size: f"{size}-entries")
+def health_response(request) -> Response:
+    """Response of a health service query"""
+    return Response(200, HEADERS, json.dumps(health_entries(request.param)))
+
+
+class KVHandler(CannedHandler):
+    body = KV_BODY
+    extra_headers = {"X-Consul-Index": "200"}
+
+
+class TCPKVHandler(KVHandler):
+    # headers and body are written separately, don't let Nagle's algorithm
+    # and delayed ACKs add 40ms to every loopback round trip
+    disable_nagle_algorithm = True
+
+
+@pytest.fixture(scope="session")
+def tcp_agent():
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), TCPKVHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server.server_address[1]
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture(scope="session")
+def unix_agent():
+    with tempfile.TemporaryDirectory() as tmp, serve_unix(os.path.join(tmp, "consul.sock"), KVHandler) as path:
+        yield path
@@ -0,0 +1,766 @@
+"""
+In-process stand-in for a Consul agent, to load test the clients offline.
+
+It implements the KV, catalog, health, session and txn endpoints on an
+aiohttp server, with blocking queries, configurable latency and errors and
+synthetic data sets of any size::
+
+    fake = FakeConsul(latency=0.002)
+    fake.populate(nodes=1000, services=50, instances=20, keys=10_000)
+    with fake.serve_in_thread() as port:
+        c = consul.Consul(port=port)
+        index, nodes = c.health.service("service-1", passing=True)
+
+or as a separate process, so that the server doesn't compete with the
+measured client for the GIL::
+
+    python -m benchmarks.fake_consul --port 8500 --nodes 1000 --keys 10000
+
+It's not a simulation of a cluster: there's a single datacenter and no ACL,
+sessions never expire, and the index of the catalog and health queries is
+the index of the whole catalog rather than of the service queried.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import base64
+import bisect
+import contextlib
+import json
+import logging
+import random
+import threading
+import uuid
+from typing import TYPE_CHECKING, Any
+
+from aiohttp import web
+
+from consul.base import parse_duration
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+
+log = logging.getLogger(__name__)
+
+Query = tuple[int, Any]
+
+
+class TxnError(Exception):
+    pass
+
+
+class Body(dict):
+    """JSON object of a request body, whose fields are case insensitive as with Consul"""
+
+    def __init__(self, fields: dict) -> None:
+        super().__init__((key.lower(), value) for key, value in fields.items())
+
+    def __getitem__(self, key: str) -> Any:
+        return super().__getitem__(key.lower())
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, str) and super().__contains__(key.lower())
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return super().get(key.lower(), default)
+
+
+class FakeConsul:
+    """
+    Fake Consul agent of datacenter *dc*.
+
+    Every request is answered after *latency* seconds plus up to *jitter*
+    random seconds, and a *error_rate* fraction of them fails with
+    *error_status*. Blocking queries wait at most *max_wait* seconds,
+    whatever their *wait*. *seed* makes the latency, the errors and the
+    synthetic data reproducible.
+
+    *requests* is the number of requests received and *errors* the number
+    of injected errors.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 500,
+        max_wait: float = 600.0,
+        dc: str = "dc1",
+        seed: int | None = None,
+    ) -> None:
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.max_wait = max_wait
+        self.dc = dc
+        self.requests = 0
+        self.errors = 0
+        self._random = random.Random(seed)
+        self.index = 1
+        # last index at which each table changed
+        self.indexes = {"kv": 1, "catalog": 1, "sessions": 1}
+        self.kv: dict[str, dict] = {}
+        self._keys: list[str] = []
+        self._tombstones: dict[str, int] = {}
+        self.nodes: dict[str, dict] = {}
+        self.services: dict[tuple[str, str], dict] = {}
+        self.checks: dict[tuple[str, str], dict] = {}
+        self.sessions: dict[str, dict] = {}
+        self._changed: asyncio.Event | None = None
+        self._runner: web.AppRunner | None = None
+
+    #
+    # Serving
+
+    def app(self) -> web.Application:
+        app = web.Application(middlewares=[self._middleware], client_max_size=64 * 1024 * 1024)
+        app.router.add_get("/v1/status/leader", self.leader)
+        app.router.add_get("/v1/kv/{key:.*}", self.kv_get)
+        app.router.add_put("/v1/kv/{key:.*}", self.kv_put)
+        app.router.add_delete("/v1/kv/{key:.*}", self.kv_delete)
+        app.router.add_put("/v1/txn", self.txn)
+        app.router.add_get("/v1/catalog/nodes", self.catalog_nodes)
+        app.router.add_get("/v1/catalog/services", self.catalog_services)
+        app.router.add_get("/v1/catalog/service/{service}", self.catalog_service)
+        app.router.add_get("/v1/catalog/node/{node}", self.catalog_node)
+        app.router.add_put("/v1/catalog/register", self.catalog_register)
+        app.router.add_put("/v1/catalog/deregister", self.catalog_deregister)
+        app.router.add_get("/v1/health/service/{service}", self.health_service)
+        app.router.add_get("/v1/health/checks/{service}", self.health_checks)
+        app.router.add_get("/v1/health/node/{node}", self.health_node)
+        app.router.add_get("/v1/health/state/{state}", self.health_state)
+        app.router.add_put("/v1/session/create", self.session_create)
+        app.router.add_put("/v1/session/destroy/{session_id}", self.session_destroy)
+        app.router.add_put("/v1/session/renew/{session_id}", self.session_renew)
+        app.router.add_get("/v1/session/info/{session_id}", self.session_info)
+        app.router.add_get("/v1/session/node/{node}", self.session_node)
+        app.router.add_get("/v1/session/list", self.session_list)
+        return app
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> int:
+        """Starts serving on the running loop, returns the port listened to"""
+        self._changed = asyncio.Event()
+        self._runner = web.AppRunner(self.app(), access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        return self._runner.addresses[0][1]
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    @contextlib.contextmanager
+    def serve_in_thread(self, host: str = "127.0.0.1", port: int = 0) -> Iterator[int]:
+        """Serves from a thread running its own loop while in the block, yields the port listened to"""
+        loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=loop.run_forever, name="fake-consul", daemon=True)
+        thread.start()
+        try:
+            yield asyncio.run_coroutine_threadsafe(self.start(host, port), loop).result()
+        finally:
+            asyncio.run_coroutine_threadsafe(self.stop(), loop).result()
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
+
+    @web.middleware
+    async def _middleware(self, request: web.Request, handler: Callable) -> web.StreamResponse:
+        self.requests += 1
+        delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay:
+            await asyncio.sleep(delay)
+        if self.error_rate and self._random.random() < self.error_rate:
+            self.errors += 1
+            return web.Response(status=self.error_status, text="rpc error making call: No cluster leader")
+        return await handler(request)
+
+    #
+    # Responses
+
+    @staticmethod
+    def _headers(index: int) -> dict[str, str]:
+        return {"X-Consul-Index": str(index), "X-Consul-KnownLeader": "true", "X-Consul-LastContact": "0"}
+
+    def _json(self, data: Any, index: int | None = None, status: int = 200) -> web.Response:
+        return web.Response(
+            body=json.dumps(data).encode("utf-8"),
+            status=status,
+            content_type="application/json",
+            headers=self._headers(self.index if index is None else index),
+        )
+
+    async def _blocking(
+        self, request: web.Request, query: Callable[[], Query], not_found: bool = False
+    ) -> web.Response:
+        """
+        Answers *request* with the result of *query*, once its index is
+        greater than the one of a blocking query. With *not_found*, an
+        empty result is a 404.
+        """
+        index, data = query()
+        if "index" in request.query:
+            wanted = int(request.query["index"])
+            loop = asyncio.get_running_loop()
+            wait = min(parse_duration(request.query.get("wait", "5m")), self.max_wait)
+            deadline = loop.time() + wait
+            while index <= wanted and self._changed is not None:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                with contextlib.suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(self._changed.wait(), remaining)
+                index, data = query()
+        if not_found and data is None:
+            return web.Response(status=404, headers=self._headers(index))
+        return self._json(data, index)
+
+    def _commit(self, *tables: str) -> int:
+        """Returns the index of a new write to *tables*, waking the blocking queries up"""
+        self.index += 1
+        for table in tables:
+            self.indexes[table] = self.index
+        if self._changed is not None:
+            self._changed.set()
+            self._changed = asyncio.Event()
+        return self.index
+
+    async def leader(self, request: web.Request) -> web.Response:  # pylint: disable=unused-argument
+        return self._json("127.0.0.1:8300")
+
+    #
+    # KV
+
+    def _prefixed(self, prefix: str) -> list[str]:
+        start = bisect.bisect_left(self._keys, prefix)
+        end = start
+        while end < len(self._keys) and self._keys[end].startswith(prefix):
+            end += 1
+        return self._keys[start:end]
+
+    def _kv_index(self, prefix: str, entries: list[dict]) -> int:
+        indexes = [entry["ModifyIndex"] for entry in entries]
+        indexes.extend(index for key, index in self._tombstones.items() if key.startswith(prefix))
+        return max(indexes, default=self.indexes["kv"])
+
+    def _write_kv(self, changes: dict[str, dict | None]) -> int:
+        """Applies *changes*, the new entries by key, None deleting the key, in a single write"""
+        index = self._commit("kv")
+        for key, entry in changes.items():
+            previous = self.kv.get(key)
+            if entry is None:
+                if previous is not None:
+                    del self.kv[key]
+                    del self._keys[bisect.bisect_left(self._keys, key)]
+                    self._tombstones[key] = index
+                continue
+            entry["CreateIndex"] = previous["CreateIndex"] if previous else index
+            entry["ModifyIndex"] = index
+            if previous is None:
+                bisect.insort(self._keys, key)
+                self._tombstones.pop(key, None)
+            self.kv[key] = entry
+        return index
+
+    @staticmethod
+    def _entry(key: str, value: bytes | None, flags: int = 0, previous: dict | None = None) -> dict:
+        return {
+            "LockIndex": previous["LockIndex"] if previous else 0,
+            "Key": key,
+            "Flags": flags,
+            "Value": None if value is None else base64.b64encode(value).decode("ascii"),
+            "Session": previous["Session"] if previous else None,
+        }
+
+    async def kv_get(self, request: web.Request) -> web.StreamResponse:
+        key = request.match_info["key"]
+        params = request.query
+
+        def query() -> Query:
+            if "recurse" not in params and "keys" not in params:
+                entry = self.kv.get(key)
+                if entry is None:
+                    return self._tombstones.get(key, self.indexes["kv"]), None
+                return entry["ModifyIndex"], [entry]
+            keys = self._prefixed(key)
+            entries = [self.kv[k] for k in keys]
+            index = self._kv_index(key, entries)
+            if "recurse" in params:
+                return index, entries or None
+            separator = params.get("separator")
+            if separator:
+                rolled: dict[str, None] = {}
+                for k in keys:
+                    position = k.find(separator, len(key))
+                    rolled[k if position < 0 else k[: position + len(separator)]] = None
+                keys = list(rolled)
+            return index, keys or None
+
+        response = await self._blocking(request, query, not_found=True)
+        if "raw" in params and response.status == 200:
+            value = self.kv[key]["Value"]
+            headers = self._headers(int(response.headers["X-Consul-Index"]))
+            return web.Response(body=base64.b64decode(value) if value else b"", headers=headers)
+        return response
+
+    async def kv_put(self, request: web.Request) -> web.Response:
+        key = request.match_info["key"]
+        params = request.query
+        previous = self.kv.get(key)
+        if "cas" in params:
+            cas = int(params["cas"])
+            if (cas == 0 and previous is not None) or (cas and (previous is None or previous["ModifyIndex"] != cas)):
+                return self._json(False)
+        entry = self._entry(key, await request.read(), int(params.get("flags", 0)), previous)
+        if "acquire" in params:
+            session = params["acquire"]
+            if session not in self.sessions or (previous and previous["Session"] not in (None, session)):
+                return self._json(False)
+            if entry["Session"] != session:
+                entry["LockIndex"] += 1
+            entry["Session"] = session
+        elif "release" in params:
+            if not previous or previous["Session"] != params["release"]:
+                return self._json(False)
+            entry["Session"] = None
+        self._write_kv({key: entry})
+        return self._json(True)
+
+    async def kv_delete(self, request: web.Request) -> web.Response:
+        key = request.match_info["key"]
+        params = request.query
+        if "recurse" in params:
+            self._write_kv(dict.fromkeys(self._prefixed(key)))
+            return self._json(True)
+        previous = self.kv.get(key)
+        if "cas" in params and (previous is None or previous["ModifyIndex"] != int(params["cas"])):
+            return self._json(False)
+        self._write_kv({key: None})
+        return self._json(True)
+
+    #
+    # Txn
+
+    async def txn(self, request: web.Request) -> web.Response:
+        """Atomically applies the KV operations of a transaction, the others aren't supported"""
+        operations = await request.json()
+        staged: dict[str, dict | None] = {}
+        reads: list[tuple[int, str]] = []
+        errors = []
+        for position, operation in enumerate(map(Body, operations)):
+            try:
+                if "KV" not in operation:
+                    raise TxnError(f"operation not supported by the fake: {', '.join(operation)}")
+                self._txn_kv(position, Body(operation["KV"]), staged, reads)
+            except TxnError as e:
+                errors.append({"OpIndex": position, "What": str(e)})
+        if errors:
+            return self._json({"Results": None, "Errors": errors}, status=409)
+        if staged:
+            self._write_kv(staged)
+        results = []
+        for _, key in reads:
+            entry = self.kv.get(key)
+            if entry is not None:
+                results.append({"KV": entry})
+        return self._json({"Results": results, "Errors": None})
+
+    def _txn_kv(
+        self, position: int, operation: dict, staged: dict[str, dict | None], reads: list[tuple[int, str]]
+    ) -> None:
+        verb = operation["Verb"]
+        key = operation.get("Key", "")
+
+        def current(k: str) -> dict | None:
+            return staged[k] if k in staged else self.kv.get(k)
+
+        entry = current(key)
+        if verb in ("cas", "check-index", "delete-cas") and (
+            entry is None or entry.get("ModifyIndex") != operation.get("Index")
+        ):
+            raise TxnError(
+                f'current modify index {entry and entry.get("ModifyIndex")} for "{key}" != {operation.get("Index")}'
+            )
+        if verb == "check-not-exists" and entry is not None:
+            raise TxnError(f'key "{key}" exists')
+        if verb in ("get", "check-index") and entry is None:
+            raise TxnError(f'key "{key}" doesn\'t exist')
+        if verb in ("set", "cas"):
+            value = operation.get("Value")
+            staged[key] = self._entry(key, base64.b64decode(value) if value else b"", operation.get("Flags", 0), entry)
+            reads.append((position, key))
+        elif verb in ("delete", "delete-cas"):
+            staged[key] = None
+        elif verb == "delete-tree":
+            staged.update(dict.fromkeys(k for k in self._prefixed(key) if current(k) is not None))
+            staged.update({k: None for k in staged if k.startswith(key)})
+        elif verb == "get":
+            reads.append((position, key))
+        elif verb == "get-tree":
+            reads.extend((position, k) for k in self._prefixed(key) if current(k) is not None)
+        elif verb not in ("check-index", "check-not-exists"):
+            raise TxnError(f"unknown KV verb {verb!r}")
+
+    #
+    # Catalog and health
+
+    def _service_entry(self, node: dict, service: dict) -> dict:
+        return {
+            "ID": node["ID"],
+            "Node": node["Node"],
+            "Address": node["Address"],
+            "Datacenter": self.dc,
+            "TaggedAddresses": node["TaggedAddresses"],
+            "NodeMeta": node["Meta"],
+            "ServiceID": service["ID"],
+            "ServiceName": service["Service"],
+            "ServiceTags": service["Tags"],
+            "ServiceAddress": service["Address"],
+            "ServiceMeta": service["Meta"],
+            "ServicePort": service["Port"],
+            "ServiceWeights": service["Weights"],
+            "ServiceEnableTagOverride": False,
+            "CreateIndex": service["CreateIndex"],
+            "ModifyIndex": service["ModifyIndex"],
+        }
+
+    def _instances(self, name: str, tags: list[str]) -> list[tuple[dict, dict]]:
+        return [
+            (self.nodes[node], service)
+            for (node, _), service in self.services.items()
+            if service["Service"] == name and all(tag in service["Tags"] for tag in tags)
+        ]
+
+    def _node_checks(self, node: str, service_id: str | None = None) -> list[dict]:
+        return [
+            check
+            for (check_node, _), check in self.checks.items()
+            if check_node == node and check["ServiceID"] in ("", service_id)
+        ]
+
+    async def catalog_nodes(self, request: web.Request) -> web.Response:
+        return await self._blocking(request, lambda: (self.indexes["catalog"], list(self.nodes.values())))
+
+    async def catalog_services(self, request: web.Request) -> web.Response:
+        def query() -> Query:
+            services: dict[str, set[str]] = {}
+            for service in self.services.values():
+                services.setdefault(service["Service"], set()).update(service["Tags"])
+            return self.indexes["catalog"], {name: sorted(tags) for name, tags in services.items()}
+
+        return await self._blocking(request, query)
+
+    async def catalog_service(self, request: web.Request) -> web.Response:
+        name = request.match_info["service"]
+        tags = request.query.getall("tag", [])
+        return await self._blocking(
+            request,
+            lambda: (
+                self.indexes["catalog"],
+                [self._service_entry(node, service) for node, service in self._instances(name, tags)],
+            ),
+        )
+
+    async def catalog_node(self, request: web.Request) -> web.Response:
+        name = request.match_info["node"]
+
+        def query() -> Query:
+            if name not in self.nodes:
+                return self.indexes["catalog"], None
+            services = {service["ID"]: service for (node, _), service in self.services.items() if node == name}
+            return self.indexes["catalog"], {"Node": self.nodes[name], "Services": services}
+
+        return await self._blocking(request, query)
+
+    async def catalog_register(self, request: web.Request) -> web.Response:
+        registration = Body(await request.json())
+        index = self._commit("catalog")
+        self._register(registration, index)
+        return self._json(True)
+
+    def _register(self, registration: dict, index: int) -> None:
+        name = registration["Node"]
+        previous = self.nodes.get(name)
+        self.nodes[name] = {
+            "ID": registration.get("ID") or (previous and previous["ID"]) or str(uuid.uuid4()),
+            "Node": name,
+            "Address": registration.get("Address", ""),
+            "Datacenter": self.dc,
+            "TaggedAddresses": registration.get("TaggedAddresses") or {},
+            "Meta": registration.get("NodeMeta") or {},
+            "CreateIndex": previous["CreateIndex"] if previous else index,
+            "ModifyIndex": index,
+        }
+        service = registration.get("Service")
+        if service:
+            service = Body(service)
+            service_id = service.get("ID") or service["Service"]
+            previous = self.services.get((name, service_id))
+            self.services[name, service_id] = {
+                "ID": service_id,
+                "Service": service["Service"],
+                "Tags": service.get("Tags") or [],
+                "Address": service.get("Address", ""),
+                "Meta": service.get("Meta") or {},
+                "Port": service.get("Port", 0),
+                "Weights": service.get("Weights") or {"Passing": 1, "Warning": 1},
+                "EnableTagOverride": False,
+                "CreateIndex": previous["CreateIndex"] if previous else index,
+                "ModifyIndex": index,
+            }
+        checks = registration.get("Checks") or ([registration["Check"]] if registration.get("Check") else [])
+        for check in map(Body, checks):
+            service_id = check.get("ServiceID", "")
+            service = self.services.get((name, service_id)) if service_id else None
+            previous = self.checks.get((name, check["CheckID"]))
+            self.checks[name, check["CheckID"]] = {
+                "Node": name,
+                "CheckID": check["CheckID"],
+                "Name": check.get("Name", check["CheckID"]),
+                "Status": check.get("Status", "critical"),
+                "Notes": check.get("Notes", ""),
+                "Output": check.get("Output", ""),
+                "ServiceID": service_id,
+                "ServiceName": service["Service"] if service else "",
+                "ServiceTags": service["Tags"] if service else [],
+                "CreateIndex": previous["CreateIndex"] if previous else index,
+                "ModifyIndex": index,
+            }
+
+    async def catalog_deregister(self, request: web.Request) -> web.Response:
+        deregistration = Body(await request.json())
+        name = deregistration["Node"]
+        self._commit("catalog")
+        if deregistration.get("ServiceID"):
+            self.services.pop((name, deregistration["ServiceID"]), None)
+            for key in [
+                key
+                for key, check in self.checks.items()
+                if key[0] == name and check["ServiceID"] == deregistration["ServiceID"]
+            ]:
+                del self.checks[key]
+        elif deregistration.get("CheckID"):
+            self.checks.pop((name, deregistration["CheckID"]), None)
+        else:
+            self.nodes.pop(name, None)
+            for table in (self.services, self.checks):
+                for key in [key for key in table if key[0] == name]:
+                    del table[key]
+        return self._json(True)
+
+    async def health_service(self, request: web.Request) -> web.Response:
+        name = request.match_info["service"]
+        tags = request.query.getall("tag", [])
+        passing = "passing" in request.query
+
+        def query() -> Query:
+            entries = []
+            for node, service in self._instances(name, tags):
+                checks = self._node_checks(node["Node"], service["ID"])
+                if passing and any(check["Status"] != "passing" for check in checks):
+                    continue
+                entries.append({"Node": node, "Service": service, "Checks": checks})
+            return self.indexes["catalog"], entries
+
+        return await self._blocking(request, query)
+
+    async def health_checks(self, request: web.Request) -> web.Response:
+        name = request.match_info["service"]
+        return await self._blocking(
+            request,
+            lambda: (
+                self.indexes["catalog"],
+                [check for check in self.checks.values() if check["ServiceName"] == name],
+            ),
+        )
+
+    async def health_node(self, request: web.Request) -> web.Response:
+        name = request.match_info["node"]
+        return await self._blocking(
+            request,
+            lambda: (self.indexes["catalog"], [check for check in self.checks.values() if check["Node"] == name]),
+        )
+
+    async def health_state(self, request: web.Request) -> web.Response:
+        state = request.match_info["state"]
+        return await self._blocking(
+            request,
+            lambda: (
+                self.indexes["catalog"],
+                [check for check in self.checks.values() if state in ("any", check["Status"])],
+            ),
+        )
+
+    #
+    # Sessions
+
+    async def session_create(self, request: web.Request) -> web.Response:
+        body = Body(await request.json() if request.can_read_body else {})
+        index = self._commit("sessions")
+        session_id = str(uuid.uuid4())
+        self.sessions[session_id] = {
+            "ID": session_id,
+            "Name": body.get("Name", ""),
+            "Node": body.get("Node", "fake-consul"),
+            "LockDelay": body.get("LockDelay", "15s"),
+            "Behavior": body.get("Behavior", "release"),
+            "TTL": body.get("TTL", ""),
+            "NodeChecks": body.get("NodeChecks") or ["serfHealth"],
+            "ServiceChecks": body.get("ServiceChecks"),
+            "CreateIndex": index,
+            "ModifyIndex": index,
+        }
+        return self._json({"ID": session_id})
+
+    async def session_destroy(self, request: web.Request) -> web.Response:
+        session = self.sessions.get(request.match_info["session_id"])
+        if session is None:
+            return self._json(True)
+        del self.sessions[session["ID"]]
+        held = [key for key, entry in self.kv.items() if entry["Session"] == session["ID"]]
+        changes: dict[str, dict | None] = {}
+        for key in held:
+            if session["Behavior"] == "delete":
+                changes[key] = None
+            else:
+                changes[key] = {**self.kv[key], "Session": None}
+        self._commit("sessions")
+        if changes:
+            self._write_kv(changes)
+        return self._json(True)
+
+    async def session_renew(self, request: web.Request) -> web.Response:
+        session = self.sessions.get(request.match_info["session_id"])
+        if session is None:
+            return web.Response(status=404, text=f"Session id '{request.match_info['session_id']}' not found")
+        return self._json([session])
+
+    async def session_info(self, request: web.Request) -> web.Response:
+        session_id = request.match_info["session_id"]
+        return await self._blocking(
+            request,
+            lambda: (self.indexes["sessions"], [self.sessions[session_id]] if session_id in self.sessions else None),
+        )
+
+    async def session_node(self, request: web.Request) -> web.Response:
+        node = request.match_info["node"]
+        return await self._blocking(
+            request,
+            lambda: (
+                self.indexes["sessions"],
+                [session for session in self.sessions.values() if session["Node"] == node],
+            ),
+        )
+
+    async def session_list(self, request: web.Request) -> web.Response:
+        return await self._blocking(request, lambda: (self.indexes["sessions"], list(self.sessions.values())))
+
+    #
+    # Synthetic data
+
+    def populate(
+        self,
+        nodes: int = 0,
+        services: int = 0,
+        instances: int = 1,
+        keys: int = 0,
+        value_size: int = 32,
+        critical: float = 0.0,
+    ) -> None:
+        """
+        Adds *nodes* nodes (``node-<i>``), *services* services
+        (``service-<i>``) registered on *instances* nodes each, a *critical*
+        fraction of them failing their check, and *keys* KV entries
+        (``app/<i % 100>/key-<i>``) of *value_size* bytes, in a single
+        write.
+        """
+        index = self._commit("catalog", "kv")
+        for i in range(nodes):
+            self._register(
+                {
+                    "Node": f"node-{i}",
+                    "ID": str(uuid.UUID(int=self._random.getrandbits(128))),
+                    "Address": f"10.{i // 65536 % 256}.{i // 256 % 256}.{i % 256}",
+                    "TaggedAddresses": {"lan": f"10.{i // 65536 % 256}.{i // 256 % 256}.{i % 256}"},
+                    "NodeMeta": {"rack": f"rack-{i % 16}"},
+                    "Check": {"CheckID": "serfHealth", "Name": "Serf Health Status", "Status": "passing"},
+                },
+                index,
+            )
+        for s in range(services if nodes else 0):
+            for n in range(instances):
+                node = f"node-{(s * instances + n) % nodes}"
+                service_id = f"service-{s}-{n}"
+                status = "critical" if self._random.random() < critical else "passing"
+                self._register(
+                    {
+                        "Node": node,
+                        "Address": self.nodes[node]["Address"],
+                        "Service": {
+                            "ID": service_id,
+                            "Service": f"service-{s}",
+                            "Tags": ["v1", f"shard-{n % 4}"],
+                            "Port": 8000 + n,
+                            "Meta": {"version": "1.0.0"},
+                        },
+                        "Check": {"CheckID": f"service:{service_id}", "ServiceID": service_id, "Status": status},
+                    },
+                    index,
+                )
+        value = b"x" * value_size
+        for i in range(keys):
+            key = f"app/{i % 100}/key-{i}"
+            entry = self._entry(key, value)
+            entry["CreateIndex"] = entry["ModifyIndex"] = index
+            self.kv[key] = entry
+        self._keys = sorted(self.kv)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8500)
+    parser.add_argument("--nodes", type=int, default=0)
+    parser.add_argument("--services", type=int, default=0)
+    parser.add_argument("--instances", type=int, default=1, help="instances of each service")
+    parser.add_argument("--keys", type=int, default=0)
+    parser.add_argument("--value-size", type=int, default=32)
+    parser.add_argument("--critical", type=float, default=0.0, help="fraction of failing service checks")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="random seconds added to the latency")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, default=500)
+    parser.add_argument("--max-wait", type=float, default=600.0, help="cap of the blocking queries, in seconds")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    fake = FakeConsul(
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        max_wait=args.max_wait,
+        seed=args.seed,
+    )
+    fake.populate(args.nodes, args.services, args.instances, args.keys, args.value_size, args.critical)
+
+    async def serve() -> None:
+        port = await fake.start(args.host, args.port)
+        log.info("fake consul listening on %s:%d", args.host, port)
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await fake.stop()
+
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(serve())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,368 @@
+"""
+End-to-end load harness: how many blocking queries a process keeps open,
+at what cost, and how long a `KV.put` takes to reach every watcher.
+
+*watchers* blocking queries watch *keys* KV keys while *writers* put them
+*rate* times per second each, through one std client (a thread per watcher
+and writer) or aio client (a task per watcher and writer)::
+
+    python -m benchmarks.harness --client aio --watchers 1000 --writers 4 --duration 30
+
+By default the agent is a `benchmarks.fake_consul` server started in a
+separate process, so that it doesn't compete with the client for the GIL
+nor count in its CPU time; ``--port`` points the harness to a running
+agent instead. The report tells:
+
+- the requests per second sent by the client and the CPU time of the
+  process per request, while the writers run;
+- the resident memory added by establishing the watches, per watch;
+- percentiles of the propagation latency, from sending a put to each
+  watcher receiving it ('latency'), and to the last of the watchers of
+  the key receiving it ('propagation'). A value overwritten before a
+  watcher saw it only counts for the watchers which did.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import itertools
+import json
+import os
+import resource
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+from typing import TYPE_CHECKING, Any
+
+import aiohttp
+import requests
+
+import consul
+import consul.aio
+import consul.std
+from consul.instrumentation import Hook, Request
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator, Sequence
+
+
+class Counter(Hook):
+    """Counts the requests sent, retries included, and the failed ones"""
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.errors = 0
+        self._lock = threading.Lock()
+
+    def after(self, request: Request) -> None:
+        with self._lock:
+            self.requests += max(1, request.attempts)
+            if request.error is not None or (request.status or 0) >= 500:
+                self.errors += 1
+
+
+class Tracker:
+    """
+    Tracks the values put by the writers and received by the watchers, a
+    value identifying its write and telling when it was sent.
+    *watchers_per_key* is the number of watchers of each key.
+    """
+
+    def __init__(self, watchers_per_key: Sequence[int]) -> None:
+        self.watchers_per_key = watchers_per_key
+        self.latencies: list[float] = []
+        self.propagations: list[float] = []
+        self.recording = False
+        self._writes = itertools.count()
+        self._lock = threading.Lock()
+        # number of watchers which received each value
+        self._pending: dict[str, int] = {}
+
+    def value(self) -> str:
+        value = f"{next(self._writes)}:{time.perf_counter()!r}"
+        if self.recording:
+            with self._lock:
+                self._pending[value] = 0
+        return value
+
+    def received(self, key: int, value: bytes | None) -> None:
+        now = time.perf_counter()
+        if not value:
+            return
+        decoded = value.decode()
+        with self._lock:
+            seen = self._pending.get(decoded)
+            if seen is None:
+                return
+            latency = now - float(decoded.split(":")[1])
+            self.latencies.append(latency)
+            if seen + 1 == self.watchers_per_key[key]:
+                self.propagations.append(latency)
+                del self._pending[decoded]
+            else:
+                self._pending[decoded] = seen + 1
+
+
+def percentiles(values: Sequence[float], qs: Sequence[float] = (0.5, 0.9, 0.99)) -> dict[str, float | None]:
+    ordered = sorted(values)
+    result: dict[str, float | None] = {
+        f"p{q * 100:g}": ordered[min(len(ordered) - 1, int(q * len(ordered)))] if ordered else None for q in qs
+    }
+    result["max"] = ordered[-1] if ordered else None
+    return result
+
+
+def rss() -> int:
+    """Returns the resident memory of the process, in bytes"""
+    try:
+        with open("/proc/self/statm", encoding="ascii") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        # no procfs, the peak rather than the current one
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+class Harness:
+    """Runs the workload described by the command line *args* against the agent on *port*"""
+
+    def __init__(self, args: argparse.Namespace, port: int) -> None:
+        self.args = args
+        self.port = port
+        self.keys = [f"bench/key-{k}" for k in range(args.keys)]
+        self.tracker = Tracker([len(range(k, args.watchers, args.keys)) for k in range(args.keys)])
+        self.counter = Counter()
+        self.running = True
+        self.established = 0
+        self._lock = threading.Lock()
+        self._measure: dict[str, float] = {}
+
+    def _established(self) -> None:
+        with self._lock:
+            self.established += 1
+
+    @contextlib.contextmanager
+    def _measured(self) -> Iterator[None]:
+        """Measures the requests sent, the CPU time and the time elapsed in the block"""
+        requests_sent = self.counter.requests
+        cpu = time.process_time()
+        start = time.perf_counter()
+        self.tracker.recording = True
+        try:
+            yield
+        finally:
+            self.tracker.recording = False
+            self._measure = {
+                "requests": self.counter.requests - requests_sent,
+                "cpu": time.process_time() - cpu,
+                "elapsed": time.perf_counter() - start,
+            }
+
+    def results(self, memory: int) -> dict[str, Any]:
+        args = self.args
+        sent, cpu, elapsed = self._measure["requests"], self._measure["cpu"], self._measure["elapsed"]
+        return {
+            "client": args.client,
+            "watchers": args.watchers,
+            "writers": args.writers,
+            "keys": args.keys,
+            "rate": args.rate,
+            "duration": elapsed,
+            "requests": sent,
+            "errors": self.counter.errors,
+            "requests_per_second": sent / elapsed,
+            "cpu_per_request": cpu / sent if sent else None,
+            "memory_per_watch": memory / args.watchers if args.watchers else None,
+            "latency": percentiles(self.tracker.latencies),
+            "propagation": percentiles(self.tracker.propagations),
+            "samples": len(self.tracker.latencies),
+        }
+
+    #
+    # std
+
+    def run_std(self) -> dict[str, Any]:
+        args = self.args
+        c = consul.Consul(port=self.port, hooks=[self.counter])
+        # one connection per thread: with requests' default pool of 10, the
+        # threads beyond it would open and close a connection per request
+        c.http.session.mount("http://", consul.std.KeepAliveAdapter(pool_maxsize=args.watchers + args.writers))
+        memory = rss()
+        watchers = [
+            threading.Thread(target=self._std_watch, args=(c, i % args.keys), daemon=True) for i in range(args.watchers)
+        ]
+        for thread in watchers:
+            thread.start()
+        while self.established < args.watchers:
+            time.sleep(0.01)
+        memory = rss() - memory
+        writers = [threading.Thread(target=self._std_write, args=(c, i), daemon=True) for i in range(args.writers)]
+        with self._measured():
+            for thread in writers:
+                thread.start()
+            time.sleep(args.duration)
+            self.running = False
+            for thread in writers:
+                thread.join()
+        for key in self.keys:
+            # wakes the watchers up
+            c.kv.put(key, "")
+        for thread in watchers:
+            thread.join(timeout=5)
+        return self.results(memory)
+
+    def _std_watch(self, c: consul.Consul, key: int) -> None:
+        index = None
+        established = False
+        while self.running:
+            try:
+                index, entry = c.kv.get(self.keys[key], index=index, wait=self.args.wait)
+            except (consul.ConsulException, requests.RequestException):
+                time.sleep(0.1)
+                continue
+            if entry is not None:
+                self.tracker.received(key, entry["Value"])
+            if not established:
+                established = True
+                self._established()
+
+    def _std_write(self, c: consul.Consul, writer: int) -> None:
+        interval = 1.0 / self.args.rate
+        next_write = time.perf_counter()
+        for k in itertools.count(writer, self.args.writers):
+            if not self.running:
+                break
+            with contextlib.suppress(consul.ConsulException, requests.RequestException):
+                c.kv.put(self.keys[k % self.args.keys], self.tracker.value())
+            next_write += interval
+            time.sleep(max(0.0, next_write - time.perf_counter()))
+
+    #
+    # aio
+
+    async def run_aio(self) -> dict[str, Any]:
+        args = self.args
+        c = consul.aio.Consul(port=self.port, hooks=[self.counter], connections_limit=args.watchers + args.writers + 8)
+        try:
+            memory = rss()
+            watchers = [asyncio.create_task(self._aio_watch(c, i % args.keys)) for i in range(args.watchers)]
+            while self.established < args.watchers:
+                await asyncio.sleep(0.01)
+            memory = rss() - memory
+            with self._measured():
+                writers = [asyncio.create_task(self._aio_write(c, i)) for i in range(args.writers)]
+                await asyncio.sleep(args.duration)
+                self.running = False
+                await asyncio.gather(*writers)
+            for key in self.keys:
+                await c.kv.put(key, "")
+            await asyncio.wait(watchers, timeout=5)
+            return self.results(memory)
+        finally:
+            await c.close()
+
+    async def _aio_watch(self, c: consul.aio.Consul, key: int) -> None:
+        index = None
+        established = False
+        while self.running:
+            try:
+                index, entry = await c.kv.get(self.keys[key], index=index, wait=self.args.wait)
+            except (consul.ConsulException, aiohttp.ClientError, asyncio.TimeoutError):
+                await asyncio.sleep(0.1)
+                continue
+            if entry is not None:
+                self.tracker.received(key, entry["Value"])
+            if not established:
+                established = True
+                self._established()
+
+    async def _aio_write(self, c: consul.aio.Consul, writer: int) -> None:
+        interval = 1.0 / self.args.rate
+        next_write = time.perf_counter()
+        for k in itertools.count(writer, self.args.writers):
+            if not self.running:
+                break
+            with contextlib.suppress(consul.ConsulException, aiohttp.ClientError, asyncio.TimeoutError):
+                await c.kv.put(self.keys[k % self.args.keys], self.tracker.value())
+            next_write += interval
+            await asyncio.sleep(max(0.0, next_write - time.perf_counter()))
+
+
+@contextlib.contextmanager
+def fake_agent(latency: float = 0.0, timeout: float = 10.0) -> Iterator[int]:
+    """Runs a `benchmarks.fake_consul` server in a subprocess while in the block, yields its port"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    command = [sys.executable, "-m", "benchmarks.fake_consul", "--port", str(port), "--latency", str(latency)]
+    with subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL) as process:
+        try:
+            deadline = time.monotonic() + timeout
+            while True:
+                try:
+                    with urllib.request.urlopen(f"http://127.0.0.1:{port}/v1/status/leader", timeout=1):
+                        break
+                except OSError:
+                    if process.poll() is not None or time.monotonic() > deadline:
+                        raise RuntimeError("the fake consul server didn't start") from None
+                    time.sleep(0.05)
+            yield port
+        finally:
+            process.terminate()
+
+
+def _ms(seconds: float | None) -> str:
+    return "-" if seconds is None else f"{seconds * 1000:.2f}ms"
+
+
+def report(results: dict[str, Any]) -> str:
+    def latencies(name: str) -> str:
+        return " ".join(f"{q}={_ms(value)}" for q, value in results[name].items())
+
+    cpu = results["cpu_per_request"]
+    memory = results["memory_per_watch"]
+    return "\n".join([
+        (
+            f"client       {results['client']}: {results['watchers']} watchers of {results['keys']} keys, "
+            f"{results['writers']} writers at {results['rate']:g}/s"
+        ),
+        (
+            f"requests     {results['requests']} in {results['duration']:.1f}s: "
+            f"{results['requests_per_second']:.1f}/s, {results['errors']} errors"
+        ),
+        f"cpu          {'-' if cpu is None else f'{cpu * 1e6:.0f}µs'} per request",
+        f"memory       {'-' if memory is None else f'{memory / 1024:.1f}KiB'} per watch",
+        f"latency      {latencies('latency')} ({results['samples']} received)",
+        f"propagation  {latencies('propagation')}",
+    ])
+
+
+def main(argv: list[str] | None = None) -> dict[str, Any]:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--client", choices=("std", "aio"), default="std")
+    parser.add_argument("--watchers", type=int, default=100, help="blocking queries kept open")
+    parser.add_argument("--writers", type=int, default=1)
+    parser.add_argument("--keys", type=int, default=10, help="keys watched and written")
+    parser.add_argument("--rate", type=float, default=10.0, help="puts per second of each writer")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds the writers run")
+    parser.add_argument("--wait", default="30s", help="wait of the blocking queries")
+    parser.add_argument("--port", type=int, help="port of a running agent, a fake one is started if unset")
+    parser.add_argument("--latency", type=float, default=0.0, help="latency of the fake agent, in seconds")
+    parser.add_argument("--json", action="store_true", help="writes the results as JSON")
+    args = parser.parse_args(argv)
+
+    with contextlib.ExitStack() as stack:
+        port = args.port or stack.enter_context(fake_agent(args.latency))
+        harness = Harness(args, port)
+        results = harness.run_std() if args.client == "std" else asyncio.run(harness.run_aio())
+    sys.stdout.write((json.dumps(results, indent=2) if args.json else report(results)) + "\n")
+    return results
+
+
+if __name__ == "__main__":
+    main()
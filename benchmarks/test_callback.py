@@ -0,0 +1,46 @@
+"""
+Cost of decoding the responses with the `consul.callback.CB` callbacks, for
+canned responses of 1, 1k and 50k entries.
+
+Run with ``pytest benchmarks/test_callback.py --benchmark-only``.
+"""
+
+from __future__ import annotations
+
+import pytest
+
+from consul.callback import CB
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        {},
+        {"index": True},
+        {"meta": True},
+        {"one": True},
+        {"decode": "Value"},
+        {"decode": "Value", "index": True},
+    ],
+    ids=lambda options: ",".join(options) or "plain",
+)
+def test_kv(benchmark, kv_response, options) -> None:
+    benchmark.group = f"CB.json kv {len(kv_response.body)}B"
+    callback = CB.json(**options)
+    assert benchmark(callback, kv_response) is not None
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        {"index": True},
+        {"index": True, "intern": True},
+        {"index": True, "fields": ["Node.Node", "Node.Address", "Service.Port", "Checks.Status"]},
+    ],
+    ids=["index", "intern", "fields"],
+)
+def test_health(benchmark, health_response, options) -> None:
+    benchmark.group = f"CB.json health {len(health_response.body)}B"
+    callback = CB.json(**options)
+    _, nodes = benchmark(callback, health_response)
+    assert nodes
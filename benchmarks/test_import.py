@@ -0,0 +1,36 @@
+"""
+Start-up cost of the client: importing the package, creating a client and
+using an endpoint, each in a fresh interpreter.
+
+Run with ``pytest benchmarks/test_import.py --benchmark-only``, the time
+measured includes starting the interpreter, the import time alone is
+reported as ``import_seconds`` in the extra info.
+"""
+
+from __future__ import annotations
+
+import subprocess
+import sys
+
+import pytest
+
+STATEMENTS = {
+    "import consul": "import consul",
+    "from consul import ConsulException": "from consul import ConsulException",
+    "consul.Consul()": "import consul; consul.Consul()",
+    "consul.Consul().kv": "import consul; consul.Consul().kv",
+    "consul.aio.Consul": "import consul.aio",
+}
+
+
+def _run(statement: str) -> float:
+    code = f"import time; start = time.perf_counter(); {statement}; print(time.perf_counter() - start)"
+    return float(subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True).stdout)
+
+
+@pytest.mark.parametrize("statement", STATEMENTS.values(), ids=STATEMENTS.keys())
+def test_import(benchmark, statement) -> None:
+    benchmark.group = "start-up"
+    seconds: list[float] = []
+    benchmark.pedantic(lambda: seconds.append(_run(statement)), rounds=10, warmup_rounds=1)
+    benchmark.extra_info["import_seconds"] = min(seconds)
@@ -0,0 +1,141 @@
+"""
+Cost of building the requests, without sending them: `HTTPClient.uri` and
+the parameters and headers built by the API methods.
+
+Run with ``pytest benchmarks/test_request.py --benchmark-only``.
+"""
+
+from __future__ import annotations
+
+import pytest
+
+from consul import Check, base
+
+
+class NullHTTPClient(base.HTTPClient):
+    """Returns the requests built by the API methods instead of sending them"""
+
+    # pylint: disable=unused-argument
+
+    def _request(
+        self,
+        callback,
+        method,
+        path,
+        params=None,
+        headers=None,
+        data=None,
+        connections_timeout=None,
+        raw: bool = False,
+        max_stale=None,
+        stream: bool = False,
+    ):
+        return method, path, params, headers, data
+
+    def get(
+        self,
+        callback,
+        path,
+        params=None,
+        headers: dict[str, str] | None = None,
+        raw: bool = False,
+        connections_timeout=None,
+        max_stale=None,
+        reuse_for=None,
+        stream: bool = False,
+    ):
+        return self._request(callback, "GET", path, params, headers)
+
+    def put(
+        self,
+        callback,
+        path,
+        params=None,
+        data: str | bytes = "",
+        headers: dict[str, str] | None = None,
+        connections_timeout=None,
+    ):
+        return self._request(callback, "PUT", path, params, headers, data)
+
+    def delete(
+        self,
+        callback,
+        path,
+        params=None,
+        data: str | bytes = "",
+        headers: dict[str, str] | None = None,
+        connections_timeout=None,
+    ):
+        return self._request(callback, "DELETE", path, params, headers, data)
+
+    def post(
+        self,
+        callback,
+        path,
+        params=None,
+        data: str = "",
+        headers: dict[str, str] | None = None,
+        connections_timeout=None,
+    ):
+        return self._request(callback, "POST", path, params, headers, data)
+
+    def close(self) -> None:
+        pass
+
+
+class NullConsul(base.Consul):
+    def http_connect(self, host: str, port: int, scheme, verify: bool | str = True, cert=None):
+        return NullHTTPClient(host, port, scheme, verify, cert, **self.transport_options())
+
+
+CALLS = {
+    "kv.get": lambda c: c.kv.get("config/web/port"),
+    "kv.get blocking": lambda c: c.kv.get("config/web", recurse=True, index=4242, wait="30s", consistency="stale"),
+    "kv.put": lambda c: c.kv.put("config/web/port", "8080", cas=4242, flags=2),
+    "kv.delete": lambda c: c.kv.delete("config/web", recurse=True),
+    "catalog.nodes": lambda c: c.catalog.nodes(node_meta={"rack": "r1"}),
+    "catalog.service": lambda c: c.catalog.service("web", tag="v1", node_meta={"rack": "r1"}),
+    "health.service": lambda c: c.health.service("web", passing=True, tag="v1", index=4242, wait="10s"),
+    "health.state": lambda c: c.health.state("critical"),
+    "health.checks": lambda c: c.health.checks("web"),
+    "agent.services": lambda c: c.agent.services(),
+    "agent.service.register": lambda c: c.agent.service.register(
+        "web", service_id="web-1", port=8080, tags=["v1"], check=Check.http("http://localhost:8080/health", "10s")
+    ),
+    "session.create": lambda c: c.session.create(name="lock", ttl=30),
+    "txn.put": lambda c: c.txn.put([{"KV": {"Verb": "get", "Key": "config/web/port"}}]),
+    "acl.token.read": lambda c: c.acl.token.read("e0a4d1ab-5f0f-4dba-9b6a-4d0e1a3c7f4a"),
+}
+
+
+@pytest.fixture(scope="module")
+def client() -> NullConsul:
+    return NullConsul(token="secret", dc="dc1")
+
+
+@pytest.mark.parametrize("call", CALLS.values(), ids=CALLS.keys())
+def test_api(benchmark, client, call) -> None:
+    benchmark.group = "API request building"
+    method, path, _, _, _ = benchmark(call, client)
+    assert method in {"GET", "PUT", "DELETE", "POST"}
+    assert path.startswith("/v1/")
+
+
+@pytest.mark.parametrize(
+    ("path", "params"),
+    [
+        ("/v1/agent/services", None),
+        ("/v1/kv/config/web/port", [("dc", "dc1")]),
+        ("/v1/health/service/web", [("index", 4242), ("wait", "10s"), ("passing", "1"), ("tag", "v1"), ("dc", "dc1")]),
+        ("/v1/kv/config/with spaces/é", [("recurse", "1")]),
+    ],
+    ids=["no-params", "dc", "blocking", "quoted"],
+)
+def test_uri(benchmark, client, path, params) -> None:
+    benchmark.group = "HTTPClient.uri"
+    assert benchmark(client.http.uri, path, params).startswith("http://127.0.0.1:8500/v1/")
+
+
+def test_prepare_headers(benchmark, client) -> None:
+    benchmark.group = "API request building"
+    assert benchmark(client.prepare_headers, None) == {"X-Consul-Token": "secret"}
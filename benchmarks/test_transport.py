@@ -0,0 +1,44 @@
+"""
+Request latency of the unix domain socket transport compared to loopback TCP.
+
+Run with ``pytest benchmarks/test_transport.py --benchmark-only``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+import consul.aio
+import consul.std
+
+
+@pytest.fixture(params=["tcp", "unix"])
+def agent_kwargs(request, tcp_agent, unix_agent):
+    if request.param == "tcp":
+        return {"host": "127.0.0.1", "port": tcp_agent}
+    return {"socket_path": unix_agent}
+
+
+def test_std_kv_get(benchmark, agent_kwargs) -> None:
+    benchmark.group = "std kv.get"
+    c = consul.std.Consul(**agent_kwargs)
+    _index, data = benchmark(c.kv.get, "foo")
+    assert data["Value"] == b"bar"
+
+
+def test_aio_kv_get(benchmark, agent_kwargs) -> None:
+    benchmark.group = "aio kv.get"
+    loop = asyncio.new_event_loop()
+
+    async def connect() -> consul.aio.Consul:
+        return consul.aio.Consul(**agent_kwargs)
+
+    c = loop.run_until_complete(connect())
+    try:
+        _index, data = benchmark(lambda: loop.run_until_complete(c.kv.get("foo")))
+        assert data["Value"] == b"bar"
+    finally:
+        loop.run_until_complete(c.close())
+        loop.close()
@@ -1,5 +1,54 @@
 __version__ = "1.7.1"
 
+import importlib
+from typing import TYPE_CHECKING
+
 from consul.check import Check
 from consul.exceptions import ACLDisabled, ACLPermissionDenied, ConsulException, NotFound, Timeout
-from consul.std import Consul
+from consul.ratelimit import RateLimiter
+from consul.retry import Retry
+
+if TYPE_CHECKING:
+    from consul.std import Consul
+
+__all__ = [
+    "ACLDisabled",
+    "ACLPermissionDenied",
+    "Check",
+    "Consul",
+    "ConsulException",
+    "NotFound",
+    "RateLimiter",
+    "Retry",
+    "Timeout",
+]
+
+# submodules which importing the package used to import too, through
+# consul.std, still available as its attributes: they are now imported when
+# first accessed
+_SUBMODULES = frozenset({
+    "api",
+    "base",
+    "callback",
+    "fanout",
+    "freshness",
+    "instrumentation",
+    "meta",
+    "projection",
+    "singleflight",
+    "std",
+    "stream",
+})
+
+
+def __getattr__(name: str):
+    # consul.std and the requests library are only imported once the client
+    # is used, e.g. not by a program just catching the exceptions
+    if name == "Consul":
+        from consul.std import Consul  # noqa: PLC0415 pylint: disable=import-outside-toplevel
+
+        globals()["Consul"] = Consul
+        return Consul
+    if name in _SUBMODULES:
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,8 +1,15 @@
-import ssl
+import asyncio
+import concurrent.futures
+import time
+from collections.abc import Awaitable, Callable, Iterable
+from typing import Any
 
 import aiohttp
 
-from consul import Timeout, base
+from consul import Timeout, base, fanout, tls
+from consul.offload import Offloader
+from consul.singleflight import AsyncSingleFlight
+from consul.stream import CHUNK_SIZE
 
 __all__ = ["Consul"]
 
@@ -10,51 +17,123 @@ __all__ = ["Consul"]
 class HTTPClient(base.HTTPClient):
     """Asyncio adapter for python consul using aiohttp library"""
 
-    def __init__(self, *args, loop=None, connections_limit=None, connections_timeout=None, **kwargs) -> None:
+    def __init__(
+        self,
+        *args,
+        loop=None,
+        connections_limit=None,
+        connections_timeout=None,
+        offload_threshold: int | None = Offloader.THRESHOLD,
+        offload_executor: concurrent.futures.Executor | None = None,
+        **kwargs,
+    ) -> None:
+        """
+        The response bodies larger than *offload_threshold* bytes are
+        decoded in *offload_executor*, see `consul.offload.Offloader`.
+        """
         super().__init__(*args, **kwargs)
         self.loop = loop
+        self.offloader = Offloader(offload_threshold, offload_executor)
         connector_kwargs = {}
         if connections_limit:
             connector_kwargs["limit"] = connections_limit
-        if self.verify:
-            ssl_context = ssl.create_default_context()
-            if self.cert:
-                if isinstance(self.cert, tuple):
-                    ssl_context.load_cert_chain(*self.cert)
-                else:
-                    ssl_context.load_cert_chain(self.cert)
-            if isinstance(self.verify, str):
-                ssl_context.load_verify_locations(self.verify)
-            connector_kwargs["ssl_context"] = ssl_context
-        connector = aiohttp.TCPConnector(loop=self.loop, verify_ssl=bool(self.verify), **connector_kwargs)
-        session_kwargs = {}
+        connector: aiohttp.BaseConnector
+        if self.socket_path:
+            connector = aiohttp.UnixConnector(path=self.socket_path, loop=self.loop, **connector_kwargs)
+        else:
+            connector = self._tcp_connector(connector_kwargs)
+        session_kwargs: dict[str, Any] = {}
         if connections_timeout:
             timeout = aiohttp.ClientTimeout(total=connections_timeout)
             session_kwargs["timeout"] = timeout
-        self._session = aiohttp.ClientSession(connector=connector, **session_kwargs)  # type: ignore
+        if self.hooks:
+            session_kwargs["trace_configs"] = [self._trace_config()]
+        self._session = aiohttp.ClientSession(connector=connector, **session_kwargs)
+
+    @staticmethod
+    def _trace_config() -> aiohttp.TraceConfig:
+        """Records the time spent opening connections in the request passed as *trace_request_ctx*"""
+
+        async def on_connection_create_start(session, context, params) -> None:  # pylint: disable=unused-argument
+            context.connecting = time.perf_counter()
+
+        async def on_connection_create_end(session, context, params) -> None:  # pylint: disable=unused-argument
+            context.trace_request_ctx.mark("connect", time.perf_counter() - context.connecting)
+
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_connection_create_start.append(on_connection_create_start)
+        trace_config.on_connection_create_end.append(on_connection_create_end)
+        return trace_config
+
+    def _tcp_connector(self, connector_kwargs) -> aiohttp.TCPConnector:
+        ssl_context = tls.client_context(self.verify, self.cert) if self.verify and self.scheme == "https" else False
+        return aiohttp.TCPConnector(loop=self.loop, ssl=ssl_context, **connector_kwargs)
 
-    async def _request(
+    def _single_flight(self) -> AsyncSingleFlight:
+        return AsyncSingleFlight()
+
+    @staticmethod
+    async def _chunks(resp: aiohttp.ClientResponse):
+        try:
+            async for chunk in resp.content.iter_chunked(CHUNK_SIZE):
+                yield chunk
+        finally:
+            resp.release()
+
+    async def _request(  # pylint: disable=invalid-overridden-method
         self,
         callback,
         method,
-        uri,
-        headers: dict[str, str] | None,
+        path,
+        params=None,
+        headers: dict[str, str] | None = None,
         data=None,
         connections_timeout=None,
         raw: bool = False,
+        max_stale=None,
+        stream: bool = False,
     ):
-        session_kwargs = {}
+        session_kwargs: dict[str, Any] = {}
         if connections_timeout:
             timeout = aiohttp.ClientTimeout(total=connections_timeout)
             session_kwargs["timeout"] = timeout
-        resp = await self._session.request(method, uri, headers=headers, data=data, **session_kwargs)  # type: ignore
-        # raw=True keeps the response as bytes (e.g. the gzip archive returned by
-        # GET /v1/snapshot) instead of decoding it as UTF-8 text, which would corrupt it.
-        body = await resp.read() if raw else await resp.text(encoding="utf-8")
-        if resp.status == 599:
-            raise Timeout
-        r = base.Response(resp.status, resp.headers, body)
-        return callback(r)
+        with self._instrument(method, path, params) as request:
+            attempts = self._attempts(method, path, params, max_stale, request)
+            delay, uri = next(attempts)
+            outcome: base.Response | Exception
+            while True:
+                if delay:
+                    await asyncio.sleep(delay)
+                try:
+                    start = time.perf_counter()
+                    resp = await self._session.request(
+                        method, uri, headers=headers, data=data, trace_request_ctx=request, **session_kwargs
+                    )
+                    headers_received = time.perf_counter()
+                    request.mark("ttfb", headers_received - start)
+                    if stream and resp.status < 300:
+                        body = self._chunks(resp)
+                    else:
+                        # decoded along with the response by the offloader
+                        body = await resp.read()
+                    request.mark("read", time.perf_counter() - headers_received)
+                    outcome = base.Response(resp.status, resp.headers, body)
+                except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                    outcome = e
+                try:
+                    delay, uri = attempts.send(outcome)
+                except StopIteration:
+                    break
+                if stream and not isinstance(outcome, Exception):
+                    resp.release()
+            if isinstance(outcome, Exception):
+                raise outcome
+            if outcome.code == 599:
+                raise Timeout
+            # raw=True keeps the response as bytes (e.g. the gzip archive returned by
+            # GET /v1/snapshot) instead of decoding it as UTF-8 text, which would corrupt it.
+            with request.timed("decode"):
+                return await self.offloader.decode(callback, outcome, raw=raw)
 
     def get(
         self,
@@ -64,9 +143,21 @@ class HTTPClient(base.HTTPClient):
         headers: dict[str, str] | None = None,
         raw: bool = False,
         connections_timeout=None,
+        max_stale=None,
+        reuse_for=None,
+        stream: bool = False,
     ):
-        uri = self.uri(path, params)
-        return self._request(callback, "GET", uri, headers=headers, connections_timeout=connections_timeout, raw=raw)
+        return self._get(
+            callback,
+            path,
+            params,
+            headers,
+            reuse_for,
+            raw=raw,
+            connections_timeout=connections_timeout,
+            max_stale=max_stale,
+            stream=stream,
+        )
 
     def put(
         self,
@@ -77,8 +168,9 @@ class HTTPClient(base.HTTPClient):
         headers: dict[str, str] | None = None,
         connections_timeout=None,
     ):
-        uri = self.uri(path, params)
-        return self._request(callback, "PUT", uri, headers=headers, data=data, connections_timeout=connections_timeout)
+        return self._request(
+            callback, "PUT", path, params, headers=headers, data=data, connections_timeout=connections_timeout
+        )
 
     def delete(
         self,
@@ -89,9 +181,8 @@ class HTTPClient(base.HTTPClient):
         headers: dict[str, str] | None = None,
         connections_timeout=None,
     ):
-        uri = self.uri(path, params)
         return self._request(
-            callback, "DELETE", uri, headers=headers, data=data, connections_timeout=connections_timeout
+            callback, "DELETE", path, params, headers=headers, data=data, connections_timeout=connections_timeout
         )
 
     def post(
@@ -103,21 +194,67 @@ class HTTPClient(base.HTTPClient):
         headers: dict[str, str] | None = None,
         connections_timeout=None,
     ):
-        uri = self.uri(path, params)
-        return self._request(callback, "POST", uri, headers=headers, data=data, connections_timeout=connections_timeout)
+        return self._request(
+            callback, "POST", path, params, headers=headers, data=data, connections_timeout=connections_timeout
+        )
 
     def close(self):
         return self._session.close()
 
 
 class Consul(base.Consul):
-    def __init__(self, *args, loop=None, connections_limit=None, connections_timeout=None, **kwargs) -> None:
+    def __init__(
+        self,
+        *args,
+        loop=None,
+        connections_limit=None,
+        connections_timeout=None,
+        http2: bool = False,
+        offload_threshold: int | None = Offloader.THRESHOLD,
+        offload_executor: concurrent.futures.Executor | None = None,
+        **kwargs,
+    ) -> None:
+        """
+        *connections_limit* caps the number of connections opened to the
+        agent, *connections_timeout* is the default total timeout of a
+        request.
+
+        *offload_threshold* is the size in bytes of the response bodies
+        above which they are decoded in a thread rather than on the event
+        loop, None to decode them all on the loop. *offload_executor* is
+        the executor running them, the default executor of the loop if
+        None. The time the loop spent decoding is ``http.offloader.blocked``.
+
+        *http2* selects the HTTP/2 transport of `consul.http2`, which
+        multiplexes concurrent requests (e.g. many blocking queries) over a
+        few connections. It requires the optional ``http2`` dependencies.
+
+        See `consul.base.Consul` for the other arguments.
+        """
         self.loop = loop
+        self.http2 = http2
         self.connections_limit = connections_limit
         self.connections_timeout = connections_timeout
+        self.offload_threshold = offload_threshold
+        self.offload_executor = offload_executor
         super().__init__(*args, **kwargs)
 
     def http_connect(self, host: str, port: int, scheme, verify: bool | str = True, cert=None):
+        if self.http2:
+            from consul import http2  # noqa: PLC0415 pylint: disable=import-outside-toplevel
+
+            return http2.AsyncHTTPClient(
+                host,
+                port,
+                scheme,
+                connections_limit=self.connections_limit,
+                connections_timeout=self.connections_timeout,
+                offload_threshold=self.offload_threshold,
+                offload_executor=self.offload_executor,
+                verify=verify,
+                cert=cert,
+                **self.transport_options(),
+            )
         return HTTPClient(
             host,
             port,
@@ -125,10 +262,40 @@ class Consul(base.Consul):
             loop=self.loop,
             connections_limit=self.connections_limit,
             connections_timeout=self.connections_timeout,
+            offload_threshold=self.offload_threshold,
+            offload_executor=self.offload_executor,
             verify=verify,
             cert=cert,
+            **self.transport_options(),
         )
 
-    def close(self):
-        """Close all opened http connections"""
-        return self.http.close()
+    async def fan_out(
+        self,
+        endpoint: Callable[..., Awaitable[Any]],
+        *args: Any,
+        dcs: Iterable[str] | None = None,
+        concurrency: int = 8,
+        timeout: float | None = None,
+        **kwargs: Any,
+    ) -> fanout.FanOut:
+        """
+        Calls the datacenter-aware *endpoint* (e.g. ``self.health.state``)
+        with *args* and *kwargs* once per datacenter, passing it as *dc*,
+        and returns a `consul.fanout.FanOut` gathering the results and the
+        errors of each datacenter.
+
+        *dcs* are the datacenters to query, by default all the known ones
+        (Catalog.datacenters). At most *concurrency* calls run at a time.
+
+        *timeout* is how long to wait for all the datacenters, in seconds.
+        The ones which haven't answered by then are reported with a
+        `consul.Timeout` error.
+        """
+        if dcs is None:
+            dcs = await self.catalog.datacenters()
+        return await fanout.fan_out_async(endpoint, args, kwargs, dcs, concurrency, timeout)
+
+    async def close(self) -> None:
+        """Close all opened http connections, unless it's a view created by `with_options`"""
+        if not self.shares_transport:
+            await self.http.close()
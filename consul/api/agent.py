@@ -1,10 +1,17 @@
 from __future__ import annotations
 
 import json
-from typing import Any
+from typing import Any, TypedDict
 
 from consul import Check
-from consul.callback import CB
+from consul.callback import CB, Keyed
+from consul.exceptions import ConsulException
+
+
+class AgentServiceHealth(TypedDict, total=False):
+    AggregatedStatus: str
+    Service: dict[str, Any]
+    Checks: list[dict[str, Any]]
 
 
 class Agent:
@@ -22,7 +29,7 @@ class Agent:
         self.connect = Agent.Connect(agent)
         self.token = Agent.Token(agent)
 
-    def self(self):
+    def self(self) -> Any:
         """
         Returns configuration of the local agent and member information.
         """
@@ -41,12 +48,48 @@ class Agent:
         """
         return self.agent.http.get(CB.json(), "/v1/agent/services")
 
-    def service_definition(self, service_id):
+    def service_definition(
+        self,
+        service_id,
+        content_hash: str | None = None,
+        wait=None,
+        token: str | None = None,
+        meta: bool = False,
+    ):
         """
         Returns a service definition for a single instance that is registered
         with the local agent.
+
+        *content_hash* is the hash of a previously returned definition
+        (`consul.meta.QueryMeta.content_hash`). If given, the agent holds
+        the request until the definition differs from it, answering from
+        its local state without involving the servers.
+
+        *wait* the maximum duration to wait (e.g. '10s') for a change. this
+        parameter is only applied if *content_hash* is also specified. the
+        wait time by default is 5 minutes.
+
+        *token* is an optional `ACL token`_ to apply to this request.
+
+        *meta* if set, a tuple of (*meta*, *definition*) is returned, where
+        *meta* is a `consul.meta.QueryMeta` carrying the content hash to
+        block on, e.g.::
+
+            meta, definition = c.agent.service_definition("web", meta=True)
+            while True:
+                meta, definition = c.agent.service_definition(
+                    "web", content_hash=meta.content_hash, meta=True
+                )
         """
-        return self.agent.http.get(CB.json(), f"/v1/agent/service/{service_id}")
+        params = []
+        if content_hash:
+            params.append(("hash", content_hash))
+            if wait:
+                params.append(("wait", wait))
+        headers = self.agent.prepare_headers(token)
+        return self.agent.http.get(
+            CB.json(meta=meta), f"/v1/agent/service/{service_id}", params=params, headers=headers
+        )
 
     def checks(self) -> Any:
         """
@@ -209,12 +252,11 @@ class Agent:
             own. This client implementation is a first pass and does
             **not** provide true streaming: it makes a single blocking GET
             request and returns whatever text body has accumulated once
-            the connection ends. Neither the underlying sync nor async
-            HTTP clients in this library currently expose a per-call
-            socket/read timeout, so calling this method against a live,
-            long-running agent can block forever unless the connection is
-            closed by some other means (e.g. the agent shutting down, or a
-            timeout enforced by the caller, such as running this call in a
+            the connection ends. Calling this method against a live,
+            long-running agent can block forever unless the client was
+            given a *connections_timeout*, or the connection is closed by
+            some other means (e.g. the agent shutting down, or a timeout
+            enforced by the caller, such as running this call in a
             separate thread/task and cancelling it externally). Do not use
             this method in latency-sensitive or production code paths
             until true streaming support is added.
@@ -389,6 +431,69 @@ class Agent:
                 CB.boolean(), f"/v1/agent/service/maintenance/{service_id}", params=params, headers=headers
             )
 
+        @staticmethod
+        def _health(one: bool):
+            # 429 and 503 are the statuses of services in warning and
+            # critical state, they come with the health of the service
+            def cb(response):
+                if response.code == 404:
+                    return None if one else []
+                if response.code not in (429, 503):
+                    CB.raise_for_status(response)
+                try:
+                    return json.loads(response.body)
+                except (json.JSONDecodeError, TypeError) as e:
+                    # not a health answer, e.g. an error of a proxy
+                    CB.raise_for_status(response)
+                    raise ConsulException(f"Failed to decode JSON: {response.body} {e}") from e
+
+            return Keyed(cb, ("agent_health", one))
+
+        def health_by_name(
+            self, name: str, token: str | None = None, reuse_for: float | None = None
+        ) -> list[AgentServiceHealth]:
+            """
+            Returns the health of the instances of service *name* registered
+            with the local agent, as a list of dicts with the
+            *AggregatedStatus* ('passing', 'warning', 'critical' or
+            'maintenance') of each instance, its *Service* definition and
+            its *Checks*.
+
+            The agent answers from its local state, without involving the
+            servers, which makes it suitable for readiness gates. An empty
+            list is returned if no instance is registered.
+
+            *reuse_for* if set, the result is kept by the client and returned
+            to the identical calls made within *reuse_for* seconds, and
+            concurrent calls share a single request. The result is shared
+            by these callers, it must not be mutated. This is unrelated to
+            the *max_age* of `Health.service`, which is how old the data
+            cached by the agent may be.
+            """
+            http_kwargs = {}
+            if reuse_for is not None:
+                http_kwargs["reuse_for"] = reuse_for
+            headers = self.agent.prepare_headers(token)
+            return self.agent.http.get(
+                self._health(one=False), f"/v1/agent/health/service/name/{name}", headers=headers, **http_kwargs
+            )
+
+        def health_by_id(
+            self, service_id: str, token: str | None = None, reuse_for: float | None = None
+        ) -> AgentServiceHealth | None:
+            """
+            Returns the health of the service instance *service_id*
+            registered with the local agent, or None if there is no such
+            instance. See `health_by_name`.
+            """
+            http_kwargs = {}
+            if reuse_for is not None:
+                http_kwargs["reuse_for"] = reuse_for
+            headers = self.agent.prepare_headers(token)
+            return self.agent.http.get(
+                self._health(one=True), f"/v1/agent/health/service/id/{service_id}", headers=headers, **http_kwargs
+            )
+
     class Check:
         def __init__(self, agent) -> None:
             self.agent = agent
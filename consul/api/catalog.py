@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import json
+from typing import Any
 
 from consul.callback import CB
 
@@ -142,7 +143,7 @@ class Catalog:
         headers = self.agent.prepare_headers(token)
         return self.agent.http.put(CB.boolean(), "/v1/catalog/deregister", headers=headers, data=json.dumps(data))
 
-    def datacenters(self):
+    def datacenters(self) -> Any:
         """
         Returns all the datacenters that are known by the Consul server.
         """
@@ -158,6 +159,11 @@ class Catalog:
         token: str | None = None,
         node_meta=None,
         filter_expr: str | None = None,
+        meta: bool = False,
+        max_stale=None,
+        stream: bool = False,
+        fields=None,
+        intern: bool = False,
     ):
         """
         Returns a tuple of (*index*, *nodes*) of all nodes known
@@ -178,6 +184,9 @@ class Catalog:
         not specified *consistency* will the consistency level this client
         was configured with.
 
+        *max_stale* bounds the staleness of a 'stale' read, overriding the
+        bound configured on the client.
+
         *token* is an optional `ACL token`_ to apply to this request.
 
         *node_meta* is an optional meta data used for filtering, a
@@ -198,6 +207,25 @@ class Catalog:
                     "Address": "10.1.10.12"
                 }
             ])
+
+        *meta* if set, a tuple of (*meta*, *nodes*) is returned instead,
+        where *meta* is a `consul.meta.QueryMeta` describing the response
+        (index, known leader, last contact, ...).
+
+        *stream* if set, the *nodes* are parsed as they are received and
+        returned as an iterator (an async iterator with the asyncio client)
+        instead of a list, so that they are never all held in memory at
+        once. The iterator must be consumed or closed to release the
+        connection.
+
+        *fields* is an optional set of the fields of the *nodes* to keep, as
+        dotted paths, e.g. ``{"Node", "Address"}``. The other ones
+        are dropped from the result, and with *stream* they are never all
+        held in memory at once, see `consul.projection.Projection`.
+
+        *intern* if set, the repeated strings of the *nodes* (node names,
+        tags, statuses, ...) are shared rather than copied, which saves
+        memory when they are kept around, e.g. in a cache.
         """
         params = []
         dc = dc or self.agent.dc
@@ -219,7 +247,18 @@ class Catalog:
         if filter_expr:
             params.append(("filter", filter_expr))
         headers = self.agent.prepare_headers(token)
-        return self.agent.http.get(CB.json(index=True), "/v1/catalog/nodes", params=params, headers=headers)
+        http_kwargs = {}
+        if max_stale is not None:
+            http_kwargs["max_stale"] = max_stale
+        if stream:
+            http_kwargs["stream"] = True
+        return self.agent.http.get(
+            CB.json(index=True, meta=meta, stream=stream, fields=fields, intern=intern),
+            "/v1/catalog/nodes",
+            params=params,
+            headers=headers,
+            **http_kwargs,
+        )
 
     def services(
         self,
@@ -230,6 +269,12 @@ class Catalog:
         token: str | None = None,
         node_meta=None,
         filter_expr: str | None = None,
+        cached: bool = False,
+        max_age: str | float | None = None,
+        stale_if_error: str | float | None = None,
+        meta: bool = False,
+        max_stale=None,
+        intern: bool = False,
     ):
         """
         Returns a tuple of (*index*, *services*) of all services known
@@ -247,6 +292,9 @@ class Catalog:
         not specified *consistency* will the consistency level this client
         was configured with.
 
+        *max_stale* bounds the staleness of a 'stale' read, overriding the
+        bound configured on the client.
+
         *token* is an optional `ACL token`_ to apply to this request.
 
         *node_meta* is an optional meta data used for filtering, a
@@ -255,6 +303,12 @@ class Catalog:
         *filter_expr* is an optional bexpr filter expression to filter the
         results.
 
+        *cached* if set, the agent answers from its local cache and a tuple
+        of (*meta*, *services*) is returned, where *meta* is a
+        `consul.meta.QueryMeta`. See health.service for *max_age* and
+        *stale_if_error*. A cached read can't be 'consistent', the
+        consistency mode of the client isn't applied to it then.
+
         The response looks like this::
 
             (index, {
@@ -268,6 +322,14 @@ class Catalog:
 
         The main keys are the service names and the list provides all the
         known tags for a given service.
+
+        *meta* if set, a tuple of (*meta*, *services*) is returned instead,
+        where *meta* is a `consul.meta.QueryMeta` describing the response
+        (index, known leader, last contact, ...).
+
+        *intern* if set, the repeated tags of the *services* are shared
+        rather than copied, which saves memory when they are kept around,
+        e.g. in a cache.
         """
         params = []
         dc = dc or self.agent.dc
@@ -277,7 +339,10 @@ class Catalog:
             params.append(("index", index))
             if wait:
                 params.append(("wait", wait))
-        consistency = consistency or self.agent.consistency
+        if not consistency and not (cached and self.agent.consistency == "consistent"):
+            # the agent cache can't answer consistent reads, the default
+            # consistency mode of the client doesn't apply to cached ones
+            consistency = self.agent.consistency
         if consistency in ("consistent", "stale"):
             params.append((consistency, "1"))
         if node_meta:
@@ -286,7 +351,18 @@ class Catalog:
         if filter_expr:
             params.append(("filter", filter_expr))
         headers = self.agent.prepare_headers(token)
-        return self.agent.http.get(CB.json(index=True), "/v1/catalog/services", params=params, headers=headers)
+        if cached:
+            self.agent.prepare_cache(params, headers, max_age=max_age, stale_if_error=stale_if_error)
+        http_kwargs = {}
+        if max_stale is not None:
+            http_kwargs["max_stale"] = max_stale
+        return self.agent.http.get(
+            CB.json(index=True, meta=meta or cached, intern=intern),
+            "/v1/catalog/services",
+            params=params,
+            headers=headers,
+            **http_kwargs,
+        )
 
     def node(
         self,
@@ -297,6 +373,9 @@ class Catalog:
         dc=None,
         token: str | None = None,
         filter_expr: str | None = None,
+        meta: bool = False,
+        max_stale=None,
+        fields=None,
     ):
         """
         Returns a tuple of (*index*, *services*) of all services provided
@@ -313,6 +392,9 @@ class Catalog:
         not specified *consistency* will the consistency level this client
         was configured with.
 
+        *max_stale* bounds the staleness of a 'stale' read, overriding the
+        bound configured on the client.
+
         *dc* is the datacenter of the node and defaults to this agents
         datacenter.
 
@@ -345,6 +427,15 @@ class Catalog:
                     }
                 }
             })
+
+        *meta* if set, a tuple of (*meta*, *services*) is returned instead,
+        where *meta* is a `consul.meta.QueryMeta` describing the response
+        (index, known leader, last contact, ...).
+
+        *fields* is an optional set of the fields of the *node* to keep, as
+        dotted paths, e.g. ``{"Node.Address", "Services"}``. The other ones
+        are dropped from the result, see
+        `consul.projection.Projection`.
         """
         params = []
         dc = dc or self.agent.dc
@@ -360,7 +451,16 @@ class Catalog:
         if filter_expr:
             params.append(("filter", filter_expr))
         headers = self.agent.prepare_headers(token)
-        return self.agent.http.get(CB.json(index=True), f"/v1/catalog/node/{node}", params=params, headers=headers)
+        http_kwargs = {}
+        if max_stale is not None:
+            http_kwargs["max_stale"] = max_stale
+        return self.agent.http.get(
+            CB.json(index=True, meta=meta, fields=fields),
+            f"/v1/catalog/node/{node}",
+            params=params,
+            headers=headers,
+            **http_kwargs,
+        )
 
     def _service(
         self,
@@ -376,6 +476,10 @@ class Catalog:
         filter_expr: str | None = None,
         peer: str | None = None,
         merge_central_config: bool | None = None,
+        meta: bool = False,
+        max_stale=None,
+        fields=None,
+        intern: bool = False,
     ):
         params = []
         dc = dc or self.agent.dc
@@ -402,7 +506,16 @@ class Catalog:
         if merge_central_config:
             params.append(("merge-central-config", "1"))
         headers = self.agent.prepare_headers(token)
-        return self.agent.http.get(CB.json(index=True), internal_uri, params=params, headers=headers)
+        http_kwargs = {}
+        if max_stale is not None:
+            http_kwargs["max_stale"] = max_stale
+        return self.agent.http.get(
+            CB.json(index=True, meta=meta, fields=fields, intern=intern),
+            internal_uri,
+            params=params,
+            headers=headers,
+            **http_kwargs,
+        )
 
     def service(self, service: str, **kwargs):
         """
@@ -427,6 +540,9 @@ class Catalog:
         not specified *consistency* will the consistency level this client
         was configured with.
 
+        *max_stale* bounds the staleness of a 'stale' read, overriding the
+        bound configured on the client.
+
         *token* is an optional `ACL token`_ to apply to this request.
 
         *node_meta* is an optional meta data used for filtering, a
@@ -453,6 +569,19 @@ class Catalog:
                     "ServicePort": 8000
                 }
             ])
+
+        *meta* if set, a tuple of (*meta*, *nodes*) is returned instead,
+        where *meta* is a `consul.meta.QueryMeta` describing the response
+        (index, known leader, last contact, ...).
+
+        *fields* is an optional set of the fields of the *nodes* to keep, as
+        dotted paths, e.g. ``{"Address", "ServicePort"}``. The other ones
+        are dropped from the result, see
+        `consul.projection.Projection`.
+
+        *intern* if set, the repeated strings of the *nodes* (node names,
+        tags, statuses, ...) are shared rather than copied, which saves
+        memory when they are kept around, e.g. in a cache.
         """
         internal_uri = f"/v1/catalog/service/{service}"
         return self._service(internal_uri=internal_uri, **kwargs)
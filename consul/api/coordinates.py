@@ -16,7 +16,7 @@ class Coordinate:
         """
         return self.agent.http.get(CB.json(), "/v1/coordinate/datacenters")
 
-    def nodes(self, dc=None, index=None, wait=None, consistency=None):
+    def nodes(self, dc=None, index=None, wait=None, consistency=None, meta: bool = False, max_stale=None):
         """
         *dc* is the datacenter that this agent will communicate with. By
         default the datacenter of the host is used.
@@ -31,6 +31,13 @@ class Coordinate:
         *consistency* can be either 'default', 'consistent' or 'stale'. if
         not specified *consistency* will the consistency level this client
         was configured with.
+
+        *max_stale* bounds the staleness of a 'stale' read, overriding the
+        bound configured on the client.
+
+        *meta* if set, a tuple of (*meta*, *coordinates*) is returned instead,
+        where *meta* is a `consul.meta.QueryMeta` describing the response
+        (index, known leader, last contact, ...).
         """
         params = []
         if dc:
@@ -42,9 +49,12 @@ class Coordinate:
         consistency = consistency or self.agent.consistency
         if consistency in ("consistent", "stale"):
             params.append((consistency, "1"))
-        return self.agent.http.get(CB.json(index=True), "/v1/coordinate/nodes", params=params)
+        http_kwargs = {}
+        if max_stale is not None:
+            http_kwargs["max_stale"] = max_stale
+        return self.agent.http.get(CB.json(index=True, meta=meta), "/v1/coordinate/nodes", params=params, **http_kwargs)
 
-    def node(self, node: str, dc=None, index=None, wait=None, consistency=None):
+    def node(self, node: str, dc=None, index=None, wait=None, consistency=None, meta: bool = False, max_stale=None):
         """
         Returns the LAN network coordinates for the node *node*.
 
@@ -61,6 +71,13 @@ class Coordinate:
         *consistency* can be either 'default', 'consistent' or 'stale'. if
         not specified *consistency* will the consistency level this client
         was configured with.
+
+        *max_stale* bounds the staleness of a 'stale' read, overriding the
+        bound configured on the client.
+
+        *meta* if set, a tuple of (*meta*, *coordinates*) is returned instead,
+        where *meta* is a `consul.meta.QueryMeta` describing the response
+        (index, known leader, last contact, ...).
         """
         params = []
         if dc:
@@ -72,7 +89,12 @@ class Coordinate:
         consistency = consistency or self.agent.consistency
         if consistency in ("consistent", "stale"):
             params.append((consistency, "1"))
-        return self.agent.http.get(CB.json(index=True), f"/v1/coordinate/node/{node}", params=params)
+        http_kwargs = {}
+        if max_stale is not None:
+            http_kwargs["max_stale"] = max_stale
+        return self.agent.http.get(
+            CB.json(index=True, meta=meta), f"/v1/coordinate/node/{node}", params=params, **http_kwargs
+        )
 
     def update(self, node: str, coord: dict, segment: str | None = None, dc=None, token: str | None = None):
         """
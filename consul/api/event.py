@@ -62,7 +62,9 @@ class Event:
         headers = self.agent.prepare_headers(token)
         return self.agent.http.put(CB.json(), f"/v1/event/fire/{name}", params=params, headers=headers, data=body)
 
-    def list(self, name: str | None = None, index=None, wait=None, node=None, service=None, tag=None):
+    def list(
+        self, name: str | None = None, index=None, wait=None, node=None, service=None, tag=None, meta: bool = False
+    ):
         """
         Returns a tuple of (*index*, *events*)
             Note: Since Consul's event protocol uses gossip, there is no
@@ -100,6 +102,10 @@ class Event:
                     "LTime": 19
                   },
             }
+
+        *meta* if set, a tuple of (*meta*, *events*) is returned instead,
+        where *meta* is a `consul.meta.QueryMeta` describing the response
+        (index, known leader, last contact, ...).
         """
         params = []
         if name is not None:
@@ -114,4 +120,4 @@ class Event:
             params.append(("service", service))
         if tag is not None:
             params.append(("tag", tag))
-        return self.agent.http.get(CB.json(index=True, decode="Payload"), "/v1/event/list", params=params)
+        return self.agent.http.get(CB.json(index=True, meta=meta, decode="Payload"), "/v1/event/list", params=params)
@@ -30,6 +30,12 @@ class Health:
         filter_expr: str | None = None,
         peer: str | None = None,
         merge_central_config: bool = False,
+        cached: bool = False,
+        max_age: str | float | None = None,
+        stale_if_error: str | float | None = None,
+        meta: bool = False,
+        fields=None,
+        intern: bool = False,
     ):
         params = []
         if index:
@@ -54,7 +60,14 @@ class Health:
         if merge_central_config:
             params.append(("merge-central-config", "1"))
         headers = self.agent.prepare_headers(token)
-        return self.agent.http.get(CB.json(index=True), internal_uri, params=params, headers=headers)
+        if cached:
+            self.agent.prepare_cache(params, headers, max_age=max_age, stale_if_error=stale_if_error)
+        return self.agent.http.get(
+            CB.json(index=True, meta=meta or cached, fields=fields, intern=intern),
+            internal_uri,
+            params=params,
+            headers=headers,
+        )
 
     def service(self, service: str, **kwargs):
         """
@@ -96,6 +109,29 @@ class Health:
         service definition that includes merged values from the
         proxy-defaults/global and service-defaults/:service config
         entries. Only applicable to connect-proxy and gateway services.
+
+        *cached* if set, the agent answers from its local cache instead of
+        forwarding the read to the servers, and a tuple of (*meta*, *nodes*)
+        is returned where *meta* is a `consul.meta.QueryMeta` telling
+        whether the cache was hit and the age of the data.
+
+        *max_age* and *stale_if_error* are the ``Cache-Control`` directives
+        of a *cached* read, in seconds or as a duration string: the oldest
+        cached data accepted, and how old it may be to still be served when
+        the servers can't be reached.
+
+        *meta* if set, a tuple of (*meta*, *nodes*) is returned instead,
+        where *meta* is a `consul.meta.QueryMeta` describing the response
+        (index, known leader, last contact, ...).
+
+        *fields* is an optional set of the fields of the *nodes* to keep, as
+        dotted paths, e.g. ``{"Service.Port", "Checks.Status"}``. The other ones
+        are dropped from the result, see
+        `consul.projection.Projection`.
+
+        *intern* if set, the repeated strings of the *nodes* (node names,
+        tags, statuses, ...) are shared rather than copied, which saves
+        memory when they are kept around, e.g. in a cache.
         """
         internal_uri = f"/v1/health/service/{service}"
         return self._service(internal_uri=internal_uri, **kwargs)
@@ -123,6 +159,9 @@ class Health:
         token: str | None = None,
         node_meta=None,
         filter_expr: str | None = None,
+        meta: bool = False,
+        fields=None,
+        intern: bool = False,
     ):
         """
         Returns a tuple of (*index*, *nodes*) of the ingress gateway
@@ -158,6 +197,19 @@ class Health:
         Unlike `connect` and `service`, this endpoint does not support the
         *peer* query parameter or the streaming backend for blocking
         queries.
+
+        *meta* if set, a tuple of (*meta*, *nodes*) is returned instead,
+        where *meta* is a `consul.meta.QueryMeta` describing the response
+        (index, known leader, last contact, ...).
+
+        *fields* is an optional set of the fields of the *nodes* to keep, as
+        dotted paths, e.g. ``{"Service.Port", "Checks.Status"}``. The other ones
+        are dropped from the result, see
+        `consul.projection.Projection`.
+
+        *intern* if set, the repeated strings of the *nodes* (node names,
+        tags, statuses, ...) are shared rather than copied, which saves
+        memory when they are kept around, e.g. in a cache.
         """
         internal_uri = f"/v1/health/ingress/{service}"
         return self._service(
@@ -171,6 +223,9 @@ class Health:
             token=token,
             node_meta=node_meta,
             filter_expr=filter_expr,
+            meta=meta,
+            fields=fields,
+            intern=intern,
         )
 
     def checks(
@@ -183,6 +238,8 @@ class Health:
         token: str | None = None,
         node_meta=None,
         filter_expr: str | None = None,
+        meta: bool = False,
+        fields=None,
     ):
         """
         Returns a tuple of (*index*, *checks*) with *checks* being the
@@ -210,6 +267,15 @@ class Health:
 
         *filter_expr* is an optional bexpr filter expression to filter the
         results.
+
+        *meta* if set, a tuple of (*meta*, *checks*) is returned instead,
+        where *meta* is a `consul.meta.QueryMeta` describing the response
+        (index, known leader, last contact, ...).
+
+        *fields* is an optional set of the fields of the *checks* to keep, as
+        dotted paths, e.g. ``{"Node", "Status"}``. The other ones
+        are dropped from the result, see
+        `consul.projection.Projection`.
         """
         params = []
         if index:
@@ -227,7 +293,12 @@ class Health:
         if filter_expr:
             params.append(("filter", filter_expr))
         headers = self.agent.prepare_headers(token)
-        return self.agent.http.get(CB.json(index=True), f"/v1/health/checks/{service}", params=params, headers=headers)
+        return self.agent.http.get(
+            CB.json(index=True, meta=meta, fields=fields),
+            f"/v1/health/checks/{service}",
+            params=params,
+            headers=headers,
+        )
 
     def state(
         self,
@@ -239,6 +310,10 @@ class Health:
         token: str | None = None,
         node_meta=None,
         filter_expr: str | None = None,
+        meta: bool = False,
+        stream: bool = False,
+        fields=None,
+        intern: bool = False,
     ):
         """
         Returns a tuple of (*index*, *nodes*)
@@ -271,6 +346,25 @@ class Health:
         results.
 
         *nodes* are the nodes providing the given service.
+
+        *meta* if set, a tuple of (*meta*, *nodes*) is returned instead,
+        where *meta* is a `consul.meta.QueryMeta` describing the response
+        (index, known leader, last contact, ...).
+
+        *stream* if set, the *nodes* are parsed as they are received and
+        returned as an iterator (an async iterator with the asyncio client)
+        instead of a list, so that they are never all held in memory at
+        once. The iterator must be consumed or closed to release the
+        connection.
+
+        *fields* is an optional set of the fields of the *nodes* to keep, as
+        dotted paths, e.g. ``{"Node", "Status"}``. The other ones
+        are dropped from the result, and with *stream* they are never all
+        held in memory at once, see `consul.projection.Projection`.
+
+        *intern* if set, the repeated strings of the *nodes* (node names,
+        tags, statuses, ...) are shared rather than copied, which saves
+        memory when they are kept around, e.g. in a cache.
         """
         assert name in ["any", "unknown", "passing", "warning", "critical"]
         params = []
@@ -289,7 +383,16 @@ class Health:
         if filter_expr:
             params.append(("filter", filter_expr))
         headers = self.agent.prepare_headers(token)
-        return self.agent.http.get(CB.json(index=True), f"/v1/health/state/{name}", params=params, headers=headers)
+        http_kwargs = {}
+        if stream:
+            http_kwargs["stream"] = True
+        return self.agent.http.get(
+            CB.json(index=True, meta=meta, stream=stream, fields=fields, intern=intern),
+            f"/v1/health/state/{name}",
+            params=params,
+            headers=headers,
+            **http_kwargs,
+        )
 
     def node(
         self,
@@ -299,6 +402,8 @@ class Health:
         dc=None,
         token: str | None = None,
         filter_expr: str | None = None,
+        meta: bool = False,
+        fields=None,
     ):
         """
         Returns a tuple of (*index*, *checks*)
@@ -319,6 +424,15 @@ class Health:
         results.
 
         *nodes* are the nodes providing the given service.
+
+        *meta* if set, a tuple of (*meta*, *checks*) is returned instead,
+        where *meta* is a `consul.meta.QueryMeta` describing the response
+        (index, known leader, last contact, ...).
+
+        *fields* is an optional set of the fields of the *checks* to keep, as
+        dotted paths, e.g. ``{"CheckID", "Status"}``. The other ones
+        are dropped from the result, see
+        `consul.projection.Projection`.
         """
         params = []
         if index:
@@ -332,4 +446,6 @@ class Health:
             params.append(("filter", filter_expr))
 
         headers = self.agent.prepare_headers(token)
-        return self.agent.http.get(CB.json(index=True), f"/v1/health/node/{node}", params=params, headers=headers)
+        return self.agent.http.get(
+            CB.json(index=True, meta=meta, fields=fields), f"/v1/health/node/{node}", params=params, headers=headers
+        )
@@ -25,6 +25,9 @@ class KV:
         separator=None,
         dc=None,
         connections_timeout=None,
+        meta: bool = False,
+        max_stale=None,
+        stream: bool = False,
     ):
         """
         Returns a tuple of (*index*, *value[s]*)
@@ -64,8 +67,22 @@ class KV:
         Note, if the requested key does not exists *(index, None)* is
         returned. It's then possible to long poll on the index for when the
         key is created.
+
+        *max_stale* bounds the staleness of a 'stale' read, overriding the
+        bound configured on the client.
+
+        *meta* if set, a tuple of (*meta*, *value[s]*) is returned instead,
+        where *meta* is a `consul.meta.QueryMeta` describing the response
+        (index, known leader, last contact, ...).
+
+        *stream* if set along with *recurse* or *keys*, the *values* are
+        parsed as they are received and returned as an iterator (an async
+        iterator with the asyncio client) instead of a list, so that a
+        large prefix is never held in memory at once. The iterator must be
+        consumed or closed to release the connection.
         """
         assert not key.startswith("/"), "keys should not start with a forward slash"
+        assert not stream or recurse or keys, "only lists can be streamed"
         params = []
         if index:
             params.append(("index", index))
@@ -94,10 +111,18 @@ class KV:
         http_kwargs = {}
         if connections_timeout:
             http_kwargs["connections_timeout"] = connections_timeout
+        if max_stale is not None:
+            http_kwargs["max_stale"] = max_stale
+        if stream:
+            http_kwargs["stream"] = True
 
         headers = self.agent.prepare_headers(token)
         return self.agent.http.get(
-            CB.json(index=True, decode=decode, one=one), f"/v1/kv/{key}", params=params, headers=headers, **http_kwargs
+            CB.json(index=True, meta=meta, decode=decode, one=one, stream=stream),
+            f"/v1/kv/{key}",
+            params=params,
+            headers=headers,
+            **http_kwargs,
         )
 
     def put(
@@ -187,7 +187,18 @@ class Query:
         headers = self.agent.prepare_headers(token)
         return self.agent.http.delete(CB.boolean(), f"/v1/query/{query_id}", params=params, headers=headers)
 
-    def execute(self, query, token: str | None = None, dc=None, near=None, limit: int | None = None):
+    def execute(
+        self,
+        query,
+        token: str | None = None,
+        dc=None,
+        near=None,
+        limit: int | None = None,
+        cached: bool = False,
+        max_age: str | float | None = None,
+        stale_if_error: str | float | None = None,
+        meta: bool = False,
+    ):
         """
         This endpoint will execute certain query
 
@@ -203,6 +214,14 @@ class Query:
 
         *limit* is used to limit the size of the list to the given number
         of nodes. This is applied after any sorting or shuffling.
+
+        *cached* if set, the agent answers from its local cache and a tuple
+        of (*meta*, *result*) is returned, where *meta* is a
+        `consul.meta.QueryMeta`. See health.service for *max_age* and
+        *stale_if_error*.
+
+        *meta* if set, a tuple of (*meta*, *result*) is returned instead,
+        even if not *cached*.
         """
         params = []
         if dc:
@@ -212,7 +231,11 @@ class Query:
         if limit:
             params.append(("limit", limit))
         headers = self.agent.prepare_headers(token)
-        return self.agent.http.get(CB.json(), f"/v1/query/{query}/execute", params=params, headers=headers)
+        if cached:
+            self.agent.prepare_cache(params, headers, max_age=max_age, stale_if_error=stale_if_error)
+        return self.agent.http.get(
+            CB.json(meta=meta or cached), f"/v1/query/{query}/execute", params=params, headers=headers
+        )
 
     def explain(self, query, token: str | None = None, dc=None):
         """
@@ -97,7 +97,16 @@ class Session:
         headers = self.agent.prepare_headers(token)
         return self.agent.http.put(CB.boolean(), f"/v1/session/destroy/{session_id}", headers=headers, params=params)
 
-    def list(self, index=None, wait=None, consistency=None, dc=None, token: str | None = None):
+    def list(
+        self,
+        index=None,
+        wait=None,
+        consistency=None,
+        dc=None,
+        token: str | None = None,
+        meta: bool = False,
+        max_stale=None,
+    ):
         """
         Returns a tuple of (*index*, *sessions*) of all active sessions in
         the *dc* datacenter. *dc* defaults to the current datacenter of
@@ -114,6 +123,9 @@ class Session:
         not specified *consistency* will the consistency level this client
         was configured with.
 
+        *max_stale* bounds the staleness of a 'stale' read, overriding the
+        bound configured on the client.
+
         *token* is an optional `ACL token` to apply to this request. ACL
         required : session:read
 
@@ -131,6 +143,10 @@ class Session:
                 },
               ...
            ])
+
+        *meta* if set, a tuple of (*meta*, *sessions*) is returned instead,
+        where *meta* is a `consul.meta.QueryMeta` describing the response
+        (index, known leader, last contact, ...).
         """
         params = []
         dc = dc or self.agent.dc
@@ -144,9 +160,24 @@ class Session:
         if consistency in ("consistent", "stale"):
             params.append((consistency, "1"))
         headers = self.agent.prepare_headers(token)
-        return self.agent.http.get(CB.json(index=True), "/v1/session/list", headers=headers, params=params)
+        http_kwargs = {}
+        if max_stale is not None:
+            http_kwargs["max_stale"] = max_stale
+        return self.agent.http.get(
+            CB.json(index=True, meta=meta), "/v1/session/list", headers=headers, params=params, **http_kwargs
+        )
 
-    def node(self, node: str, index=None, wait=None, consistency=None, dc=None, token: str | None = None):
+    def node(
+        self,
+        node: str,
+        index=None,
+        wait=None,
+        consistency=None,
+        dc=None,
+        token: str | None = None,
+        meta: bool = False,
+        max_stale=None,
+    ):
         """
         Returns a tuple of (*index*, *sessions*) as per *session.list*, but
         filters the sessions returned to only those active for *node*.
@@ -162,8 +193,15 @@ class Session:
         not specified *consistency* will the consistency level this client
         was configured with.
 
+        *max_stale* bounds the staleness of a 'stale' read, overriding the
+        bound configured on the client.
+
         *token* is an optional `ACL token` to apply to this request. ACL
         required : session:read
+
+        *meta* if set, a tuple of (*meta*, *sessions*) is returned instead,
+        where *meta* is a `consul.meta.QueryMeta` describing the response
+        (index, known leader, last contact, ...).
         """
         params = []
         dc = dc or self.agent.dc
@@ -177,9 +215,24 @@ class Session:
         if consistency in ("consistent", "stale"):
             params.append((consistency, "1"))
         headers = self.agent.prepare_headers(token)
-        return self.agent.http.get(CB.json(index=True), f"/v1/session/node/{node}", headers=headers, params=params)
+        http_kwargs = {}
+        if max_stale is not None:
+            http_kwargs["max_stale"] = max_stale
+        return self.agent.http.get(
+            CB.json(index=True, meta=meta), f"/v1/session/node/{node}", headers=headers, params=params, **http_kwargs
+        )
 
-    def info(self, session_id: str, index=None, wait=None, consistency=None, dc=None, token: str | None = None):
+    def info(
+        self,
+        session_id: str,
+        index=None,
+        wait=None,
+        consistency=None,
+        dc=None,
+        token: str | None = None,
+        meta: bool = False,
+        max_stale=None,
+    ):
         """
         Returns a tuple of (*index*, *session*) for the session
         *session_id* in the *dc* datacenter. *dc* defaults to the current
@@ -196,8 +249,15 @@ class Session:
         not specified *consistency* will the consistency level this client
         was configured with.
 
+        *max_stale* bounds the staleness of a 'stale' read, overriding the
+        bound configured on the client.
+
         *token* is an optional `ACL token` to apply to this request. ACL
         required : session:read
+
+        *meta* if set, a tuple of (*meta*, *session*) is returned instead,
+        where *meta* is a `consul.meta.QueryMeta` describing the response
+        (index, known leader, last contact, ...).
         """
         params = []
         dc = dc or self.agent.dc
@@ -211,8 +271,15 @@ class Session:
         if consistency in ("consistent", "stale"):
             params.append((consistency, "1"))
         headers = self.agent.prepare_headers(token)
+        http_kwargs = {}
+        if max_stale is not None:
+            http_kwargs["max_stale"] = max_stale
         return self.agent.http.get(
-            CB.json(index=True, one=True), f"/v1/session/info/{session_id}", headers=headers, params=params
+            CB.json(index=True, meta=meta, one=True),
+            f"/v1/session/info/{session_id}",
+            headers=headers,
+            params=params,
+            **http_kwargs,
         )
 
     def renew(self, session_id, dc=None, token: str | None = None):
@@ -1,3 +1,5 @@
+from typing import Any
+
 from consul.callback import CB
 
 
@@ -10,14 +12,14 @@ class Status:
     def __init__(self, agent) -> None:
         self.agent = agent
 
-    def leader(self):
+    def leader(self) -> Any:
         """
         This endpoint is used to get the Raft leader for the datacenter
         in which the agent is running.
         """
         return self.agent.http.get(CB.json(), "/v1/status/leader")
 
-    def peers(self):
+    def peers(self) -> Any:
         """
         This endpoint retrieves the Raft peers for the datacenter in which
         the the agent is running.
@@ -1,4 +1,5 @@
 import json
+from typing import Any
 
 from consul.callback import CB
 
@@ -12,7 +13,7 @@ class Txn:
     def __init__(self, agent) -> None:
         self.agent = agent
 
-    def put(self, payload):
+    def put(self, payload) -> Any:
         """
         Create a transaction by submitting a list of operations to apply to
         the KV store inside of a transaction. If any operation fails, the
@@ -34,4 +35,16 @@ class Txn:
                 }
             }
         """
-        return self.agent.http.put(CB.json(), "/v1/txn", data=json.dumps(payload))
+        tracker = self.agent.read_your_writes
+        if tracker is None:
+            return self.agent.http.put(CB.json(), "/v1/txn", data=json.dumps(payload))
+
+        def postprocess(data):
+            # the ModifyIndex of the keys written is the floor of their reads
+            for result in data.get("Results") or ():
+                kv = result.get("KV")
+                if kv and kv.get("ModifyIndex"):
+                    tracker.set_floor(f"/v1/kv/{kv['Key']}", kv["ModifyIndex"])
+            return data
+
+        return self.agent.http.put(CB.json(postprocess=postprocess), "/v1/txn", data=json.dumps(payload))
@@ -2,33 +2,45 @@ from __future__ import annotations
 
 import abc
 import collections
+import importlib
 import logging
 import os
+import re
+import time
 import urllib
 import urllib.parse
-from typing import TYPE_CHECKING, Any
-
-from consul.api.acl import ACL
-from consul.api.agent import Agent
-from consul.api.catalog import Catalog
-from consul.api.config import Config
-from consul.api.connect import Connect
-from consul.api.coordinates import Coordinate
-from consul.api.discovery_chain import DiscoveryChain
-from consul.api.event import Event
-from consul.api.health import Health
-from consul.api.kv import KV
-from consul.api.operator import Operator
-from consul.api.query import Query
-from consul.api.session import Session
-from consul.api.snapshot import Snapshot
-from consul.api.status import Status
-from consul.api.txn import Txn
+from typing import TYPE_CHECKING, Any, Generic, TypeVar, overload
+
+from consul import instrumentation
 from consul.exceptions import ConsulException
+from consul.freshness import ReadYourWrites
+from consul.meta import QueryMeta
+from consul.singleflight import SingleFlight
 
 if TYPE_CHECKING:
+    from collections.abc import Generator, Sequence
     from types import TracebackType
 
+    from consul.api.acl import ACL
+    from consul.api.agent import Agent
+    from consul.api.catalog import Catalog
+    from consul.api.config import Config
+    from consul.api.connect import Connect
+    from consul.api.coordinates import Coordinate
+    from consul.api.discovery_chain import DiscoveryChain
+    from consul.api.event import Event
+    from consul.api.health import Health
+    from consul.api.kv import KV
+    from consul.api.operator import Operator
+    from consul.api.query import Query
+    from consul.api.session import Session
+    from consul.api.snapshot import Snapshot
+    from consul.api.status import Status
+    from consul.api.txn import Txn
+    from consul.ratelimit import RateLimiter
+    from consul.retry import Retry
+    from consul.singleflight import AsyncSingleFlight
+
 log = logging.getLogger(__name__)
 
 
@@ -38,17 +50,184 @@ log = logging.getLogger(__name__)
 
 Response = collections.namedtuple("Response", ["code", "headers", "body"])
 
+_DURATION_UNITS = {"ns": 1e-9, "us": 1e-6, "µs": 1e-6, "ms": 1e-3, "s": 1.0, "m": 60.0, "h": 3600.0}
+_DURATION_RE = re.compile(r"(\d+(?:\.\d*)?)(ns|us|µs|ms|s|m|h)")
+
+
+def parse_duration(value: str | float) -> float:
+    """
+    Returns the number of seconds of a Go duration string as accepted by
+    Consul (e.g. '10s', '5m', '1m30s', '250ms'). Plain numbers are seconds.
+    """
+    if isinstance(value, (int, float)):
+        return float(value)
+    parts = _DURATION_RE.findall(value)
+    if not parts or "".join(number + unit for number, unit in parts) != value:
+        try:
+            return float(value)
+        except ValueError:
+            raise ValueError(f"invalid duration: {value!r}") from None
+    return sum(float(number) * _DURATION_UNITS[unit] for number, unit in parts)
+
 
 class HTTPClient(metaclass=abc.ABCMeta):
     def __init__(
-        self, host: str = "127.0.0.1", port: int = 8500, scheme: str = "http", verify: bool | str = True, cert=None
+        self,
+        host: str = "127.0.0.1",
+        port: int = 8500,
+        scheme: str = "http",
+        verify: bool | str = True,
+        cert=None,
+        socket_path: str | None = None,
+        retry: Retry | None = None,
+        rate_limit: RateLimiter | None = None,
+        coalesce: bool = False,
+        max_stale: str | float | None = None,
+        read_your_writes: ReadYourWrites | None = None,
+        hooks: Sequence[instrumentation.Hook] = (),
     ) -> None:
         self.host = host
         self.port = port
         self.scheme = scheme
         self.verify = verify
-        self.base_uri = f"{self.scheme}://{self.host}:{self.port}"
+        self.socket_path = socket_path
+        if socket_path:
+            # the agent is dialed through its unix socket, the authority part
+            # of the URI is only used to fill in the Host header
+            self.base_uri = f"{self.scheme}://localhost"
+        else:
+            self.base_uri = f"{self.scheme}://{self.host}:{self.port}"
         self.cert = cert
+        self.retry = retry
+        self.rate_limit = rate_limit
+        self._flights = self._single_flight() if coalesce else None
+        self._cache: SingleFlight | AsyncSingleFlight | None = None
+        self.max_stale = parse_duration(max_stale) if max_stale is not None else None
+        self.read_your_writes = read_your_writes
+        self.hooks = tuple(hooks)
+
+    def _single_flight(self) -> SingleFlight | AsyncSingleFlight:
+        return SingleFlight()
+
+    @property
+    def coalesce(self) -> bool:
+        return self._flights is not None
+
+    @property
+    def coalesced(self) -> int:
+        """Number of requests which were served by an identical one in flight"""
+        return self._flights.collapsed if self._flights is not None else 0
+
+    def _coalescing_key(self, method: str, path: str, params, headers, callback, options: tuple = ()) -> tuple | None:
+        """
+        Returns the key under which a request may share the result of an
+        identical one, or None if it must be sent on its own.
+
+        Only reads are shared, and only when the *callback* describes how
+        it decodes the response (its *key* attribute, see `CB`): the result
+        of the callback is shared, not only the response. *options* are the
+        transport options of the request.
+        """
+        if method != "GET":
+            return None
+        decoding = getattr(callback, "key", None)
+        if decoding is None:
+            return None
+        # the token, and the Cache-Control directives of the agent cache
+        return method, self.uri(path, params), tuple(sorted((headers or {}).items())), decoding, *options
+
+    def _get(self, callback, path, params=None, headers=None, reuse_for: float | None = None, **kwargs):
+        """
+        Sends a GET with `_request`. When coalescing, its result is shared
+        with the identical requests in flight, and with *reuse_for* it's
+        reused by the identical requests sent within *reuse_for* seconds. The
+        shared results must not be mutated by the callers.
+        """
+        flights = self._flights
+        if reuse_for is not None and flights is None:
+            if self._cache is None:
+                self._cache = self._single_flight()
+            flights = self._cache
+        key = None
+        if flights is not None:
+            key = self._coalescing_key("GET", path, params, headers, callback, tuple(sorted(kwargs.items())))
+        if flights is None or key is None:
+            return self._request(callback, "GET", path, params, headers=headers, **kwargs)
+        if reuse_for is not None:
+            return flights.cached(
+                key, reuse_for, self._request, callback, "GET", path, params, headers=headers, **kwargs
+            )
+        return flights.do(key, self._request, callback, "GET", path, params, headers=headers, **kwargs)
+
+    def _request(
+        self,
+        callback,
+        method,
+        path,
+        params=None,
+        headers=None,
+        data=None,
+        connections_timeout=None,  # pylint: disable=unused-argument
+        raw: bool = False,
+        max_stale=None,  # pylint: disable=unused-argument
+        stream: bool = False,
+    ):
+        """
+        Sends a request and returns the result of *callback* on its response,
+        used by `_get`. The transports written before `_get` existed, which
+        only implement `get`, keep working: their GETs are sent with it.
+        """
+        if method != "GET" or data is not None or stream:
+            raise NotImplementedError
+        kwargs = {"raw": raw} if raw else {}
+        return self.get(callback, path, params, headers=headers, **kwargs)
+
+    #: endpoints answering 429 and 503 as health statuses (warning and
+    #: critical) rather than as errors
+    STATUS_PATHS = ("/v1/agent/health/service/",)
+
+    #: query parameters of the reads which may be answered by any server
+    RELAXED_PARAMS = frozenset({"stale", "cached"})
+
+    #: wait applied by Consul to blocking queries which don't specify one
+    DEFAULT_WAIT = 300.0
+    #: slack added to the longest time a blocking query may legitimately take
+    BLOCKING_TIMEOUT_MARGIN = 5.0
+    #: (connect, read) timeouts of the requests of clients configured without
+    #: any, so that a hung agent doesn't block them forever
+    DEFAULT_TIMEOUT = (10.0, 60.0)
+
+    def blocking_timeout(self, params: list[tuple[str, Any]] | None) -> float | None:
+        """
+        Returns the shortest read timeout that doesn't cut short a blocking
+        query sent with *params*, either index or hash based, or None if it
+        isn't a blocking query.
+
+        Consul holds the request for up to *wait* and adds a random jitter
+        of up to wait/16 to spread the wake-ups of concurrent watchers.
+        """
+        if not params:
+            return None
+        values = dict(params)
+        if "index" not in values and "hash" not in values:
+            return None
+        wait = parse_duration(values["wait"]) if values.get("wait") else self.DEFAULT_WAIT
+        return wait + wait / 16 + self.BLOCKING_TIMEOUT_MARGIN
+
+    def timeout(self, params: list[tuple[str, Any]] | None, timeout) -> tuple[float | None, float | None]:
+        """
+        Returns the (connect, read) timeouts of a request with *params*
+        given the configured *timeout*, either a single value or a
+        (connect, read) tuple, `DEFAULT_TIMEOUT` if None. The read timeout
+        of blocking queries is raised so that they are never cut short.
+        """
+        if timeout is None:
+            timeout = self.DEFAULT_TIMEOUT
+        connect, read = timeout if isinstance(timeout, tuple) else (timeout, timeout)
+        blocking = self.blocking_timeout(params)
+        if blocking is not None and (read is None or read < blocking):
+            read = blocking
+        return connect, read
 
     def uri(self, path: str, params: list[tuple[str, Any]] | None = None):
         uri = self.base_uri + urllib.parse.quote(path, safe="/:")
@@ -56,6 +235,114 @@ class HTTPClient(metaclass=abc.ABCMeta):
             uri = f"{uri}?{urllib.parse.urlencode(params)}"
         return uri
 
+    def _instrument(
+        self, method: str, path: str, params: list[tuple[str, Any]] | None = None
+    ) -> instrumentation.Request | instrumentation.Untraced:
+        """
+        Returns the `consul.instrumentation.Request` the transport wraps a
+        request in and records its timings into, a no-op one if the client
+        has no hooks.
+        """
+        if not self.hooks:
+            return instrumentation.UNTRACED
+        blocking = self.blocking_timeout(params) is not None
+        return instrumentation.Request(method, path, blocking, params, self.hooks)
+
+    def _attempts(
+        self,
+        method: str,
+        path: str,
+        params: list[tuple[str, Any]] | None = None,
+        max_stale: str | float | None = None,
+        request: instrumentation.Request | instrumentation.Untraced | None = None,
+    ) -> Generator[tuple[float, str], Response | Exception, None]:
+        """
+        Plans the attempts of a single request, independently of the I/O
+        library of the transport.
+
+        The generator yields ``(delay, uri)`` pairs: the transport sleeps
+        for *delay* seconds, sends the request to *uri* and sends the
+        outcome back in, either the `Response` or the connection error it
+        raised. Once the generator is exhausted, the last outcome is the
+        result of the request.
+
+        *max_stale* overrides the staleness bound of the client for this
+        request, see `Consul`. The outcome of the attempts is recorded in
+        *request*, see `_instrument`.
+        """
+        attempts = self._plan(method, path, params, max_stale)
+        if not isinstance(request, instrumentation.Request):
+            return attempts
+        return instrumentation.instrumented(request, attempts)
+
+    def _plan(
+        self, method: str, path: str, params: list[tuple[str, Any]] | None = None, max_stale: str | float | None = None
+    ) -> Generator[tuple[float, str], Response | Exception, None]:
+        start = time.monotonic()
+        uri = self.uri(path, params)
+        bucket = self.rate_limit.bucket(method, params) if self.rate_limit else None
+        retry = self.retry if self.retry is not None and self.retry.allows(method, path, params) else None
+        max_stale = self.max_stale if max_stale is None else parse_duration(max_stale)
+        tracker = self.read_your_writes
+        requirement = tracker.requirement(path) if tracker is not None and method == "GET" else None
+        # reads which any server (or the agent cache) may answer
+        relaxed = method == "GET" and any(key in self.RELAXED_PARAMS for key, _ in params or ())
+        if relaxed and requirement is not None and requirement[1] is None:
+            # the first read following a write is served by the leader
+            relaxed = False
+            uri = self.uri(path, [(key, value) for key, value in params if key not in self.RELAXED_PARAMS])  # type: ignore[union-attr]
+        checked = relaxed and (max_stale is not None or requirement is not None)
+        statuses = path.startswith(self.STATUS_PATHS)
+        delay = bucket.acquire() if bucket else 0.0
+        attempt = 0
+        while True:
+            outcome = yield delay, uri
+            if statuses and not isinstance(outcome, Exception) and outcome.code in (429, 503):
+                return
+            if bucket:
+                bucket.feedback(outcome)
+            if checked and self._too_stale(outcome, max_stale, requirement[1] if requirement else None):
+                # read it again from the leader, this doesn't count as a retry
+                checked = relaxed = False
+                log.debug("%s %s is too stale, reading it again in default consistency mode", method, path)
+                uri = self.uri(path, [(key, value) for key, value in params if key not in self.RELAXED_PARAMS])  # type: ignore[union-attr]
+                delay = bucket.acquire() if bucket else 0.0
+                continue
+            if tracker is not None and not isinstance(outcome, Exception) and outcome.code < 400:
+                index = QueryMeta(outcome.headers or {}).index
+                if method != "GET":
+                    tracker.wrote(path, int(index) if index else None)
+                elif requirement is not None and not relaxed and index:
+                    tracker.observed(path, requirement[0], int(index))
+            if retry is None or attempt >= retry.attempts - 1:
+                return
+            backoff = retry.delay(attempt, outcome)
+            if backoff is None or time.monotonic() - start + backoff > retry.deadline:
+                return
+            delay = backoff
+            if bucket:
+                # tokens keep accruing during the backoff
+                delay = max(delay, bucket.acquire())
+            log.debug("retrying %s %s in %.3fs after %s", method, path, delay, outcome)
+            attempt += 1
+
+    @staticmethod
+    def _too_stale(outcome: Response | Exception, max_stale: float | None, floor: int | None) -> bool:
+        """
+        Whether *outcome* is a stale read answered by a server without a
+        known leader or which lost contact with it more than *max_stale*
+        seconds ago, or whose index is below *floor*.
+        """
+        if isinstance(outcome, Exception) or outcome.code >= 400 or not outcome.headers:
+            return False
+        meta = QueryMeta(outcome.headers)
+        if max_stale is not None:
+            if meta.known_leader is False:
+                return True
+            if meta.last_contact is not None and meta.last_contact > max_stale:
+                return True
+        return floor is not None and meta.index is not None and int(meta.index) < floor
+
     @abc.abstractmethod
     def get(self, callback, path, params=None, headers: dict[str, str] | None = None, raw: bool = False):
         raise NotImplementedError
@@ -77,7 +364,61 @@ class HTTPClient(metaclass=abc.ABCMeta):
         raise NotImplementedError
 
 
+T = TypeVar("T")
+C = TypeVar("C", bound="Consul")
+
+CONSISTENCY_MODES = ("default", "consistent", "stale")
+
+
+class _Endpoint(Generic[T]):
+    """
+    Endpoint attribute of `Consul`: the *name* class of *module* is only
+    imported, and its object created, when the attribute is first read,
+    as most programs use a few of the endpoints.
+    """
+
+    def __init__(self, module: str, name: str) -> None:
+        self.module = module
+        self.name = name
+        self.attribute = name.lower()
+
+    def __set_name__(self, owner: type, attribute: str) -> None:
+        self.attribute = attribute
+
+    @overload
+    def __get__(self, instance: None, owner: type | None = None) -> _Endpoint[T]: ...
+
+    @overload
+    def __get__(self, instance: Consul, owner: type | None = None) -> T: ...
+
+    def __get__(self, instance: Consul | None, owner: type | None = None) -> T | _Endpoint[T]:
+        if instance is None:
+            return self
+        endpoint = getattr(importlib.import_module(self.module), self.name)(instance)
+        # shadows the descriptor from now on: two threads racing for the
+        # first read may create their own, equivalent, endpoints
+        instance.__dict__[self.attribute] = endpoint
+        return endpoint
+
+
 class Consul:
+    event: _Endpoint[Event] = _Endpoint("consul.api.event", "Event")
+    kv: _Endpoint[KV] = _Endpoint("consul.api.kv", "KV")
+    txn: _Endpoint[Txn] = _Endpoint("consul.api.txn", "Txn")
+    agent: _Endpoint[Agent] = _Endpoint("consul.api.agent", "Agent")
+    catalog: _Endpoint[Catalog] = _Endpoint("consul.api.catalog", "Catalog")
+    health: _Endpoint[Health] = _Endpoint("consul.api.health", "Health")
+    session: _Endpoint[Session] = _Endpoint("consul.api.session", "Session")
+    acl: _Endpoint[ACL] = _Endpoint("consul.api.acl", "ACL")
+    status: _Endpoint[Status] = _Endpoint("consul.api.status", "Status")
+    query: _Endpoint[Query] = _Endpoint("consul.api.query", "Query")
+    coordinate: _Endpoint[Coordinate] = _Endpoint("consul.api.coordinates", "Coordinate")
+    operator: _Endpoint[Operator] = _Endpoint("consul.api.operator", "Operator")
+    connect: _Endpoint[Connect] = _Endpoint("consul.api.connect", "Connect")
+    config: _Endpoint[Config] = _Endpoint("consul.api.config", "Config")
+    discovery_chain: _Endpoint[DiscoveryChain] = _Endpoint("consul.api.discovery_chain", "DiscoveryChain")
+    snapshot: _Endpoint[Snapshot] = _Endpoint("consul.api.snapshot", "Snapshot")
+
     def __init__(
         self,
         host: str | None = None,
@@ -88,6 +429,13 @@ class Consul:
         dc=None,
         verify: bool | str | None = None,
         cert=None,
+        socket_path: str | None = None,
+        retry: Retry | None = None,
+        rate_limit: RateLimiter | None = None,
+        coalesce: bool = False,
+        max_stale: str | float | None = None,
+        read_your_writes: bool | ReadYourWrites = False,
+        hooks: Sequence[instrumentation.Hook] | None = None,
     ) -> None:
         """
         *token* is an optional `ACL token`_. If supplied it will be used by
@@ -106,10 +454,45 @@ class Consul:
         *verify* is whether to verify the SSL certificate for HTTPS requests
 
         *cert* client side certificates for HTTPS requests
+
+        The clients with the same *verify* and *cert* share their TLS
+        configuration, see `consul.tls`: the certificates are loaded once,
+        again only by the clients built after the files changed on disk.
+
+        *socket_path* is the path of the unix domain socket the agent
+        serves its HTTP API on (``addresses.http = "unix:///..."``). When
+        set, *host* and *port* are ignored. It can also be supplied through
+        ``CONSUL_HTTP_ADDR=unix:///path/to/consul.sock``.
+
+        *retry* is an optional `consul.retry.Retry` policy applied by the
+        transport to failed requests. By default requests are not retried.
+
+        *rate_limit* is an optional `consul.ratelimit.RateLimiter` throttling
+        the requests sent by the transport, adapting to the 429 and 503
+        answered by rate-limited servers.
+
+        *coalesce* if set, concurrent identical reads (same URI, headers and
+        decoding) share a single request in flight and its decoded result,
+        which therefore must not be mutated by the callers. The number of
+        collapsed requests is counted in ``self.http.coalesced``.
+
+        *max_stale* bounds the staleness of 'stale' reads, in seconds or as
+        a duration string: a stale read answered by a server that lost
+        contact with the leader for longer, or that knows of no leader, is
+        read again in default consistency mode. It can be overridden per
+        request by the methods supporting it.
+
+        *read_your_writes* if set, stale and cached reads are guaranteed to
+        reflect the writes previously made by this client, see
+        `consul.freshness.ReadYourWrites`. A tracker can be passed instead
+        of True to share it between clients.
+
+        *hooks* are `consul.instrumentation.Hook` told about every request
+        sent by the transport, e.g. a `consul.instrumentation.LatencyHistogram`.
         """
 
         # TODO: Status
-        if host is None and port is None and os.getenv("CONSUL_HTTP_ADDR"):
+        if host is None and port is None and socket_path is None and os.getenv("CONSUL_HTTP_ADDR"):
             env_conf: str = os.getenv("CONSUL_HTTP_ADDR")  # type: ignore
             # Urllib.parse requires a // for addresses that do not have a schema supplied
             if "//" not in env_conf:
@@ -118,16 +501,21 @@ class Consul:
 
             # urllib doesn't throw exceptions, so we do a little bit of checking as suggested
             # and catch errors
-            try:
-                host = str(prs.hostname)
-                port = int(prs.port)  # type: ignore
-                # CONSUL_HTTP_SSL variable has precedence for schema definition
-                if not os.getenv("CONSUL_HTTP_SSL") and prs.scheme:
-                    scheme = str(prs.scheme)
-            except ValueError as err:
-                raise ConsulException(
-                    f"CONSUL_HTTP_ADDR ({env_conf}) invalid, does not match <host>:<port> or <scheme>://<host>:<port>"
-                ) from err
+            if prs.scheme == "unix":
+                if not prs.path:
+                    raise ConsulException(f"CONSUL_HTTP_ADDR ({env_conf}) invalid, does not match unix://<path>")
+                socket_path = prs.path
+            else:
+                try:
+                    host = str(prs.hostname)
+                    port = int(prs.port)  # type: ignore
+                    # CONSUL_HTTP_SSL variable has precedence for schema definition
+                    if not os.getenv("CONSUL_HTTP_SSL") and prs.scheme:
+                        scheme = str(prs.scheme)
+                except ValueError as err:
+                    raise ConsulException(
+                        f"CONSUL_HTTP_ADDR ({env_conf}) invalid, does not match <host>:<port> or <scheme>://<host>:<port>"
+                    ) from err
 
         if host is None:
             host = "127.0.0.1"
@@ -142,33 +530,53 @@ class Consul:
             ssl_verify = os.getenv("CONSUL_HTTP_SSL_VERIFY")
             verify = ssl_verify.lower() == "true" if ssl_verify else True
 
+        self.socket_path = socket_path
+        self.retry = retry
+        self.rate_limit = rate_limit
+        self.coalesce = coalesce
+        self.max_stale = max_stale
+        if read_your_writes is True:
+            read_your_writes = ReadYourWrites()
+        self.read_your_writes = read_your_writes or None
+        self.hooks = hooks or ()
         self.http = self.http_connect(host, port, scheme, verify, cert)
         self.token = os.getenv("CONSUL_HTTP_TOKEN", token)
         self.scheme = scheme
         self.dc = dc
-        assert consistency in (
-            "default",
-            "consistent",
-            "stale",
-        ), "consistency must be either default, consistent or state"
+        assert consistency in CONSISTENCY_MODES, "consistency must be either default, consistent or state"
         self.consistency = consistency
+        # views created by with_options share the transport of their client
+        self.shares_transport = False
 
-        self.event = Event(self)
-        self.kv = KV(self)
-        self.txn = Txn(self)
-        self.agent = Agent(self)
-        self.catalog = Catalog(self)
-        self.health = Health(self)
-        self.session = Session(self)
-        self.acl = ACL(self)
-        self.status = Status(self)
-        self.query = Query(self)
-        self.coordinate = Coordinate(self)
-        self.operator = Operator(self)
-        self.connect = Connect(self)
-        self.config = Config(self)
-        self.discovery_chain = DiscoveryChain(self)
-        self.snapshot = Snapshot(self)
+    def with_options(self: C, token: str | None = None, dc: str | None = None, consistency: str | None = None) -> C:
+        """
+        Returns a view of this client sending its requests with *token*, to
+        *dc* and in *consistency* mode, the ones of this client being kept
+        when None (an empty *token* sends none), e.g. for each tenant of a
+        gateway.
+
+        The view shares the transport of this client, along with its
+        connection pool, rate limit, coalescing and hooks: creating one
+        opens no connection. Closing it doesn't close the transport, closing
+        this client does.
+        """
+        if consistency is not None:
+            assert consistency in CONSISTENCY_MODES, "consistency must be either default, consistent or state"
+        view = object.__new__(type(self))
+        # the endpoints are bound to their client, the view creates its own
+        view.__dict__.update(
+            (name, value)
+            for name, value in vars(self).items()
+            if not isinstance(getattr(type(self), name, None), _Endpoint)
+        )
+        view.shares_transport = True
+        if token is not None:
+            view.token = token
+        if dc is not None:
+            view.dc = dc
+        if consistency is not None:
+            view.consistency = consistency
+        return view
 
     def __enter__(self):
         return self
@@ -179,19 +587,62 @@ class Consul:
     def __exit__(
         self, exc_type: type[BaseException] | None, exc_val: BaseException | None, exc_tb: TracebackType | None
     ) -> None:
-        self.http.close()
+        if not self.shares_transport:
+            self.http.close()
 
     async def __aexit__(
         self, exc_type: type[BaseException] | None, exc: BaseException | None, tb: TracebackType | None
     ) -> None:
-        await self.http.close()
+        if not self.shares_transport:
+            await self.http.close()
 
     @abc.abstractmethod
     def http_connect(self, host: str, port: int, scheme, verify: bool | str = True, cert=None):
         pass
 
+    def transport_options(self) -> dict[str, Any]:
+        """
+        Keyword arguments understood by every `HTTPClient`, to be forwarded
+        by the *http_connect* implementations.
+        """
+        return {
+            "socket_path": self.socket_path,
+            "retry": self.retry,
+            "rate_limit": self.rate_limit,
+            "coalesce": self.coalesce,
+            "max_stale": self.max_stale,
+            "read_your_writes": self.read_your_writes,
+            "hooks": self.hooks,
+        }
+
     def prepare_headers(self, token: str | None = None) -> dict[str, str]:
         headers = {}
         if token or self.token:
             headers["X-Consul-Token"] = token or self.token
         return headers  # type: ignore
+
+    @staticmethod
+    def prepare_cache(
+        params: list[tuple[str, Any]],
+        headers: dict[str, str],
+        max_age: str | float | None = None,
+        stale_if_error: str | float | None = None,
+    ) -> None:
+        """
+        Makes a read served from the agent cache rather than by the servers.
+
+        *max_age* is the oldest cached data accepted, older data is fetched
+        again before answering. *stale_if_error* is how old cached data may
+        be to still be served when the servers can't be reached. Both are
+        either a number of seconds or a duration string (e.g. '30s').
+        Consul rejects cached reads in consistent mode.
+        """
+        assert all(key != "consistent" for key, _ in params), "cached reads can't be consistent"
+        params.append(("cached", "1"))
+        directives = []
+        if max_age is not None:
+            directives.append(f"max-age={int(parse_duration(max_age))}")
+        if stale_if_error is not None:
+            directives.append(f"stale-if-error={int(parse_duration(stale_if_error))}")
+        if directives:
+            headers["Cache-Control"] = ", ".join(directives)
@@ -1,21 +1,92 @@
 from __future__ import annotations
 
 import base64
+import functools
 import json
-from typing import TYPE_CHECKING
-
-from consul.exceptions import ACLDisabled, ACLPermissionDenied, BadRequest, ClientError, ConsulException, NotFound
+from typing import TYPE_CHECKING, Any
+
+import consul.stream
+from consul.exceptions import (
+    ACLDisabled,
+    ACLPermissionDenied,
+    BadRequest,
+    ClientError,
+    ConsulException,
+    NotFound,
+    RateLimited,
+)
+from consul.meta import QueryMeta
+from consul.projection import Projection
 
 if TYPE_CHECKING:
-    from collections.abc import Callable
+    from collections.abc import Callable, Hashable, Iterable
 
     from consul.base import Response
 
 #
 # Conveniences to create consistent callback handlers for endpoints
 
+#: longest string values shared by CB.json(intern=True), the longer ones
+#: (e.g. the output of the checks) are seldom repeated
+INTERN_MAX_LENGTH = 128
+#: most distinct strings remembered while decoding a response with
+#: CB.json(intern=True), bounding the memo of long streamed responses
+INTERN_MAX_STRINGS = 4096
+
+
+class _Interner:
+    """
+    Object pairs hook sharing the equal keys and short string values of the
+    objects decoded from one response. Unlike `sys.intern`, which makes
+    the strings immortal, the memo is dropped along with the decoder, so
+    a long-lived watcher doesn't accumulate the strings of every response.
+    """
+
+    __slots__ = ("_strings",)
+
+    def __init__(self) -> None:
+        self._strings: dict[str, str] = {}
+
+    def _string(self, value: str) -> str:
+        if len(self._strings) < INTERN_MAX_STRINGS:
+            return self._strings.setdefault(value, value)
+        return self._strings.get(value, value)
+
+    def _value(self, value: Any) -> Any:
+        if isinstance(value, str):
+            return self._string(value) if len(value) <= INTERN_MAX_LENGTH else value
+        if isinstance(value, list):
+            # e.g. tags, the objects of a list were shared when decoded
+            return [self._value(item) for item in value]
+        return value
+
+    def __call__(self, pairs: list[tuple[str, Any]]) -> dict[str, Any]:
+        return {self._string(key): self._value(value) for key, value in pairs}
+
+
+class Keyed:
+    """
+    Callback calling *fn*, whose *key* describes how it decodes a response:
+    requests using callbacks with the same key may share their result (see
+    `consul.base.HTTPClient.coalesce`).
+    """
+
+    __slots__ = ("fn", "key")
+
+    def __init__(self, fn: Callable[[Response], Any], key: Hashable) -> None:
+        self.fn = fn
+        self.key = key
+
+    def __call__(self, response: Response) -> Any:
+        return self.fn(response)
+
 
 class CB:
+    @classmethod
+    def raise_for_status(cls, response: Response, allow_404: bool = True) -> None:
+        """Raises the error matching the status of *response*, for the callbacks written outside of CB"""
+        cls._status(response, allow_404=allow_404)
+
     @classmethod
     def _status(cls, response: Response, allow_404: bool = True) -> None:
         # status checking
@@ -29,11 +100,29 @@ class CB:
             if response.code == 404:
                 if not allow_404:
                     raise NotFound(response.body)
+            elif response.code == 429:
+                raise RateLimited(f"{response.code} {response.body}")
             else:
                 raise ClientError(f"{response.code} {response.body}")
         elif 500 <= response.code < 600:
             raise ConsulException(f"{response.code} {response.body}")
 
+    @staticmethod
+    def _decoded(item: dict, key: bool | str) -> dict:
+        # base64 decodes the *key* field of *item*, e.g. the Value of a KV entry
+        if item.get(key) is not None:
+            item[key] = base64.b64decode(item[key])
+        return item
+
+    @staticmethod
+    def _transform(decode: bool | str, projection: Projection | None) -> Callable[[dict], dict] | None:
+        # the function applied to each decoded item, if any
+        if not decode:
+            return projection
+        if projection is None:
+            return functools.partial(CB._decoded, key=decode)
+        return lambda item: CB._decoded(projection(item), decode)
+
     @classmethod
     def boolean(cls) -> Callable[[Response], bool]:
         # returns True on successful response
@@ -41,7 +130,7 @@ class CB:
             CB._status(response)
             return response.code == 200
 
-        return cb
+        return Keyed(cb, ("boolean",))
 
     @classmethod
     def binary(cls) -> Callable[[Response], bytes]:
@@ -51,7 +140,7 @@ class CB:
             CB._status(response, allow_404=False)
             return response.body
 
-        return cb
+        return Keyed(cb, ("binary",))
 
     @classmethod
     def json(
@@ -62,6 +151,10 @@ class CB:
         decode: bool | str = False,
         is_id: bool = False,
         index: bool = False,
+        meta: bool = False,
+        stream: bool = False,
+        fields: Iterable[str] | None = None,
+        intern: bool = False,
     ):
         """
         *postprocess* is a function to apply to the final result.
@@ -71,25 +164,45 @@ class CB:
 
         *index* if set, a tuple of index, data will be returned.
 
+        *meta* if set, a tuple of `QueryMeta`, data will be returned instead.
+
         *one* returns only the first item of the list of items. empty lists are
         coerced to None.
 
         *decode* if specified this key will be base64 decoded.
 
         *is_id* only the 'ID' field of the json object will be returned.
+
+        *stream* if set, the response is a list whose body is streamed by
+        the transport (see `consul.stream`), and its items are returned as
+        an iterator, or an async iterator with the asyncio transports,
+        parsing them as they are received.
+
+        *fields* if set, only these fields of the decoded objects are kept,
+        see `consul.projection.Projection`. The whole response is decoded
+        first unless *stream* is set.
+
+        *intern* if set, the keys and the short string values of the decoded
+        objects are deduplicated, so that the strings repeated across the
+        objects (node names, tags, statuses, ...) are shared instead of
+        being copied in each of them.
         """
+        assert not (stream and (postprocess or one or is_id)), "a streamed list can't be post-processed"
+        projection = Projection(fields) if fields else None
+        transform = CB._transform(decode, projection)
 
         def cb(response):
             CB._status(response, allow_404=allow_404)
             if response.code == 404:
                 data = None
+            elif stream:
+                decoder = json.JSONDecoder(object_pairs_hook=_Interner()) if intern else None
+                data = consul.stream.parse(response.body, transform, decoder)
             else:
                 try:
-                    data = json.loads(response.body)
-                    if decode:
-                        for item in data:
-                            if item.get(decode) is not None:
-                                item[decode] = base64.b64decode(item[decode])
+                    data = json.loads(response.body, object_pairs_hook=_Interner() if intern else None)
+                    if transform:
+                        data = [transform(item) for item in data] if isinstance(data, list) else transform(data)
                     if is_id:
                         data = data["ID"]
                     if one and isinstance(data, list):
@@ -98,10 +211,30 @@ class CB:
                         data = postprocess(data)
                 except (json.JSONDecodeError, TypeError, KeyError) as e:
                     raise ConsulException(f"Failed to decode JSON: {response.body} {e}") from e
+            if meta:
+                return QueryMeta(response.headers), data
             if index:
                 if "X-Consul-Index" not in response.headers:
                     raise ConsulException(f"Missing index header: {response.headers}")
                 return response.headers["X-Consul-Index"], data
             return data
 
+        if postprocess is None and not stream:
+            # identical callbacks decode a response the same way, requests
+            # using them may share their result (see HTTPClient.coalesce),
+            # unlike an iterator which can only be consumed once
+            return Keyed(
+                cb,
+                (
+                    "json",
+                    allow_404,
+                    one,
+                    decode,
+                    is_id,
+                    index,
+                    meta,
+                    projection.fields if projection else None,
+                    intern,
+                ),
+            )
         return cb
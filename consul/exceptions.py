@@ -24,3 +24,7 @@ class BadRequest(ConsulException):
 
 class ClientError(ConsulException):
     """Encapsulates 4xx Http error code"""
+
+
+class RateLimited(ClientError):
+    """The server is rate limiting this client (HTTP 429)"""
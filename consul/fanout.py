@@ -0,0 +1,124 @@
+"""
+Runs a datacenter-aware read against several datacenters at once, e.g.::
+
+    result = c.fan_out(c.health.state, "critical")
+    for dc, check in result.merged():
+        ...
+    for dc, error in result.errors.items():
+        ...
+
+The sync clients run the calls in a pool of threads, the asyncio clients
+as concurrent tasks, at most *concurrency* at a time.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+from typing import TYPE_CHECKING, Any
+
+from consul.exceptions import Timeout
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable, Iterable
+
+
+class FanOut:
+    """
+    Outcome of a fan-out: *results* maps each datacenter which answered to
+    the value returned by the endpoint, *errors* maps the others to the
+    exception raised, a `consul.Timeout` for those which didn't answer in
+    time.
+    """
+
+    def __init__(self) -> None:
+        self.results: dict[str, Any] = {}
+        self.errors: dict[str, BaseException] = {}
+
+    def __repr__(self) -> str:
+        return f"FanOut(results={sorted(self.results)!r}, errors={self.errors!r})"
+
+    @property
+    def complete(self) -> bool:
+        """Whether every datacenter answered"""
+        return not self.errors
+
+    def merged(self) -> list[tuple[str, Any]]:
+        """
+        Returns the results as (dc, item) pairs: the items of list results
+        (e.g. Health.state), the (key, value) pairs of dict results (e.g.
+        Catalog.services), other results as is. The index of the endpoints
+        returning (index, data) is dropped.
+        """
+        merged: list[tuple[str, Any]] = []
+        for dc, value in self.results.items():
+            data = value[1] if isinstance(value, tuple) and len(value) == 2 else value
+            if isinstance(data, list):
+                merged.extend((dc, item) for item in data)
+            elif isinstance(data, dict):
+                merged.extend((dc, item) for item in data.items())
+            elif data is not None:
+                merged.append((dc, data))
+        return merged
+
+
+def fan_out(
+    endpoint: Callable[..., Any],
+    args: tuple[Any, ...],
+    kwargs: dict[str, Any],
+    dcs: Iterable[str],
+    concurrency: int,
+    timeout: float | None,
+) -> FanOut:
+    dcs = list(dcs)
+    result = FanOut()
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(dcs))))
+    futures = {executor.submit(endpoint, *args, dc=dc, **kwargs): dc for dc in dcs}
+    done, pending = concurrent.futures.wait(futures, timeout=timeout)
+    for future in pending:
+        future.cancel()
+        result.errors[futures[future]] = Timeout(f"no answer within {timeout}s")
+    # the calls in progress can't be interrupted, don't wait for them
+    executor.shutdown(wait=False)
+    for future, dc in futures.items():
+        if future not in done:
+            continue
+        error = future.exception()
+        if error is None:
+            result.results[dc] = future.result()
+        else:
+            result.errors[dc] = error
+    return result
+
+
+async def fan_out_async(
+    endpoint: Callable[..., Awaitable[Any]],
+    args: tuple[Any, ...],
+    kwargs: dict[str, Any],
+    dcs: Iterable[str],
+    concurrency: int,
+    timeout: float | None,
+) -> FanOut:
+    result = FanOut()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def call(dc: str) -> Any:
+        async with semaphore:
+            return await endpoint(*args, dc=dc, **kwargs)
+
+    tasks = {asyncio.ensure_future(call(dc)): dc for dc in dcs}
+    if not tasks:
+        return result
+    done, pending = await asyncio.wait(tasks, timeout=timeout)
+    for task in pending:
+        task.cancel()
+        result.errors[tasks[task]] = Timeout(f"no answer within {timeout}s")
+    for task, dc in tasks.items():
+        if task not in done:
+            continue
+        error = task.exception()
+        if error is None:
+            result.results[dc] = task.result()
+        else:
+            result.errors[dc] = error
+    return result
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import collections
+import threading
+
+
+class ReadYourWrites:
+    """
+    Read-your-writes tracking of a client, e.g.::
+
+        c = consul.Consul(consistency="stale", read_your_writes=True)
+        c.kv.put("foo", "bar")
+        c.kv.get("foo")  # sees "bar"
+
+    Consul has no global read index: the X-Consul-Index of a read is the
+    last index which modified the data read. Writes are therefore tracked
+    per *family* of endpoints (the KV store, the catalog which the health
+    endpoints read too, and the sessions) and reads per path:
+
+    - after a write to a family, the first read of each of its paths is
+      served by the leader, whose answer reflects the write, and the
+      index it returns becomes the floor of the path;
+    - later stale (or cached) reads of the path answered with an index
+      below its floor are read again from the leader.
+
+    The index of the keys written by a transaction (their ModifyIndex) is
+    known, their floor is set right away instead.
+
+    Stale reads of paths not written to since they were last read keep
+    being answered by any server. A tracker may be shared by several
+    clients, e.g. a std and an asyncio one, and is thread-safe.
+
+    Note that the registrations made through the agent endpoints reach the
+    catalog asynchronously, through the anti-entropy of the agent, they are
+    not tracked.
+    """
+
+    FAMILIES = (
+        ("/v1/kv/", ("kv",)),
+        ("/v1/catalog/", ("catalog",)),
+        ("/v1/health/", ("catalog",)),
+        # destroying a session releases the locks it holds
+        ("/v1/session/", ("session", "kv")),
+        ("/v1/txn", ("kv", "catalog", "session")),
+    )
+
+    def __init__(self, size: int = 4096) -> None:
+        """*size* is the number of paths whose floor is remembered"""
+        self.size = size
+        self._lock = threading.Lock()
+        self._generations: dict[str, int] = {}
+        self._floors: collections.OrderedDict[str, tuple[int, int]] = collections.OrderedDict()
+
+    @classmethod
+    def families(cls, path: str) -> tuple[str, ...]:
+        for prefix, families in cls.FAMILIES:
+            if path.startswith(prefix):
+                return families
+        return ()
+
+    def wrote(self, path: str, index: int | None = None) -> None:
+        """Records a successful write to *path*, at *index* if known"""
+        families = self.families(path)
+        if not families:
+            return
+        with self._lock:
+            for family in families:
+                self._generations[family] = self._generations.get(family, 0) + 1
+            if index is not None:
+                self._store(path, self._generations[families[0]], index)
+
+    def set_floor(self, path: str, index: int) -> None:
+        """Records that *path* was modified at *index* by a tracked write"""
+        families = self.families(path)
+        if not families:
+            return
+        with self._lock:
+            self._store(path, self._generations.get(families[0], 0), index)
+
+    def requirement(self, path: str) -> tuple[int, int | None] | None:
+        """
+        Returns None if a read of *path* may be answered by any server,
+        otherwise a (generation, floor) pair where *floor* is the lowest
+        index a fresh answer may carry, or None if it's unknown and the read
+        must be served by the leader.
+        """
+        families = self.families(path)
+        if not families:
+            return None
+        with self._lock:
+            generation = self._generations.get(families[0], 0)
+            if not generation:
+                return None
+            record = self._floors.get(path)
+            if record is None or record[0] < generation:
+                return generation, None
+            return record
+
+    def observed(self, path: str, generation: int, index: int) -> None:
+        """Records the *index* of a fresh read of *path* made at *generation*"""
+        families = self.families(path)
+        with self._lock:
+            if families and self._generations.get(families[0], 0) == generation:
+                self._store(path, generation, index)
+
+    def _store(self, path: str, generation: int, index: int) -> None:
+        record = self._floors.get(path)
+        if record is not None and record[0] == generation:
+            index = max(index, record[1])
+        self._floors[path] = (generation, index)
+        self._floors.move_to_end(path)
+        while len(self._floors) > self.size:
+            self._floors.popitem(last=False)
@@ -0,0 +1,318 @@
+"""
+HTTP/2 transports for python consul using the httpx library.
+
+HTTP/1.1 needs one connection per outstanding request, so every blocking
+query pins a connection (and a TLS session) for up to its whole *wait*
+duration. Over HTTP/2 many concurrent requests are multiplexed as streams
+on a few connections instead.
+
+These transports are selected with ``consul.Consul(http2=True)`` or
+``consul.aio.Consul(http2=True)`` and require the optional ``http2``
+dependencies (``pip install py-consul[http2]``). Consul only negotiates
+HTTP/2 over TLS, plain ``http`` agents keep being talked to in HTTP/1.1.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import TYPE_CHECKING, Any
+
+import httpx
+
+from consul import Timeout, base, instrumentation, tls
+from consul.offload import Offloader
+from consul.singleflight import AsyncSingleFlight
+from consul.stream import CHUNK_SIZE
+
+if TYPE_CHECKING:
+    import concurrent.futures
+    import ssl
+    from collections.abc import Coroutine
+
+__all__ = ["AsyncHTTPClient", "HTTPClient"]
+
+
+class _HTTPXClient(base.HTTPClient):  # pylint: disable=abstract-method
+    """
+    Shared construction and request building of the httpx transports, the
+    subclasses only differ in whether ``_request`` is a coroutine.
+    """
+
+    def __init__(self, *args, connections_timeout=None, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        # timeouts are computed for each request: httpx's default of 5s
+        # would cut blocking queries short
+        self.connections_timeout = connections_timeout
+
+    def _transport_kwargs(self, connections_limit=None) -> dict[str, Any]:
+        kwargs: dict[str, Any] = {"http2": True, "verify": self._ssl_context()}
+        if connections_limit:
+            kwargs["limits"] = httpx.Limits(max_connections=connections_limit)
+        if self.socket_path:
+            kwargs["uds"] = self.socket_path
+        return kwargs
+
+    def _ssl_context(self) -> ssl.SSLContext | bool:
+        if not self.verify:
+            return False
+        return tls.client_context(self.verify, self.cert, http2=True)
+
+    def _extensions(self, request: instrumentation.Request | instrumentation.Untraced, coroutine: bool) -> dict:
+        """
+        Returns the httpx extensions of an attempt of *request*: a trace
+        recording the time spent opening a connection, if it's traced.
+        """
+        if not isinstance(request, instrumentation.Request):
+            return {}
+        connecting: list[float] = []
+
+        def trace(event: str, info: dict) -> None:  # pylint: disable=unused-argument
+            if event == "connection.connect_tcp.started":
+                connecting.append(time.perf_counter())
+            elif event in ("connection.connect_tcp.complete", "connection.start_tls.complete") and connecting:
+                request.mark("connect", time.perf_counter() - connecting[0])
+
+        async def atrace(event: str, info: dict) -> None:
+            trace(event, info)
+
+        return {"trace": atrace if coroutine else trace}
+
+    def _httpx_timeout(self, params, connections_timeout) -> httpx.Timeout:
+        connect, read = self.timeout(params, connections_timeout or self.connections_timeout)
+        return httpx.Timeout(read, connect=connect)
+
+    @staticmethod
+    def response(response: httpx.Response, raw: bool = False) -> base.Response:
+        if raw:
+            # e.g. the gzip archive returned by GET /v1/snapshot
+            return base.Response(response.status_code, response.headers, response.content)
+        response.encoding = "utf-8"
+        return base.Response(response.status_code, response.headers, response.text)
+
+    def get(
+        self,
+        callback,
+        path,
+        params=None,
+        headers: dict[str, str] | None = None,
+        raw: bool = False,
+        connections_timeout=None,
+        max_stale=None,
+        reuse_for=None,
+        stream: bool = False,
+    ):
+        return self._get(
+            callback,
+            path,
+            params,
+            headers,
+            reuse_for,
+            raw=raw,
+            connections_timeout=connections_timeout,
+            max_stale=max_stale,
+            stream=stream,
+        )
+
+    def put(
+        self,
+        callback,
+        path,
+        params=None,
+        data: str | bytes = "",
+        headers: dict[str, str] | None = None,
+        connections_timeout=None,
+    ):
+        return self._request(
+            callback, "PUT", path, params, headers=headers, data=data, connections_timeout=connections_timeout
+        )
+
+    def delete(
+        self,
+        callback,
+        path,
+        params=None,
+        data: str | bytes = "",
+        headers: dict[str, str] | None = None,
+        connections_timeout=None,
+    ):
+        return self._request(
+            callback, "DELETE", path, params, headers=headers, data=data, connections_timeout=connections_timeout
+        )
+
+    def post(
+        self,
+        callback,
+        path,
+        params=None,
+        data: str = "",
+        headers: dict[str, str] | None = None,
+        connections_timeout=None,
+    ):
+        return self._request(
+            callback, "POST", path, params, headers=headers, data=data, connections_timeout=connections_timeout
+        )
+
+
+class HTTPClient(_HTTPXClient):
+    """Synchronous HTTP/2 transport, thread-safe and shared by all threads"""
+
+    def __init__(self, *args, connections_limit=None, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._client = httpx.Client(transport=httpx.HTTPTransport(**self._transport_kwargs(connections_limit)))
+
+    @staticmethod
+    def _chunks(resp: httpx.Response):
+        try:
+            yield from resp.iter_bytes(CHUNK_SIZE)
+        finally:
+            resp.close()
+
+    def _request(
+        self,
+        callback,
+        method,
+        path,
+        params=None,
+        headers=None,
+        data=None,
+        connections_timeout=None,
+        raw: bool = False,
+        max_stale=None,
+        stream: bool = False,
+    ):
+        with self._instrument(method, path, params) as traced:
+            attempts = self._attempts(method, path, params, max_stale, traced)
+            delay, uri = next(attempts)
+            outcome: base.Response | Exception
+            while True:
+                if delay:
+                    time.sleep(delay)
+                try:
+                    request = self._client.build_request(
+                        method,
+                        uri,
+                        headers=headers,
+                        content=data or None,
+                        timeout=self._httpx_timeout(params, connections_timeout),
+                        extensions=self._extensions(traced, coroutine=False),
+                    )
+                    start = time.perf_counter()
+                    resp = self._client.send(request, stream=True)
+                    headers_received = time.perf_counter()
+                    traced.mark("ttfb", headers_received - start)
+                    if stream and resp.status_code < 300:
+                        outcome = base.Response(resp.status_code, resp.headers, self._chunks(resp))
+                    else:
+                        resp.read()
+                        outcome = self.response(resp, raw=raw)
+                    traced.mark("read", time.perf_counter() - headers_received)
+                except httpx.TransportError as e:
+                    outcome = e
+                try:
+                    delay, uri = attempts.send(outcome)
+                except StopIteration:
+                    break
+                if stream and not isinstance(outcome, Exception):
+                    resp.close()
+            if isinstance(outcome, httpx.TimeoutException):
+                raise Timeout from outcome
+            if isinstance(outcome, Exception):
+                raise outcome
+            with traced.timed("decode"):
+                return callback(outcome)
+
+    def close(self) -> None:
+        self._client.close()
+
+
+class AsyncHTTPClient(_HTTPXClient):
+    """Asyncio HTTP/2 transport, a drop-in replacement of consul.aio.HTTPClient"""
+
+    def __init__(
+        self,
+        *args,
+        connections_limit=None,
+        offload_threshold: int | None = Offloader.THRESHOLD,
+        offload_executor: concurrent.futures.Executor | None = None,
+        **kwargs,
+    ) -> None:
+        """
+        The response bodies larger than *offload_threshold* bytes are
+        decoded in *offload_executor*, see `consul.offload.Offloader`.
+        """
+        super().__init__(*args, **kwargs)
+        self.offloader = Offloader(offload_threshold, offload_executor)
+        self._client = httpx.AsyncClient(
+            transport=httpx.AsyncHTTPTransport(**self._transport_kwargs(connections_limit))
+        )
+
+    def _single_flight(self) -> AsyncSingleFlight:
+        return AsyncSingleFlight()
+
+    @staticmethod
+    async def _chunks(resp: httpx.Response):
+        try:
+            async for chunk in resp.aiter_bytes(CHUNK_SIZE):
+                yield chunk
+        finally:
+            await resp.aclose()
+
+    async def _request(  # pylint: disable=invalid-overridden-method
+        self,
+        callback,
+        method,
+        path,
+        params=None,
+        headers=None,
+        data=None,
+        connections_timeout=None,
+        raw: bool = False,
+        max_stale=None,
+        stream: bool = False,
+    ):
+        with self._instrument(method, path, params) as traced:
+            attempts = self._attempts(method, path, params, max_stale, traced)
+            delay, uri = next(attempts)
+            outcome: base.Response | Exception
+            while True:
+                if delay:
+                    await asyncio.sleep(delay)
+                try:
+                    request = self._client.build_request(
+                        method,
+                        uri,
+                        headers=headers,
+                        content=data or None,
+                        timeout=self._httpx_timeout(params, connections_timeout),
+                        extensions=self._extensions(traced, coroutine=True),
+                    )
+                    start = time.perf_counter()
+                    resp = await self._client.send(request, stream=True)
+                    headers_received = time.perf_counter()
+                    traced.mark("ttfb", headers_received - start)
+                    if stream and resp.status_code < 300:
+                        outcome = base.Response(resp.status_code, resp.headers, self._chunks(resp))
+                    else:
+                        # decoded along with the response by the offloader
+                        outcome = base.Response(resp.status_code, resp.headers, await resp.aread())
+                    traced.mark("read", time.perf_counter() - headers_received)
+                except httpx.TransportError as e:
+                    outcome = e
+                try:
+                    delay, uri = attempts.send(outcome)
+                except StopIteration:
+                    break
+                if stream and not isinstance(outcome, Exception):
+                    await resp.aclose()
+            if isinstance(outcome, httpx.TimeoutException):
+                raise Timeout from outcome
+            if isinstance(outcome, Exception):
+                raise outcome
+            if outcome.code == 599:
+                raise Timeout
+            with traced.timed("decode"):
+                return await self.offloader.decode(callback, outcome, raw=raw)
+
+    def close(self) -> Coroutine[Any, Any, None]:
+        return self._client.aclose()
@@ -0,0 +1,540 @@
+"""
+Instrumentation of the requests sent by the clients, e.g.::
+
+    latency = LatencyHistogram()
+    c = consul.Consul(hooks=[latency, PrometheusHook()])
+    ...
+    latency.percentile("GET", "/v1/kv/:key", 0.99)
+
+The hooks are told about each request before it's sent and once its
+response is decoded, with the endpoint it was sent to as a template (e.g.
+``/v1/kv/:key`` rather than ``/v1/kv/config/web``) whose number of values
+is bounded, suitable as a metric label.
+"""
+
+from __future__ import annotations
+
+import bisect
+import contextlib
+import logging
+import random
+import re
+import threading
+import time
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Generator, Iterable, Iterator, Sequence
+    from types import TracebackType
+
+    from consul.base import Response
+
+log = logging.getLogger(__name__)
+
+#: templates of the endpoints taking parameters in their path, the first
+#: matching a path wins. A ':key' matches the rest of the path, the other
+#: parameters a single segment.
+TEMPLATES = (
+    "/v1/acl/token/self",
+    "/v1/agent/service/register",
+    "/v1/kv/:key",
+    "/v1/acl/auth-method/:name",
+    "/v1/acl/binding-rule/:binding_rule_id",
+    "/v1/acl/policy/:policy_id",
+    "/v1/acl/role/name/:name",
+    "/v1/acl/role/:role_id",
+    "/v1/acl/templated-policy/name/:name",
+    "/v1/acl/templated-policy/preview/:name",
+    "/v1/acl/token/:accessor_id/clone",
+    "/v1/acl/token/:accessor_id",
+    "/v1/agent/check/deregister/:check_id",
+    "/v1/agent/check/fail/:check_id",
+    "/v1/agent/check/pass/:check_id",
+    "/v1/agent/check/warn/:check_id",
+    "/v1/agent/connect/ca/leaf/:service",
+    "/v1/agent/force-leave/:node",
+    "/v1/agent/health/service/id/:service_id",
+    "/v1/agent/health/service/name/:service",
+    "/v1/agent/join/:address",
+    "/v1/agent/service/deregister/:service_id",
+    "/v1/agent/service/maintenance/:service_id",
+    "/v1/agent/service/:service_id",
+    "/v1/agent/token/:token_type",
+    "/v1/catalog/connect/:service",
+    "/v1/catalog/gateway-services/:gateway",
+    "/v1/catalog/node/:node",
+    "/v1/catalog/service/:service",
+    "/v1/config/:kind/:name",
+    "/v1/config/:kind",
+    "/v1/coordinate/node/:node",
+    "/v1/discovery-chain/:service",
+    "/v1/event/fire/:name",
+    "/v1/health/checks/:service",
+    "/v1/health/connect/:service",
+    "/v1/health/ingress/:service",
+    "/v1/health/node/:node",
+    "/v1/health/service/:service",
+    "/v1/health/state/:state",
+    "/v1/query/:query_id/execute",
+    "/v1/query/:query_id/explain",
+    "/v1/query/:query_id",
+    "/v1/session/destroy/:session_id",
+    "/v1/session/info/:session_id",
+    "/v1/session/node/:node",
+    "/v1/session/renew/:session_id",
+)
+
+
+def _pattern(template: str) -> str:
+    return "".join(
+        ".+" if part == ":key" else "[^/]+" if part.startswith(":") else re.escape(part)
+        for part in re.split(r"(:\w+)", template)
+    )
+
+
+# a single alternation, the group matching tells the template
+_TEMPLATES_RE = re.compile("|".join(f"({_pattern(template)})" for template in TEMPLATES))
+
+
+def endpoint(path: str) -> str:
+    """Returns the template of the endpoint *path* belongs to, *path* itself if it has no parameter"""
+    match = _TEMPLATES_RE.fullmatch(path)
+    return TEMPLATES[match.lastindex - 1] if match and match.lastindex else path  # type: ignore[operator]
+
+
+class Request:
+    """
+    A request as seen by the hooks: its *method*, *path*, query *params*
+    and *endpoint* template, and whether it's a *blocking* query, whose
+    duration mostly depends on its *wait*.
+
+    Once it's done, *duration* is the time spent sending its *attempts*,
+    including the backoff between them, and decoding the response, in
+    seconds, and either *status* is the status code of the response and
+    *size* the size of its body (None if it's streamed), or *error* is the
+    exception raised.
+
+    *timings* splits the last attempt in phases, in seconds: 'connect' to
+    open a new connection (missing if an idle one was reused, or if the
+    transport doesn't tell), 'ttfb' from sending the attempt to receiving
+    the headers of its response, connection included, 'read' to read its
+    body and 'decode' to run the callback on it. A streamed body is read
+    while it's decoded, by the caller.
+
+    *start* is when it was sent, in seconds since the epoch.
+
+    The transports use it as a context manager around the whole request,
+    calling the *hooks*.
+    """
+
+    __slots__ = (
+        "_clock",
+        "attempts",
+        "blocking",
+        "duration",
+        "endpoint",
+        "error",
+        "hooks",
+        "method",
+        "params",
+        "path",
+        "size",
+        "start",
+        "status",
+        "timings",
+    )
+
+    def __init__(
+        self,
+        method: str,
+        path: str,
+        blocking: bool = False,
+        params: Sequence[tuple[str, Any]] | None = None,
+        hooks: Sequence[Hook] = (),
+    ) -> None:
+        self.method = method
+        self.path = path
+        self.params = params
+        self.endpoint = endpoint(path)
+        self.blocking = blocking
+        self.hooks = hooks
+        self.start = time.time()
+        self._clock = time.perf_counter()
+        self.attempts = 0
+        self.duration: float | None = None
+        self.status: int | None = None
+        self.error: Exception | None = None
+        self.size: int | None = None
+        self.timings: dict[str, float] = {}
+
+    def __repr__(self) -> str:
+        return (
+            f"Request(method={self.method!r}, endpoint={self.endpoint!r}, status={self.status!r}, "
+            f"error={self.error!r}, attempts={self.attempts!r}, duration={self.duration!r})"
+        )
+
+    def __enter__(self) -> Request:
+        _call(self.hooks, "before", self)
+        return self
+
+    def __exit__(
+        self, exc_type: type[BaseException] | None, exc: BaseException | None, traceback: TracebackType | None
+    ) -> None:
+        if isinstance(exc, Exception) and self.error is None:
+            # e.g. raised by the callback
+            self.error = exc
+        self.duration = time.perf_counter() - self._clock
+        _call(self.hooks, "after", self)
+
+    @property
+    def retries(self) -> int:
+        return max(0, self.attempts - 1)
+
+    def mark(self, phase: str, seconds: float) -> None:
+        """Records that the *phase* of the current attempt took *seconds*"""
+        self.timings[phase] = seconds
+
+    @contextlib.contextmanager
+    def timed(self, phase: str) -> Iterator[None]:
+        """Records the time spent in the block as *phase*"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[phase] = time.perf_counter() - start
+
+    def done(self, outcome: Response | Exception | None) -> None:
+        self.duration = time.perf_counter() - self._clock
+        if isinstance(outcome, Exception):
+            self.error = outcome
+        elif outcome is not None:
+            self.status = outcome.code
+            length = outcome.headers.get("Content-Length") if outcome.headers else None
+            if length is not None:
+                self.size = int(length)
+            elif isinstance(outcome.body, (bytes, str)):
+                self.size = len(outcome.body)
+
+
+class Untraced:
+    """Stands in for `Request` when the client has no hooks, recording nothing"""
+
+    __slots__ = ()
+
+    hooks: Sequence[Hook] = ()
+
+    def __enter__(self) -> Untraced:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        pass
+
+    def mark(self, phase: str, seconds: float) -> None:
+        pass
+
+    def timed(self, phase: str) -> contextlib.nullcontext[None]:  # pylint: disable=unused-argument
+        return _NULL_CONTEXT
+
+
+_NULL_CONTEXT: contextlib.nullcontext[None] = contextlib.nullcontext()
+
+#: the request of the clients without hooks
+UNTRACED = Untraced()
+
+
+class Hook:
+    """
+    Base of the instrumentation hooks, passed to the clients with *hooks*.
+
+    They are called by the thread, or on the event loop, sending the
+    request and must be quick. An exception raised by a hook is logged and
+    doesn't fail the request.
+    """
+
+    def before(self, request: Request) -> None:
+        """Called before the first attempt of *request*"""
+
+    def after(self, request: Request) -> None:
+        """Called once *request* is done"""
+
+
+def instrumented(
+    request: Request, attempts: Generator[tuple[float, str], Response | Exception, None]
+) -> Generator[tuple[float, str], Response | Exception, None]:
+    """Forwards the *attempts* of *request*, recording their outcome"""
+    outcome = None
+    try:
+        planned = next(attempts)
+        while True:
+            outcome = yield planned
+            request.attempts += 1
+            planned = attempts.send(outcome)
+    except StopIteration:
+        pass
+    finally:
+        request.done(outcome)
+
+
+def _call(hooks: Sequence[Hook], name: str, request: Request) -> None:
+    for hook in hooks:
+        try:
+            getattr(hook, name)(request)
+        except Exception:  # pylint: disable=broad-exception-caught
+            log.exception("instrumentation hook %r failed", hook)
+
+
+class _Series:
+    __slots__ = ("counts", "errors", "max", "retries", "sum")
+
+    def __init__(self, buckets: int) -> None:
+        self.counts = [0] * (buckets + 1)
+        self.sum = 0.0
+        self.max = 0.0
+        self.errors = 0
+        self.retries = 0
+
+    @property
+    def count(self) -> int:
+        return sum(self.counts)
+
+
+class LatencyHistogram(Hook):
+    """
+    Dependency-free collector of the latency of the requests, per method,
+    endpoint template and whether they are blocking queries, in fixed
+    *buckets* (upper bounds in seconds).
+
+    Requests answered with a 5xx or failing to connect are counted in
+    *errors* too.
+    """
+
+    BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    def __init__(self, buckets: Iterable[float] = BUCKETS) -> None:
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        self._series: dict[tuple[str, str, bool], _Series] = {}
+
+    def after(self, request: Request) -> None:
+        duration = request.duration or 0.0
+        key = (request.method, request.endpoint, request.blocking)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = _Series(len(self.buckets))
+            series.counts[bisect.bisect_left(self.buckets, duration)] += 1
+            series.sum += duration
+            series.max = max(series.max, duration)
+            series.retries += request.retries
+            if request.error is not None or (request.status or 0) >= 500:
+                series.errors += 1
+
+    def snapshot(self) -> dict[tuple[str, str, bool], dict[str, Any]]:
+        """
+        Returns the series recorded so far, keyed by (method, endpoint,
+        blocking): the *count*, *sum* and *max* of their durations, the
+        number of requests per bucket in *buckets* (the last one counting
+        the requests slower than the largest bucket), of *errors* and of
+        *retries*.
+        """
+        with self._lock:
+            return {
+                key: {
+                    "count": series.count,
+                    "sum": series.sum,
+                    "max": series.max,
+                    "buckets": list(series.counts),
+                    "errors": series.errors,
+                    "retries": series.retries,
+                }
+                for key, series in self._series.items()
+            }
+
+    def percentile(self, method: str, endpoint: str, q: float, blocking: bool = False) -> float | None:
+        """
+        Returns an upper bound of the *q* quantile (e.g. 0.99) of the
+        latency of the requests to *endpoint*, the bound of the bucket
+        holding it, or None if none was recorded.
+        """
+        with self._lock:
+            series = self._series.get((method, endpoint, blocking))
+            if series is None or not series.count:
+                return None
+            rank = q * series.count
+            seen = 0
+            for bound, count in zip((*self.buckets, series.max), series.counts):
+                seen += count
+                if count and seen >= rank:
+                    return min(bound, series.max)
+            return series.max
+
+    def reset(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+
+class SlowRequestLog(Hook):
+    """
+    Diagnostics logging of the requests slower than *latency* seconds or
+    whose response body is larger than *size* bytes (either check being
+    disabled if None), at WARNING level on *logger* (``consul.slow`` if
+    None). Blocking queries are only checked against *size*, they are
+    slow by design.
+
+    Each entry tells the endpoint template, the query parameters (the
+    token redacted), the status, size, attempts and timings of the
+    request, also passed as the ``consul_request`` attribute of the log
+    record for structured handlers.
+
+    Only a *sample* fraction of the matching requests is logged, spread
+    randomly, the others cost a couple of comparisons.
+    """
+
+    #: query parameters whose value is never logged
+    REDACTED = frozenset({"token"})
+
+    def __init__(
+        self,
+        latency: float | None = 1.0,
+        size: int | None = 1024 * 1024,
+        sample: float = 1.0,
+        logger: logging.Logger | None = None,
+    ) -> None:
+        self.latency = latency
+        self.size = size
+        self.sample = sample
+        self.logger = logger or logging.getLogger("consul.slow")
+
+    def after(self, request: Request) -> None:
+        slow = self.latency is not None and not request.blocking and (request.duration or 0.0) >= self.latency
+        large = self.size is not None and (request.size or 0) >= self.size
+        if not (slow or large) or (self.sample < 1.0 and random.random() >= self.sample):
+            return
+        entry: dict[str, Any] = {
+            "method": request.method,
+            "endpoint": request.endpoint,
+            "params": [(key, "<redacted>" if key in self.REDACTED else value) for key, value in request.params or ()],
+            "status": request.status,
+            "error": request.error,
+            "size": request.size,
+            "attempts": request.attempts,
+            "duration": request.duration,
+            **{phase: request.timings.get(phase) for phase in ("connect", "ttfb", "read", "decode")},
+        }
+        self.logger.warning(
+            "%s consul request %s %s params=%s status=%s size=%s attempts=%d "
+            "duration=%s connect=%s ttfb=%s read=%s decode=%s",
+            "slow" if slow else "large",
+            request.method,
+            request.endpoint,
+            entry["params"],
+            request.error if request.error is not None else request.status,
+            request.size,
+            request.attempts,
+            *(_ms(entry[phase]) for phase in ("duration", "connect", "ttfb", "read", "decode")),
+            extra={"consul_request": entry},
+        )
+
+
+def _ms(seconds: float | None) -> str:
+    return "-" if seconds is None else f"{seconds * 1000:.1f}ms"
+
+
+class PrometheusHook(Hook):
+    """
+    Exports the requests as Prometheus metrics, in *registry* (the default
+    one if None). Requires ``prometheus_client``.
+
+    - ``<namespace>_request_duration_seconds``: histogram of the latency
+      per method, endpoint template and whether it's a blocking query;
+    - ``<namespace>_requests_total``: counter per method, endpoint
+      template and status code, 'error' for the connection errors;
+    - ``<namespace>_retries_total``: counter per method and endpoint
+      template;
+    - ``<namespace>_response_size_bytes``: summary of the size of the
+      response bodies per method and endpoint template.
+    """
+
+    def __init__(self, registry=None, namespace: str = "consul_client") -> None:
+        import prometheus_client  # noqa: PLC0415 pylint: disable=import-outside-toplevel
+
+        kwargs: dict[str, Any] = {"namespace": namespace}
+        if registry is not None:
+            kwargs["registry"] = registry
+        self.duration = prometheus_client.Histogram(
+            "request_duration_seconds",
+            "Latency of the requests sent to Consul",
+            ("method", "endpoint", "blocking"),
+            **kwargs,
+        )
+        self.requests = prometheus_client.Counter(
+            "requests", "Requests sent to Consul", ("method", "endpoint", "status"), **kwargs
+        )
+        self.retries = prometheus_client.Counter(
+            "retries", "Retries of the requests sent to Consul", ("method", "endpoint"), **kwargs
+        )
+        self.size = prometheus_client.Summary(
+            "response_size_bytes", "Size of the responses of Consul", ("method", "endpoint"), **kwargs
+        )
+
+    def after(self, request: Request) -> None:
+        self.duration.labels(request.method, request.endpoint, str(request.blocking).lower()).observe(
+            request.duration or 0.0
+        )
+        status = "error" if request.error is not None else str(request.status)
+        self.requests.labels(request.method, request.endpoint, status).inc()
+        if request.retries:
+            self.retries.labels(request.method, request.endpoint).inc(request.retries)
+        if request.size is not None:
+            self.size.labels(request.method, request.endpoint).observe(request.size)
+
+
+class OpenTelemetryHook(Hook):
+    """
+    Records the requests with OpenTelemetry, through *meter_provider* and
+    *tracer_provider* (the global ones if None). Requires
+    ``opentelemetry-api``.
+
+    The latency is recorded in the ``http.client.request.duration``
+    histogram, with the attributes of the HTTP semantic conventions (the
+    endpoint template being the ``url.template``). With *traces*, a client
+    span is recorded for each request too, once it's done: it isn't the
+    current span while the request is sent.
+    """
+
+    def __init__(self, meter_provider=None, tracer_provider=None, traces: bool = True) -> None:
+        from opentelemetry import metrics, trace  # noqa: PLC0415 pylint: disable=import-outside-toplevel
+
+        self._trace = trace
+        meter = metrics.get_meter(__name__, meter_provider=meter_provider)
+        self.duration = meter.create_histogram(
+            "http.client.request.duration", unit="s", description="Latency of the requests sent to Consul"
+        )
+        self.tracer = trace.get_tracer(__name__, tracer_provider=tracer_provider) if traces else None
+
+    def after(self, request: Request) -> None:
+        attributes: dict[str, Any] = {
+            "http.request.method": request.method,
+            "url.template": request.endpoint,
+            "consul.blocking": request.blocking,
+        }
+        if request.status is not None:
+            attributes["http.response.status_code"] = request.status
+        if request.error is not None:
+            attributes["error.type"] = type(request.error).__qualname__
+        elif (request.status or 0) >= 500:
+            attributes["error.type"] = str(request.status)
+        if request.retries:
+            attributes["http.request.resend_count"] = request.retries
+        self.duration.record(request.duration or 0.0, attributes)
+        if self.tracer is not None:
+            start = int(request.start * 1e9)
+            span = self.tracer.start_span(
+                f"{request.method} {request.endpoint}",
+                kind=self._trace.SpanKind.CLIENT,
+                attributes=attributes,
+                start_time=start,
+            )
+            if "error.type" in attributes:
+                span.set_status(self._trace.StatusCode.ERROR)
+            span.end(end_time=start + int((request.duration or 0.0) * 1e9))
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+
+class QueryMeta:
+    """
+    Metadata of a read, returned along with its data by the endpoints
+    called with *meta* or *cached* (e.g. ``meta, nodes =
+    c.health.service("web", meta=True)``).
+
+    Values are parsed from the response headers when accessed, so building
+    one costs nothing for callers only interested in the data.
+    """
+
+    __slots__ = ("headers",)
+
+    def __init__(self, headers: Mapping[str, str]) -> None:
+        self.headers = headers
+
+    def __repr__(self) -> str:
+        return (
+            f"QueryMeta(index={self.index!r}, known_leader={self.known_leader!r}, "
+            f"last_contact={self.last_contact!r}, effective_consistency={self.effective_consistency!r}, "
+            f"cache_hit={self.cache_hit!r}, age={self.age!r})"
+        )
+
+    @property
+    def index(self) -> str | None:
+        """The X-Consul-Index of the data, to be passed to a blocking query"""
+        return self.headers.get("X-Consul-Index")
+
+    @property
+    def content_hash(self) -> str | None:
+        """
+        The X-Consul-ContentHash of the data, to be passed to a hash-based
+        blocking query of the agent-local endpoints
+        """
+        return self.headers.get("X-Consul-ContentHash")
+
+    @property
+    def known_leader(self) -> bool | None:
+        """
+        Whether the server answering knew of a leader. A stale read from a
+        server without a leader may be arbitrarily out of date.
+        """
+        value = self.headers.get("X-Consul-KnownLeader")
+        if value is None:
+            return None
+        return value.lower() == "true"
+
+    @property
+    def last_contact(self) -> float | None:
+        """
+        Seconds since the server answering last heard from the leader, 0
+        when the leader itself answered. Only meaningful for stale reads.
+        """
+        value = self.headers.get("X-Consul-LastContact")
+        return int(value) / 1000 if value is not None else None
+
+    @property
+    def effective_consistency(self) -> str | None:
+        """
+        The consistency mode the read was actually served with ('leader',
+        'consistent' or 'stale'), which may differ from the one requested.
+        """
+        return self.headers.get("X-Consul-Effective-Consistency")
+
+    @property
+    def cache_hit(self) -> bool | None:
+        """
+        Whether the agent answered from its cache (X-Cache: HIT) or had to
+        fetch the data from the servers (MISS). None if the read didn't go
+        through the agent cache.
+        """
+        value = self.headers.get("X-Cache")
+        if value is None:
+            return None
+        return value.upper() == "HIT"
+
+    @property
+    def age(self) -> int | None:
+        """How many seconds ago the agent cache fetched the data, if cached"""
+        value = self.headers.get("Age")
+        return int(value) if value is not None else None
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    import concurrent.futures
+    from collections.abc import Callable
+
+    from consul.base import Response
+
+
+class Offloader:
+    """
+    Decodes the responses of an asyncio transport, running the callbacks of
+    the bodies larger than *threshold* bytes in *executor* (the default
+    executor of the loop if None) so that decoding them doesn't block the
+    event loop. The small ones are decoded inline, a thread hop would cost
+    more than their decoding.
+
+    The decoding thread holds the GIL while it runs, but it's handed over
+    to the loop every `sys.getswitchinterval` instead of once the whole
+    body is decoded.
+
+    *blocked* is the time spent decoding on the loop, in seconds, and
+    *offloaded* the number of responses decoded in the executor.
+    """
+
+    #: default *threshold*, decoding this much JSON takes a few milliseconds
+    THRESHOLD = 256 * 1024
+
+    def __init__(self, threshold: int | None = THRESHOLD, executor: concurrent.futures.Executor | None = None) -> None:
+        self.threshold = threshold
+        self.executor = executor
+        self.blocked = 0.0
+        self.offloaded = 0
+
+    async def decode(self, callback: Callable[[Response], Any], response: Response, raw: bool = False) -> Any:
+        """
+        Returns the result of *callback* on *response*, whose body is still
+        encoded unless it's streamed. With *raw*, the body is passed as
+        bytes rather than text.
+        """
+        if isinstance(response.body, bytes) and self.threshold is not None and len(response.body) > self.threshold:
+            self.offloaded += 1
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, self._decode, callback, response, raw)
+        start = time.perf_counter()
+        try:
+            return self._decode(callback, response, raw)
+        finally:
+            self.blocked += time.perf_counter() - start
+
+    @staticmethod
+    def _decode(callback: Callable[[Response], Any], response: Response, raw: bool) -> Any:
+        if not raw and isinstance(response.body, bytes):
+            response = response._replace(body=response.body.decode("utf-8"))
+        return callback(response)
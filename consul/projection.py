@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+
+class Projection:
+    """
+    The subset of the fields of the decoded objects to keep, e.g.::
+
+        index, nodes = c.health.service(
+            "web", fields={"Node.Address", "Service.Port", "Service.Tags", "Checks.Status"}
+        )
+
+    Fields are dotted paths. The lists met along a path are projected item
+    by item (``Checks.Status`` keeps the Status of each check, which may
+    also be spelled ``Checks[].Status``). Naming a field keeps it whole,
+    e.g. ``Service.Tags`` keeps all the tags.
+
+    The other fields are dropped once the objects are decoded, so only the
+    projected data is retained. Without *stream* the whole response is
+    still decoded first, the projection is a convenience. Combined with
+    *stream*, the whole objects don't even coexist in memory, each is
+    decoded then projected in turn.
+    """
+
+    __slots__ = ("_tree", "fields")
+
+    def __init__(self, fields: Iterable[str]) -> None:
+        self.fields = frozenset(fields)
+        # field name -> sub-tree, or None to keep the field whole
+        self._tree: dict[str, Any] = {}
+        for field in self.fields:
+            node = self._tree
+            *parents, name = field.replace("[]", "").split(".")
+            for parent in parents:
+                node = node.setdefault(parent, {})
+                if node is None:
+                    # a parent is already kept whole
+                    break
+            else:
+                node[name] = None
+
+    def __repr__(self) -> str:
+        return f"Projection({sorted(self.fields)!r})"
+
+    def __call__(self, data: Any) -> Any:
+        return self._project(data, self._tree)
+
+    @classmethod
+    def _project(cls, value: Any, tree: dict[str, Any]) -> Any:
+        if isinstance(value, list):
+            return [cls._project(item, tree) for item in value]
+        if not isinstance(value, dict):
+            return value
+        return {
+            name: value[name] if sub is None else cls._project(value[name], sub)
+            for name, sub in tree.items()
+            if name in value
+        }
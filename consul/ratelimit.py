@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from consul.base import Response
+
+
+class TokenBucket:
+    """
+    Token bucket admitting *rate* requests per second with bursts of up to
+    *burst* requests, whose rate adapts to the server's feedback (AIMD):
+
+    - every throttled response (429 or 503) multiplies the rate by
+      *decrease*, at most once per *cooldown* seconds so that a burst of
+      concurrent rejections only counts once, down to *min_rate*;
+    - every successful response adds back a share of *increase* such that
+      the rate grows by about *increase* requests per second every second,
+      up to the configured *rate*.
+
+    The bursts shrink along with the rate, and grow back to *burst* as it
+    recovers.
+
+    The bucket is thread-safe, it can be shared by several clients.
+    """
+
+    THROTTLED = frozenset({429, 503})
+
+    def __init__(
+        self,
+        rate: float,
+        burst: float | None = None,
+        min_rate: float = 1.0,
+        increase: float = 1.0,
+        decrease: float = 0.5,
+        cooldown: float = 1.0,
+    ) -> None:
+        assert rate > 0, "rate must be positive"
+        assert 0 < decrease < 1, "decrease must be between 0 and 1"
+        self.max_rate = rate
+        self.rate = rate
+        self.max_burst = burst or rate
+        self.burst = self.max_burst
+        self.min_rate = min(min_rate, rate)
+        self.increase = increase
+        self.decrease = decrease
+        self.cooldown = cooldown
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+        self.decreased = float("-inf")
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """
+        Takes a token and returns how many seconds the caller has to wait
+        before sending its request. Tokens are reserved ahead, so concurrent
+        callers are spread over time instead of all waking up together.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+    def feedback(self, outcome: Response | Exception) -> None:
+        """Adapts the rate to the *outcome* of a request admitted by the bucket"""
+        if isinstance(outcome, Exception):
+            return
+        with self._lock:
+            if outcome.code in self.THROTTLED:
+                now = time.monotonic()
+                if now - self.decreased >= self.cooldown:
+                    self.decreased = now
+                    self.rate = max(self.min_rate, self.rate * self.decrease)
+                    self.burst = max(1.0, min(self.max_burst, self.rate))
+                    self.tokens = min(self.tokens, self.burst)
+            elif outcome.code < 400 and self.rate < self.max_rate:
+                self.rate = min(self.max_rate, self.rate + self.increase / self.rate)
+                self.burst = max(1.0, min(self.max_burst, self.rate))
+
+
+class RateLimiter:
+    """
+    Client-side rate limiting of a transport, e.g.::
+
+        c = consul.Consul(rate_limit=RateLimiter(read=500, write=50, blocking=100))
+
+    Requests are split in three classes, each with its own `TokenBucket`:
+    *read* (plain GETs), *blocking* (GETs carrying an *index* or a *hash*, i.e. blocking
+    queries) and *write* (any other method). A class is given either a
+    number of requests per second or a configured `TokenBucket`; classes
+    left to None are not limited.
+    """
+
+    def __init__(
+        self,
+        read: float | TokenBucket | None = None,
+        write: float | TokenBucket | None = None,
+        blocking: float | TokenBucket | None = None,
+    ) -> None:
+        self.read = self._bucket(read)
+        self.write = self._bucket(write)
+        self.blocking = self._bucket(blocking)
+
+    @staticmethod
+    def _bucket(value: float | TokenBucket | None) -> TokenBucket | None:
+        if value is None or isinstance(value, TokenBucket):
+            return value
+        return TokenBucket(value)
+
+    def bucket(self, method: str, params: list[tuple[str, Any]] | None = None) -> TokenBucket | None:
+        """Returns the bucket admitting a *method* request with *params*"""
+        if method != "GET":
+            return self.write
+        if params and any(key in ("index", "hash") for key, _ in params):
+            return self.blocking
+        return self.read
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import random
+import time
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+    from typing import Any
+
+    from consul.base import Response
+
+
+class Retry:
+    """
+    Retry policy of an HTTP transport, e.g.::
+
+        c = consul.Consul(retry=consul.Retry(attempts=5, deadline=10))
+
+    Only requests whose method is in *methods* are retried. By default these
+    are the idempotent reads (GET); writes known to be idempotent for a
+    given deployment (e.g. KV sets without *cas*, service registrations) can
+    be opted in by adding their method, e.g. ``methods={"GET", "PUT"}``.
+    The writes which are never idempotent are still not retried: the
+    check-and-set and lock operations (*cas*, *acquire* and *release*),
+    session creations, event fires and transactions -- e.g. a CAS applied
+    by the server whose response got lost would fail when retried. An
+    *idempotent* predicate, called with the method, path and params of the
+    writes in *methods*, replaces this rule to mark them explicitly.
+
+    A request is retried when the connection to the agent fails or when the
+    response status is in *statuses* (by default the 5xx answered during
+    leader elections and 429 from rate limiting), at most *attempts* times
+    in total.
+
+    Between two attempts the transport sleeps a random duration between 0
+    and ``backoff * 2 ** retry`` seconds, capped at *backoff_max* ("full
+    jitter"), so that clients failing together don't retry in lockstep. A
+    ``Retry-After`` header sent by the server takes precedence over the
+    computed backoff.
+
+    No attempt is started once *deadline* seconds have elapsed since the
+    first one, the last error is then returned to the caller. Note that the
+    deadline includes the time spent waiting on blocking queries.
+    """
+
+    DEFAULT_METHODS = frozenset({"GET"})
+    DEFAULT_STATUSES = frozenset({429, 500, 502, 503, 504})
+    NON_IDEMPOTENT_PARAMS = frozenset({"cas", "acquire", "release"})
+    NON_IDEMPOTENT_PATHS = ("/v1/session/create", "/v1/event/fire/", "/v1/txn")
+
+    def __init__(
+        self,
+        attempts: int = 3,
+        backoff: float = 0.1,
+        backoff_max: float = 10.0,
+        deadline: float = 30.0,
+        methods: Iterable[str] = DEFAULT_METHODS,
+        statuses: Iterable[int] = DEFAULT_STATUSES,
+        idempotent: Callable[[str, str, list[tuple[str, Any]] | None], bool] | None = None,
+    ) -> None:
+        assert attempts >= 1, "attempts must be at least 1"
+        self.attempts = attempts
+        self.backoff = backoff
+        self.backoff_max = backoff_max
+        self.deadline = deadline
+        self.methods = frozenset(method.upper() for method in methods)
+        self.statuses = frozenset(statuses)
+        self.idempotent = idempotent
+
+    def allows(self, method: str, path: str = "", params: list[tuple[str, Any]] | None = None) -> bool:
+        """Whether a *method* request to *path* with *params* may be retried"""
+        if method not in self.methods:
+            return False
+        if method == "GET":
+            return True
+        if self.idempotent is not None:
+            return self.idempotent(method, path, params)
+        if path.startswith(self.NON_IDEMPOTENT_PATHS):
+            return False
+        return not any(key in self.NON_IDEMPOTENT_PARAMS for key, _ in params or ())
+
+    def delay(self, retry: int, outcome: Response | Exception) -> float | None:
+        """
+        Returns how long to wait before the *retry*-th retry (starting at 0)
+        of a request whose last attempt ended with *outcome*, or None if
+        *outcome* is final.
+        """
+        if not isinstance(outcome, Exception):
+            if outcome.code not in self.statuses:
+                return None
+            retry_after = self.retry_after(outcome)
+            if retry_after is not None:
+                return retry_after
+        return random.uniform(0, min(self.backoff_max, self.backoff * 2**retry))
+
+    @staticmethod
+    def retry_after(response: Response) -> float | None:
+        """Parses the Retry-After header, either delay-seconds or an HTTP-date"""
+        value = response.headers.get("Retry-After") if response.headers else None
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        import email.utils  # noqa: PLC0415 pylint: disable=import-outside-toplevel
+
+        try:
+            date = email.utils.parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        return max(0.0, date.timestamp() - time.time())
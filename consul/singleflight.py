@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import asyncio
+import collections
+import concurrent.futures
+import threading
+import time
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable, Hashable
+
+
+class _Results:
+    """Results kept by the flights for their time to live"""
+
+    #: number of cached results above which the expired ones, then the least
+    #: recently used ones, are dropped
+    MAX_RESULTS = 1024
+
+    def __init__(self) -> None:
+        self._results: collections.OrderedDict[Hashable, tuple[float, Any]] = collections.OrderedDict()
+        self._results_lock = threading.Lock()
+
+    def _lookup(self, key: Hashable) -> tuple[bool, Any]:
+        with self._results_lock:
+            entry = self._results.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                return False, None
+            self._results.move_to_end(key)
+            return True, entry[1]
+
+    def _remember(self, key: Hashable, ttl: float, result: Any) -> None:
+        now = time.monotonic()
+        with self._results_lock:
+            if len(self._results) >= self.MAX_RESULTS:
+                for expired in [k for k, (expires, _) in self._results.items() if expires <= now]:
+                    del self._results[expired]
+            while len(self._results) >= self.MAX_RESULTS:
+                self._results.popitem(last=False)
+            self._results[key] = (now + ttl, result)
+            self._results.move_to_end(key)
+
+
+class SingleFlight(_Results):
+    """
+    Collapses concurrent calls sharing the same key into a single call:
+    while a call is in flight, callers with the same key wait for it and get
+    its result (or exception) instead of issuing their own.
+
+    *collapsed* counts the calls that were served by another one in flight.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.collapsed = 0
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, concurrent.futures.Future] = {}
+
+    def do(self, key: Hashable, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        future: concurrent.futures.Future = concurrent.futures.Future()
+        with self._lock:
+            flight = self._calls.setdefault(key, future)
+            if flight is not future:
+                self.collapsed += 1
+        if flight is not future:
+            return flight.result()
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as e:
+            self._forget(key)
+            future.set_exception(e)
+            raise
+        self._forget(key)
+        future.set_result(result)
+        return result
+
+    def _forget(self, key: Hashable) -> None:
+        # later callers start a new call instead of getting a stale result
+        with self._lock:
+            del self._calls[key]
+
+    def cached(self, key: Hashable, ttl: float, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Like `do`, and the result is also reused for *ttl* seconds"""
+        hit, result = self._lookup(key)
+        if hit:
+            return result
+        result = self.do(key, fn, *args, **kwargs)
+        self._remember(key, ttl, result)
+        return result
+
+
+class AsyncSingleFlight(_Results):
+    """
+    Asyncio flavour of `SingleFlight`. The shared call runs in its own task,
+    so a caller being cancelled doesn't cancel it for the other callers.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.collapsed = 0
+        self._calls: dict[Hashable, asyncio.Future] = {}
+
+    async def do(self, key: Hashable, fn: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+        task = self._calls.get(key)
+        if task is not None:
+            self.collapsed += 1
+        else:
+            task = self._calls[key] = asyncio.ensure_future(fn(*args, **kwargs))
+            task.add_done_callback(lambda t: self._done(key, t))
+        return await asyncio.shield(task)
+
+    def _done(self, key: Hashable, task: asyncio.Future) -> None:
+        del self._calls[key]
+        if not task.cancelled():
+            # the exception is delivered to the waiting callers, if any are left
+            task.exception()
+
+    async def cached(self, key: Hashable, ttl: float, fn: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+        hit, result = self._lookup(key)
+        if hit:
+            return result
+        result = await self.do(key, fn, *args, **kwargs)
+        self._remember(key, ttl, result)
+        return result
@@ -1,19 +1,153 @@
 from __future__ import annotations
 
+import os
+import socket
+import time
+from typing import TYPE_CHECKING, Any
+
 import requests
 from requests import Response
+from requests.adapters import DEFAULT_CA_BUNDLE_PATH, DEFAULT_POOLSIZE, HTTPAdapter
+from urllib3.connection import HTTPConnection
+from urllib3.connectionpool import HTTPConnectionPool
+
+from consul import base, fanout, tls
+from consul.stream import CHUNK_SIZE
 
-from consul import base
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
 
 __all__ = ["Consul"]
 
 
+class UnixHTTPConnection(HTTPConnection):
+    """HTTP connection dialing a unix domain socket instead of a TCP address"""
+
+    def __init__(self, *args, socket_path: str, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.socket_path = socket_path
+
+    def _new_conn(self) -> socket.socket:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        # urllib3 uses a sentinel object for "no explicit timeout"
+        if isinstance(self.timeout, (int, float)):
+            sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.socket_path)
+        except OSError:
+            sock.close()
+            raise
+        return sock
+
+
+class UnixHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = UnixHTTPConnection
+
+
+class UnixAdapter(HTTPAdapter):
+    """
+    Transport adapter sending every request of the session through the unix
+    socket at *socket_path*, bypassing proxies and TCP entirely.
+    """
+
+    def __init__(self, socket_path: str, **kwargs) -> None:
+        self.socket_path = socket_path
+        self.pool = UnixHTTPConnectionPool("localhost", maxsize=DEFAULT_POOLSIZE, socket_path=socket_path)
+        super().__init__(**kwargs)
+
+    def get_connection_with_tls_context(self, request, verify, proxies=None, cert=None):  # pylint: disable=unused-argument
+        return self.pool
+
+    def get_connection(self, url, proxies=None):  # pylint: disable=unused-argument
+        return self.pool
+
+    def request_url(self, request, proxies) -> str:  # pylint: disable=unused-argument
+        return request.path_url
+
+    def close(self) -> None:
+        super().close()
+        self.pool.close()
+
+
+class KeepAliveAdapter(HTTPAdapter):
+    """
+    Transport adapter enabling TCP keepalive probes on its connections, so
+    that a connection to a dead agent is noticed within about a minute even
+    while a blocking query legitimately waits for minutes on it.
+    """
+
+    socket_options = HTTPConnection.default_socket_options + [
+        (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+        *[
+            (socket.IPPROTO_TCP, getattr(socket, name), value)
+            for name, value in (("TCP_KEEPIDLE", 30), ("TCP_KEEPINTVL", 10), ("TCP_KEEPCNT", 3))
+            if hasattr(socket, name)
+        ],
+    ]
+
+    def init_poolmanager(self, *args, **kwargs) -> None:
+        kwargs.setdefault("socket_options", self.socket_options)
+        super().init_poolmanager(*args, **kwargs)
+
+
+class TLSAdapter(KeepAliveAdapter):
+    """
+    Keepalive adapter whose connections all use *ssl_context*, which holds
+    the CA and client certificates already: requests would otherwise have
+    urllib3 load them again on every new connection, in a context resuming
+    no TLS session.
+    """
+
+    def __init__(self, ssl_context, **kwargs) -> None:
+        self.ssl_context = ssl_context
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs) -> None:
+        kwargs.setdefault("ssl_context", self.ssl_context)
+        super().init_poolmanager(*args, **kwargs)
+
+    def proxy_manager_for(self, proxy, **proxy_kwargs):
+        # the connections tunnelled through a proxy (HTTPS_PROXY) too
+        proxy_kwargs.setdefault("ssl_context", self.ssl_context)
+        return super().proxy_manager_for(proxy, **proxy_kwargs)
+
+    def build_connection_pool_key_attributes(self, request, verify, cert=None):
+        return super().build_connection_pool_key_attributes(request, bool(verify))
+
+    def cert_verify(self, conn, url, verify, cert) -> None:  # noqa: ARG002 pylint: disable=unused-argument
+        conn.cert_reqs = "CERT_REQUIRED" if verify else "CERT_NONE"
+
+
 class HTTPClient(base.HTTPClient):
-    def __init__(self, *args, **kwargs) -> None:
+    def __init__(self, *args, connections_timeout=None, **kwargs) -> None:
+        """
+        *connections_timeout* is the default timeout of a request, in
+        seconds, either a single value or a (connect, read) tuple as
+        accepted by `requests`, `DEFAULT_TIMEOUT` by default. The read
+        timeout of blocking queries is raised to cover their *wait* so they
+        are never cut short.
+        """
         super().__init__(*args, **kwargs)
+        self.connections_timeout = connections_timeout
         self.session = requests.session()
+        if self.socket_path:
+            self.session.mount(self.base_uri, UnixAdapter(self.socket_path))
+        else:
+            self.session.mount("http://", KeepAliveAdapter())
+            if self.verify and self.scheme == "https":
+                self.session.mount("https://", TLSAdapter(tls.client_context(self._ca_bundle(), self.cert)))
+            else:
+                self.session.mount("https://", KeepAliveAdapter())
 
-    def response(self, response: Response, raw: bool = False):
+    def _ca_bundle(self) -> str:
+        """The CA bundle requests verifies the agent certificate against"""
+        if isinstance(self.verify, str):
+            return self.verify
+        return os.environ.get("REQUESTS_CA_BUNDLE") or os.environ.get("CURL_CA_BUNDLE") or DEFAULT_CA_BUNDLE_PATH
+
+    def response(self, response: Response, raw: bool = False, stream: bool = False):
+        if stream and response.status_code < 300:
+            return base.Response(response.status_code, response.headers, self._chunks(response))
         if raw:
             # e.g. the gzip archive returned by GET /v1/snapshot -- decoding it as
             # UTF-8 text would corrupt it, so the raw bytes are kept as-is.
@@ -21,28 +155,124 @@ class HTTPClient(base.HTTPClient):
         response.encoding = "utf-8"
         return base.Response(response.status_code, response.headers, response.text)
 
-    def get(self, callback, path, params=None, headers: dict[str, str] | None = None, raw: bool = False):
-        uri = self.uri(path, params)
-        return callback(
-            self.response(self.session.get(uri, headers=headers, verify=self.verify, cert=self.cert), raw=raw)
+    @staticmethod
+    def _chunks(response: Response):
+        try:
+            yield from response.iter_content(CHUNK_SIZE)
+        finally:
+            response.close()
+
+    def _request(
+        self,
+        callback,
+        method,
+        path,
+        params=None,
+        headers=None,
+        data=None,
+        connections_timeout=None,
+        raw: bool = False,
+        max_stale=None,
+        stream: bool = False,
+    ):
+        timeout = self.timeout(params, connections_timeout or self.connections_timeout)
+        with self._instrument(method, path, params) as request:
+            attempts = self._attempts(method, path, params, max_stale, request)
+            delay, uri = next(attempts)
+            while True:
+                if delay:
+                    time.sleep(delay)
+                try:
+                    start = time.perf_counter()
+                    resp = self.session.request(
+                        method,
+                        uri,
+                        headers=headers,
+                        data=data,
+                        verify=self.verify,
+                        cert=self.cert,
+                        timeout=timeout,
+                        stream=stream,
+                    )
+                    outcome = self.response(resp, raw=raw, stream=stream)
+                    # requests doesn't tell when the connection was opened
+                    ttfb = resp.elapsed.total_seconds()
+                    request.mark("ttfb", ttfb)
+                    request.mark("read", time.perf_counter() - start - ttfb)
+                except (requests.ConnectionError, requests.Timeout) as e:
+                    outcome = e
+                try:
+                    delay, uri = attempts.send(outcome)
+                except StopIteration:
+                    break
+                if stream and not isinstance(outcome, Exception):
+                    resp.close()
+            if isinstance(outcome, Exception):
+                raise outcome
+            with request.timed("decode"):
+                return callback(outcome)
+
+    def get(
+        self,
+        callback,
+        path,
+        params=None,
+        headers: dict[str, str] | None = None,
+        raw: bool = False,
+        connections_timeout=None,
+        max_stale=None,
+        reuse_for=None,
+        stream: bool = False,
+    ):
+        return self._get(
+            callback,
+            path,
+            params,
+            headers,
+            reuse_for,
+            raw=raw,
+            connections_timeout=connections_timeout,
+            max_stale=max_stale,
+            stream=stream,
         )
 
-    def put(self, callback, path, params=None, data: str | bytes = "", headers: dict[str, str] | None = None):
-        uri = self.uri(path, params)
-        return callback(
-            self.response(self.session.put(uri, headers=headers, data=data, verify=self.verify, cert=self.cert))
+    def put(
+        self,
+        callback,
+        path,
+        params=None,
+        data: str | bytes = "",
+        headers: dict[str, str] | None = None,
+        connections_timeout=None,
+    ):
+        return self._request(
+            callback, "PUT", path, params, headers=headers, data=data, connections_timeout=connections_timeout
         )
 
-    def delete(self, callback, path, params=None, data: str | bytes = "", headers: dict[str, str] | None = None):
-        uri = self.uri(path, params)
-        return callback(
-            self.response(self.session.delete(uri, headers=headers, data=data, verify=self.verify, cert=self.cert))
+    def delete(
+        self,
+        callback,
+        path,
+        params=None,
+        data: str | bytes = "",
+        headers: dict[str, str] | None = None,
+        connections_timeout=None,
+    ):
+        return self._request(
+            callback, "DELETE", path, params, headers=headers, data=data, connections_timeout=connections_timeout
         )
 
-    def post(self, callback, path, params=None, data: str = "", headers: dict[str, str] | None = None):
-        uri = self.uri(path, params)
-        return callback(
-            self.response(self.session.post(uri, headers=headers, data=data, verify=self.verify, cert=self.cert))
+    def post(
+        self,
+        callback,
+        path,
+        params=None,
+        data: str = "",
+        headers: dict[str, str] | None = None,
+        connections_timeout=None,
+    ):
+        return self._request(
+            callback, "POST", path, params, headers=headers, data=data, connections_timeout=connections_timeout
         )
 
     def close(self) -> None:
@@ -50,5 +280,62 @@ class HTTPClient(base.HTTPClient):
 
 
 class Consul(base.Consul):
+    def __init__(self, *args, connections_timeout=None, http2: bool = False, **kwargs) -> None:
+        """
+        *connections_timeout* is the default timeout of a request, in
+        seconds, either a single value or a (connect, read) tuple. Blocking
+        queries get a read timeout covering their *wait*. It can be
+        overridden per request by the methods supporting it.
+
+        *http2* selects the HTTP/2 transport of `consul.http2`, which
+        multiplexes concurrent requests (e.g. many blocking queries) over a
+        few connections. It requires the optional ``http2`` dependencies.
+
+        See `consul.base.Consul` for the other arguments.
+        """
+        self.connections_timeout = connections_timeout
+        self.http2 = http2
+        super().__init__(*args, **kwargs)
+
+    def fan_out(
+        self,
+        endpoint: Callable[..., Any],
+        *args: Any,
+        dcs: Iterable[str] | None = None,
+        concurrency: int = 8,
+        timeout: float | None = None,
+        **kwargs: Any,
+    ) -> fanout.FanOut:
+        """
+        Calls the datacenter-aware *endpoint* (e.g. ``self.health.state``)
+        with *args* and *kwargs* once per datacenter, passing it as *dc*,
+        and returns a `consul.fanout.FanOut` gathering the results and the
+        errors of each datacenter.
+
+        *dcs* are the datacenters to query, by default all the known ones
+        (Catalog.datacenters). At most *concurrency* calls run at a time.
+
+        *timeout* is how long to wait for all the datacenters, in seconds.
+        The ones which haven't answered by then are reported with a
+        `consul.Timeout` error.
+        """
+        if dcs is None:
+            dcs = self.catalog.datacenters()
+        return fanout.fan_out(endpoint, args, kwargs, dcs, concurrency, timeout)
+
     def http_connect(self, host: str, port: int, scheme, verify: bool | str = True, cert=None):
-        return HTTPClient(host, port, scheme, verify, cert)
+        if self.http2:
+            from consul import http2  # noqa: PLC0415 pylint: disable=import-outside-toplevel
+
+            return http2.HTTPClient(
+                host,
+                port,
+                scheme,
+                verify,
+                cert,
+                connections_timeout=self.connections_timeout,
+                **self.transport_options(),
+            )
+        return HTTPClient(
+            host, port, scheme, verify, cert, connections_timeout=self.connections_timeout, **self.transport_options()
+        )
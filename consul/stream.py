@@ -0,0 +1,160 @@
+"""
+Incremental parsing of the JSON arrays returned by the list endpoints, for
+the reads made with *stream* (e.g. ``c.catalog.nodes(stream=True)``).
+
+The items are decoded one at a time as the body is received, so that only
+the item being decoded and the last chunk read are held in memory instead
+of the whole body and the whole object graph.
+"""
+
+from __future__ import annotations
+
+import codecs
+import json
+from typing import TYPE_CHECKING, Any
+
+from consul.exceptions import ConsulException
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterable, AsyncIterator, Callable, Iterable, Iterator
+
+#: size of the chunks read from the body of a streamed response
+CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = " \t\n\r"
+
+
+class ArrayParser:
+    """
+    Push parser of a top-level JSON array: `feed` it the chunks of the
+    document as they are received and it returns the items completed so
+    far, `close` it at the end of the document. The items are decoded by
+    *decoder*, if given.
+    """
+
+    _START, _FIRST, _NEXT, _ITEM, _END = range(5)
+
+    def __init__(self, decoder: json.JSONDecoder | None = None) -> None:
+        self._decoder = decoder or json.JSONDecoder()
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._state = self._START
+        # length the buffer must reach before decoding an incomplete item
+        # again, doubled on each attempt so that a large item isn't decoded
+        # once per chunk
+        self._wanted = 0
+
+    def feed(self, chunk: bytes) -> list[Any]:
+        self._buffer += self._text.decode(chunk)
+        if len(self._buffer) < self._wanted:
+            return []
+        return self._parse(final=False)
+
+    def close(self) -> list[Any]:
+        self._buffer += self._text.decode(b"", final=True)
+        items = self._parse(final=True)
+        if self._state != self._END:
+            raise json.JSONDecodeError("Unterminated array", self._buffer, len(self._buffer))
+        return items
+
+    def _parse(self, final: bool) -> list[Any]:
+        items = []
+        buffer, pos, end = self._buffer, 0, len(self._buffer)
+        self._wanted = 0
+        while True:
+            while pos < end and buffer[pos] in _WHITESPACE:
+                pos += 1
+            if pos == end or self._state == self._END:
+                break
+            char = buffer[pos]
+            if self._delimiter(char, buffer, pos):
+                pos += 1
+                continue
+            try:
+                item, item_end = self._decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if final:
+                    raise
+                self._wanted = 2 * (end - pos)
+                break
+            if item_end == end and not final and char not in '{["':
+                # a number may go on in the next chunk
+                break
+            items.append(item)
+            self._state = self._NEXT
+            pos = item_end
+        if pos:
+            self._buffer = buffer[pos:]
+        return items
+
+    def _delimiter(self, char: str, buffer: str, pos: int) -> bool:
+        """
+        Moves past the delimiter *char* at *pos* of *buffer* if one is
+        expected there, returns False if an item starts there instead.
+        """
+        if self._state == self._START:
+            if char != "[":
+                raise json.JSONDecodeError("Expecting '['", buffer, pos)
+            self._state = self._FIRST
+        elif self._state in (self._FIRST, self._NEXT) and char == "]":
+            self._state = self._END
+        elif self._state == self._NEXT:
+            if char != ",":
+                raise json.JSONDecodeError("Expecting ',' delimiter", buffer, pos)
+            self._state = self._ITEM
+        else:
+            return False
+        return True
+
+
+def items(
+    chunks: Iterable[bytes], transform: Callable[[Any], Any] | None = None, decoder: json.JSONDecoder | None = None
+) -> Iterator[Any]:
+    """
+    Yields the items of the JSON array made of *chunks*, decoded by
+    *decoder* and passed through *transform* if given. Closing the
+    iterator closes *chunks*.
+    """
+    parser = ArrayParser(decoder)
+    try:
+        for chunk in chunks:
+            for item in parser.feed(chunk):
+                yield transform(item) if transform else item
+        for item in parser.close():
+            yield transform(item) if transform else item
+    except json.JSONDecodeError as e:
+        raise ConsulException(f"Failed to decode JSON: {e}") from e
+    finally:
+        close = getattr(chunks, "close", None)
+        if close is not None:
+            close()
+
+
+async def aitems(
+    chunks: AsyncIterable[bytes], transform: Callable[[Any], Any] | None = None, decoder: json.JSONDecoder | None = None
+) -> AsyncIterator[Any]:
+    """Asyncio flavour of `items`"""
+    parser = ArrayParser(decoder)
+    try:
+        async for chunk in chunks:
+            for item in parser.feed(chunk):
+                yield transform(item) if transform else item
+        for item in parser.close():
+            yield transform(item) if transform else item
+    except json.JSONDecodeError as e:
+        raise ConsulException(f"Failed to decode JSON: {e}") from e
+    finally:
+        aclose = getattr(chunks, "aclose", None)
+        if aclose is not None:
+            await aclose()
+
+
+def parse(
+    chunks: Iterable[bytes] | AsyncIterable[bytes],
+    transform: Callable[[Any], Any] | None = None,
+    decoder: json.JSONDecoder | None = None,
+):
+    """Returns `aitems` of async *chunks*, `items` of the others"""
+    if hasattr(chunks, "__aiter__"):
+        return aitems(chunks, transform, decoder)  # type: ignore[arg-type]
+    return items(chunks, transform, decoder)  # type: ignore[arg-type]
@@ -0,0 +1,162 @@
+"""
+TLS configuration shared by the clients of a process.
+
+Building an `ssl.SSLContext` reads and parses the CA bundle and the client
+certificate, and a context only resumes the TLS sessions it negotiated
+itself. `client_context` hence returns a single `ResumingContext` per
+configuration, which every client and connection using it share: the
+certificates are loaded once, and a connection opened after pool churn or
+an agent restart resumes the session of the previous one (a TLS 1.2 session
+id or a TLS 1.3 session ticket) instead of going through a full handshake.
+
+The configurations are keyed on the modification times of the certificate
+files too, so the clients built after the certificates were rotated on disk
+load the new ones. The existing clients keep the context they were built
+with. `reload` forgets all the shared contexts, e.g. for certificates
+rotated without changing their modification time.
+"""
+
+from __future__ import annotations
+
+import functools
+import os
+import ssl
+
+__all__ = ["ResumingContext", "client_context", "reload"]
+
+
+def _remember(connection: ssl.SSLSocket | ssl.SSLObject) -> None:
+    session = connection.session
+    # TLS 1.3 tickets are received after the handshake, along with the
+    # first response, until then the session can't be resumed
+    if session is None or (connection.version() == "TLSv1.3" and not session.has_ticket):
+        return
+    connection.context.sessions[connection.server_hostname] = session  # type: ignore[attr-defined]
+    connection.remembered = True  # type: ignore[union-attr]
+
+
+class _SSLSocket(ssl.SSLSocket):  # pylint: disable=abstract-method
+    remembered = False
+
+    def read(self, len=1024, buffer=None):  # noqa: A002 pylint: disable=redefined-builtin
+        data = super().read(len, buffer)
+        if not self.remembered:
+            _remember(self)
+        return data
+
+
+class _SSLObject(ssl.SSLObject):
+    remembered = False
+
+    def read(self, len=1024, buffer=None):  # noqa: A002 pylint: disable=redefined-builtin
+        data = super().read(len, buffer)
+        if not self.remembered:
+            _remember(self)
+        return data
+
+
+class ResumingContext(ssl.SSLContext):
+    """
+    Client context offering each server the last session negotiated with
+    it, its connections being wrapped by the HTTP libraries which don't
+    pass a *session* themselves.
+
+    *sessions* maps the server hostnames to their last session. A session
+    the server doesn't accept anymore, e.g. after it restarted, only costs
+    the full handshake that would have happened anyway, and is replaced by
+    the new one.
+    """
+
+    sslsocket_class = _SSLSocket
+    sslobject_class = _SSLObject
+
+    def __init__(self, protocol: int = ssl.PROTOCOL_TLS_CLIENT) -> None:  # pylint: disable=unused-argument
+        super().__init__()
+        self.sessions: dict[str | None, ssl.SSLSession] = {}
+
+    def _session(self, server_hostname: str | bytes | None) -> ssl.SSLSession | None:
+        # anyio passes the IDNA encoded hostname
+        if isinstance(server_hostname, bytes):
+            server_hostname = server_hostname.decode("ascii")
+        return self.sessions.get(server_hostname)
+
+    def wrap_socket(  # type: ignore[override]
+        self,
+        sock,
+        server_side=False,
+        do_handshake_on_connect=True,
+        suppress_ragged_eofs=True,
+        server_hostname=None,
+        session=None,
+    ):
+        if session is None and not server_side:
+            session = self._session(server_hostname)
+        return super().wrap_socket(
+            sock,
+            server_side=server_side,
+            do_handshake_on_connect=do_handshake_on_connect,
+            suppress_ragged_eofs=suppress_ragged_eofs,
+            server_hostname=server_hostname,
+            session=session,
+        )
+
+    def wrap_bio(self, incoming, outgoing, server_side=False, server_hostname=None, session=None):  # type: ignore[override]
+        if session is None and not server_side:
+            session = self._session(server_hostname)
+        return super().wrap_bio(
+            incoming, outgoing, server_side=server_side, server_hostname=server_hostname, session=session
+        )
+
+
+@functools.lru_cache(maxsize=32)
+def _client_context(
+    verify: bool | str,
+    cert: str | tuple[str, str] | None,
+    http2: bool,  # pylint: disable=unused-argument
+    mtimes: tuple[int, ...],  # pylint: disable=unused-argument
+) -> ResumingContext:
+    # same settings as ssl.create_default_context, which can't build a subclass
+    defaults = ssl.create_default_context()
+    context = ResumingContext(ssl.PROTOCOL_TLS_CLIENT)
+    context.options = defaults.options
+    context.verify_flags = defaults.verify_flags
+    if isinstance(verify, str):
+        if os.path.isdir(verify):
+            context.load_verify_locations(capath=verify)
+        else:
+            context.load_verify_locations(verify)
+    elif verify:
+        context.load_default_certs()
+    else:
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+    if isinstance(cert, tuple):
+        context.load_cert_chain(*cert)
+    elif cert:
+        context.load_cert_chain(cert)
+    return context
+
+
+def client_context(
+    verify: bool | str = True, cert: str | tuple[str, str] | list[str] | None = None, http2: bool = False
+) -> ResumingContext:
+    """
+    Returns the context shared by the clients connecting with the *verify*
+    and *cert* options of `consul.base.HTTPClient`. *verify* is either
+    whether to verify the certificate of the agents against the default CA
+    certificates, or the path of a CA bundle or directory.
+
+    The HTTP/2 transports set the ALPN protocols of their context on each
+    connection, they get distinct contexts with *http2*.
+    """
+    if isinstance(cert, list):
+        cert = tuple(cert)  # type: ignore[assignment]
+    paths = [verify] if isinstance(verify, str) else []
+    paths.extend([cert] if isinstance(cert, str) else cert or ())
+    mtimes = tuple(os.stat(path).st_mtime_ns for path in paths)
+    return _client_context(verify, cert, http2, mtimes)  # type: ignore[arg-type]
+
+
+def reload() -> None:
+    """Forgets the shared contexts, the clients built afterwards load the certificates again"""
+    _client_context.cache_clear()
@@ -44,9 +44,12 @@ setup(
     install_requires=_read_reqs("requirements.txt"),
     extras_require={
         "asyncio": ["aiohttp"],
+        "http2": ["httpx[http2]"],
+        "opentelemetry": ["opentelemetry-api"],
+        "prometheus": ["prometheus-client"],
     },
     data_files=[(".", ["requirements.txt", "tests-requirements.txt"])],
-    packages=find_packages(exclude=["tests*"]),
+    packages=find_packages(exclude=["tests*", "benchmarks*"]),
     tests_require=_read_reqs("tests-requirements.txt"),
     cmdclass={"install": Install},
     python_requires=">=3.10",
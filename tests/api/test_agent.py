@@ -253,6 +253,44 @@ class TestAgent:
         assert [v["Address"] for k, v in c.agent.services().items() if k == "foo"][0] == "10.10.10.1"
         assert c.agent.service.deregister("foo") is True
 
+    def test_agent_service_definition_hash(self, consul_obj) -> None:
+        c, _consul_version = consul_obj
+        assert c.agent.service.register("foo", tags=["a"]) is True
+        meta, definition = c.agent.service_definition("foo", meta=True)
+        assert definition["Tags"] == ["a"]
+        assert meta.content_hash
+
+        # nothing changed, the query blocks until the wait expires
+        start = time.monotonic()
+        same, _ = c.agent.service_definition("foo", content_hash=meta.content_hash, wait="1s", meta=True)
+        assert time.monotonic() - start >= 0.9
+        assert same.content_hash == meta.content_hash
+
+        assert c.agent.service.register("foo", tags=["b"]) is True
+        changed, definition = c.agent.service_definition("foo", content_hash=meta.content_hash, meta=True)
+        assert definition["Tags"] == ["b"]
+        assert changed.content_hash != meta.content_hash
+        assert c.agent.service.deregister("foo") is True
+
+    def test_agent_service_health(self, consul_obj) -> None:
+        c, _consul_version = consul_obj
+        assert c.agent.service.health_by_id("foo") is None
+        assert c.agent.service.health_by_name("foo") == []
+
+        c.agent.service.register("foo", service_id="foo:1", check=consul.check.Check.ttl("10s"))
+        health = c.agent.service.health_by_id("foo:1")
+        assert health["AggregatedStatus"] == "critical"
+        assert health["Service"]["ID"] == "foo:1"
+
+        c.agent.check.ttl_pass("service:foo:1")
+        assert [h["AggregatedStatus"] for h in c.agent.service.health_by_name("foo")] == ["passing"]
+        c.agent.check.ttl_warn("service:foo:1")
+        assert c.agent.service.health_by_id("foo:1", reuse_for=60)["AggregatedStatus"] == "warning"
+        c.agent.check.ttl_pass("service:foo:1")
+        # served from the client cache
+        assert c.agent.service.health_by_id("foo:1", reuse_for=60)["AggregatedStatus"] == "warning"
+        c.agent.service.deregister("foo:1")
+
     def test_agent_service_tagged_addresses(self, consul_obj) -> None:
         c, _consul_version = consul_obj
 
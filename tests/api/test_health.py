@@ -66,6 +66,24 @@ class TestHealth:
         _index, nodes = c.health.service("foo")
         assert nodes == []
 
+    def test_health_service_cached(self, consul_obj) -> None:
+        c, _consul_version = consul_obj
+
+        c.agent.service.register("foo", service_id="foo:1")
+        time.sleep(0.2)
+
+        meta, nodes = c.health.service("foo", cached=True)
+        assert [node["Service"]["ID"] for node in nodes] == ["foo:1"]
+        assert meta.cache_hit is False
+        assert meta.index
+
+        meta, nodes = c.health.service("foo", cached=True, max_age="1m")
+        assert [node["Service"]["ID"] for node in nodes] == ["foo:1"]
+        assert meta.cache_hit is True
+        assert meta.age is not None
+
+        c.agent.service.deregister("foo:1")
+
     def test_health_state(self, consul_obj) -> None:
         c, _consul_version = consul_obj
 
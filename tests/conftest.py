@@ -1,4 +1,5 @@
 import collections
+import time
 
 import pytest
 
@@ -18,3 +19,26 @@ def consul_obj(consul_port):
     consul_port, consul_version = consul_port
     c = Consul(port=consul_port)
     return c, consul_version
+
+
+@pytest.fixture
+def fake_session(monkeypatch):
+    """
+    Stands in for the `requests` session of a std client: each request
+    consumes the next queued outcome, a response or an exception to raise.
+    """
+
+    class Session:
+        def __init__(self) -> None:
+            self.outcomes: list = []
+            self.calls: list = []
+
+        def request(self, method, uri, **kwargs):
+            self.calls.append((method, uri, kwargs))
+            outcome = self.outcomes.pop(0)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+    monkeypatch.setattr(time, "sleep", lambda _: None)
+    return Session()
@@ -3,6 +3,8 @@ from __future__ import annotations
 import collections
 import contextlib
 import json
+import subprocess
+import sys
 from typing import TYPE_CHECKING, Any
 
 import pytest
@@ -153,6 +155,30 @@ class TestBaseInit:
         assert c.http.host == want["host"]
         assert c.http.port == want["port"]
 
+    @pytest.mark.parametrize(
+        ("env", "socket_path", "want"),
+        [
+            ("unix:///var/run/consul.sock", None, "/var/run/consul.sock"),
+            ("unix:///var/run/consul.sock", "/tmp/consul.sock", "/tmp/consul.sock"),
+            ("127.0.0.1:8500", None, None),
+            (None, "/tmp/consul.sock", "/tmp/consul.sock"),
+        ],
+    )
+    def test_base_init_socket_path(self, monkeypatch, env, socket_path, want) -> None:
+        if env:
+            monkeypatch.setenv("CONSUL_HTTP_ADDR", env)
+        else:
+            with contextlib.suppress(KeyError):
+                monkeypatch.delenv("CONSUL_HTTP_ADDR")
+
+        c = Consul(socket_path=socket_path)
+        assert c.socket_path == want
+
+    def test_base_init_socket_path_invalid(self, monkeypatch) -> None:
+        monkeypatch.setenv("CONSUL_HTTP_ADDR", "unix://")
+        with pytest.raises(consul.ConsulException):
+            Consul()
+
     @pytest.mark.parametrize(
         ("env", "scheme", "want"),
         [
@@ -192,6 +218,111 @@ class TestBaseInit:
         assert c.http.verify == want
 
 
+class TestLazyEndpoints:
+    def test_created_on_first_access(self) -> None:
+        c = Consul()
+        assert "kv" not in vars(c)
+        kv = c.kv
+        assert kv is c.kv
+        assert kv.agent is c
+        assert type(c.acl.token).__name__ == "Token"
+
+    def test_class_attribute(self) -> None:
+        assert Consul.kv.module == "consul.api.kv"
+        assert Consul.coordinate.attribute == "coordinate"
+
+    def test_import(self) -> None:
+        code = (
+            "import sys, consul; "
+            "assert not any(m.startswith(('consul.api', 'consul.std', 'requests')) for m in sys.modules); "
+            "consul.base; assert 'consul.api.kv' not in sys.modules; "
+            "consul.Consul().kv; assert 'consul.api.kv' in sys.modules and 'consul.api.acl' not in sys.modules"
+        )
+        subprocess.run([sys.executable, "-c", code], check=True)
+
+
+class TestWithOptions:
+    def test_view(self) -> None:
+        c = Consul(token="parent", dc="dc1")
+        c.kv.get("foo")
+        view = c.with_options(token="tenant", dc="dc2", consistency="stale")
+
+        assert view.http is c.http
+        assert view.kv is not c.kv
+        assert view.kv.agent is view
+        assert view.kv.get("foo") == Request(
+            "get", "/v1/kv/foo", [("dc", "dc2"), ("stale", "1")], {"X-Consul-Token": "tenant"}, None
+        )
+        assert c.kv.get("foo") == Request("get", "/v1/kv/foo", [("dc", "dc1")], {"X-Consul-Token": "parent"}, None)
+
+    def test_kept_options(self) -> None:
+        c = Consul(token="parent", dc="dc1", consistency="consistent")
+        view = c.with_options(token="")
+
+        assert (view.dc, view.consistency) == ("dc1", "consistent")
+        assert view.kv.get("foo").headers == {}
+        assert isinstance(view, Consul)
+        with pytest.raises(AssertionError):
+            c.with_options(consistency="eventual")
+
+    def test_close(self, monkeypatch) -> None:
+        closed = []
+        c = Consul()
+        monkeypatch.setattr(c.http, "close", lambda: closed.append(True), raising=False)
+        with c.with_options(dc="dc2"):
+            pass
+        assert not closed
+        with c:
+            pass
+        assert closed
+
+
+class TestLegacyTransport:
+    # pylint: disable=protected-access
+
+    class Transport(consul.base.HTTPClient):
+        """Third-party transport implementing only the public methods"""
+
+        def get(self, callback, path, params=None, headers=None, raw=False):
+            return callback(consul.base.Response(200, {}, json.dumps([path, params, raw])))
+
+        def put(self, callback, path, params=None, data="", headers=None):
+            raise NotImplementedError
+
+        def delete(self, callback, path, params=None, data="", headers=None):
+            raise NotImplementedError
+
+        def post(self, callback, path, params=None, data="", headers=None):
+            raise NotImplementedError
+
+        def close(self) -> None:
+            pass
+
+    def test_get(self) -> None:
+        http = self.Transport(coalesce=True)
+        assert http._get(consul.callback.CB.json(), "/v1/kv/foo", [("dc", "dc1")]) == [
+            "/v1/kv/foo",
+            [["dc", "dc1"]],
+            False,
+        ]
+        with pytest.raises(NotImplementedError):
+            http._request(consul.callback.CB.json(), "PUT", "/v1/kv/foo", data="bar")
+
+
+class TestParseDuration:
+    @pytest.mark.parametrize(
+        ("value", "want"),
+        [("10s", 10.0), ("5m", 300.0), ("1h", 3600.0), ("1m30s", 90.0), ("250ms", 0.25), (7, 7.0), ("2", 2.0)],
+    )
+    def test_parse_duration(self, value, want) -> None:
+        assert consul.base.parse_duration(value) == want
+
+    @pytest.mark.parametrize("value", ["", "soon", "10x", "s10"])
+    def test_invalid(self, value) -> None:
+        with pytest.raises(ValueError, match="invalid duration"):
+            consul.base.parse_duration(value)
+
+
 class TestIndex:
     """
     Tests read requests that should support blocking on an index
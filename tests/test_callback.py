@@ -1,9 +1,11 @@
+import json
+
 import pytest
 
 import consul
 from consul.base import Response
 from consul.callback import CB
-from consul.exceptions import ACLDisabled, ACLPermissionDenied, BadRequest, ClientError, NotFound
+from consul.exceptions import ACLDisabled, ACLPermissionDenied, BadRequest, ClientError, NotFound, RateLimited
 
 
 class TestCB:
@@ -48,3 +50,50 @@ class TestCB:
     def test_status_5xx_raises_error(self, response) -> None:
         with pytest.raises(consul.base.ConsulException):
             CB._status(response)
+
+    def test_status_429_raises_RateLimited(self) -> None:
+        response = Response(429, None, None)
+        with pytest.raises(RateLimited):
+            CB._status(response)
+
+
+class TestIntern:
+    BODY = json.dumps([
+        {"Node": "node" + "1", "Tags": ["prim" + "ary"], "Status": "pass" + "ing", "Output": "x" * 200},
+        {"Node": "node" + "1", "Tags": ["prim" + "ary"], "Status": "pass" + "ing", "Output": "x" * 200},
+    ])
+
+    def test_intern(self) -> None:
+        first, second = CB.json(intern=True)(Response(200, {}, self.BODY))
+
+        assert first == second
+        for key in ("Node", "Status"):
+            assert first[key] is second[key]
+        assert first["Tags"][0] is second["Tags"][0]
+        # long values are seldom repeated, they are left alone
+        assert first["Output"] is not second["Output"]
+
+    def test_no_intern(self) -> None:
+        first, second = CB.json()(Response(200, {}, self.BODY))
+
+        assert first["Status"] is not second["Status"]
+
+    def test_stream(self) -> None:
+        first, second = CB.json(stream=True, intern=True)(Response(200, {}, iter([self.BODY.encode()])))
+
+        assert first["Node"] is second["Node"]
+
+    def test_bounded(self, monkeypatch) -> None:
+        monkeypatch.setattr(consul.callback, "INTERN_MAX_STRINGS", 2)
+        first, second = CB.json(intern=True)(Response(200, {}, self.BODY))
+
+        assert first == second
+        # the memo is full once the first keys are remembered
+        assert first["Status"] is not second["Status"]
+
+    def test_per_response(self) -> None:
+        cb = CB.json(intern=True)
+        first = cb(Response(200, {}, self.BODY))[0]
+        second = cb(Response(200, {}, self.BODY))[0]
+
+        assert first["Status"] is not second["Status"]
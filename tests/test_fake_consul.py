@@ -0,0 +1,129 @@
+import threading
+import time
+
+import pytest
+
+import consul
+import consul.aio
+from benchmarks.fake_consul import FakeConsul
+
+
+@pytest.fixture
+def fake():
+    fake = FakeConsul(seed=1)
+    with fake.serve_in_thread() as port:
+        fake.port = port
+        yield fake
+
+
+@pytest.fixture
+def c(fake):
+    return consul.Consul(port=fake.port)
+
+
+class TestKV:
+    def test_put_get_delete(self, c) -> None:
+        assert c.kv.put("app/a", "1")
+        assert c.kv.put("app/b/c", "2", flags=3)
+        index, entry = c.kv.get("app/a")
+        assert entry["Value"] == b"1"
+        assert entry["CreateIndex"] == entry["ModifyIndex"] == int(index)
+
+        _, entries = c.kv.get("app/", recurse=True)
+        assert [(e["Key"], e["Flags"]) for e in entries] == [("app/a", 0), ("app/b/c", 3)]
+        _, keys = c.kv.get("app/", keys=True, separator="/")
+        assert keys == ["app/a", "app/b/"]
+
+        assert c.kv.delete("app/", recurse=True)
+        assert c.kv.get("app/a")[1] is None
+
+    def test_cas_and_locks(self, c) -> None:
+        assert c.kv.put("lock", "x", cas=0)
+        assert not c.kv.put("lock", "y", cas=0)
+        _, entry = c.kv.get("lock")
+        assert c.kv.put("lock", "y", cas=entry["ModifyIndex"])
+
+        session = c.session.create(name="leader", behavior="delete")
+        assert c.kv.put("lock", "me", acquire=session)
+        assert not c.kv.put("lock", "other", acquire="unknown")
+        assert c.kv.get("lock")[1]["Session"] == session
+        assert c.session.info(session)[1]["Name"] == "leader"
+        c.session.destroy(session)
+        assert c.kv.get("lock")[1] is None
+
+    def test_blocking_query(self, c) -> None:
+        c.kv.put("watched", "1")
+        index, _ = c.kv.get("watched")
+        threading.Timer(0.1, c.kv.put, ("watched", "2")).start()
+        start = time.monotonic()
+        new_index, entry = c.kv.get("watched", index=index, wait="5s")
+
+        assert entry["Value"] == b"2"
+        assert int(new_index) > int(index)
+        assert 0.05 < time.monotonic() - start < 2
+        # unrelated writes don't answer it
+        start = time.monotonic()
+        threading.Timer(0.05, c.kv.put, ("other", "x")).start()
+        assert c.kv.get("watched", index=new_index, wait="300ms")[0] == new_index
+        assert time.monotonic() - start >= 0.3
+
+    def test_txn(self, c) -> None:
+        c.kv.put("a", "1")
+        _, entry = c.kv.get("a")
+        result = c.txn.put([
+            {"KV": {"Verb": "cas", "Key": "a", "Value": "Mg==", "Index": entry["ModifyIndex"]}},
+            {"KV": {"Verb": "set", "Key": "b", "Value": "Mw=="}},
+        ])
+        assert [r["KV"]["Key"] for r in result["Results"]] == ["a", "b"]
+        assert result["Results"][0]["KV"]["ModifyIndex"] == result["Results"][1]["KV"]["ModifyIndex"]
+
+        with pytest.raises(consul.ConsulException):
+            c.txn.put([
+                {"KV": {"Verb": "set", "Key": "c", "Value": "NA=="}},
+                {"KV": {"Verb": "check-index", "Key": "a", "Index": 1}},
+            ])
+        assert c.kv.get("c")[1] is None
+
+
+class TestCatalog:
+    def test_synthetic_data(self, fake, c) -> None:
+        fake.populate(nodes=10, services=3, instances=4, keys=250, critical=0.5)
+
+        assert len(c.catalog.nodes()[1]) == 10
+        assert set(c.catalog.services()[1]) == {"service-0", "service-1", "service-2"}
+        _, instances = c.health.service("service-1")
+        assert len(instances) == 4
+        assert {check["CheckID"] for check in instances[0]["Checks"]} == {"serfHealth", "service:service-1-0"}
+        _, passing = c.health.service("service-1", passing=True)
+        assert all(check["Status"] == "passing" for entry in passing for check in entry["Checks"])
+        assert len(c.catalog.service("service-0", tag="shard-1")[1]) == 1
+        assert len(c.kv.get("app/1/", recurse=True)[1]) == 3
+
+    def test_register(self, c) -> None:
+        assert c.catalog.register("n1", "10.0.0.1", service={"Service": "web", "Port": 80})
+        index, nodes = c.health.service("web")
+        assert nodes[0]["Node"]["Address"] == "10.0.0.1"
+        threading.Timer(0.1, c.catalog.deregister, ("n1",), {"service_id": "web"}).start()
+        assert c.health.service("web", index=index, wait="5s")[1] == []
+
+
+class TestFaults:
+    def test_errors(self, fake, c) -> None:
+        fake.error_rate = 1.0
+        with pytest.raises(consul.ConsulException):
+            c.kv.get("foo")
+        assert fake.errors == 1
+
+    def test_latency(self, fake, c) -> None:
+        fake.latency = 0.05
+        start = time.monotonic()
+        c.status.leader()
+        assert time.monotonic() - start >= 0.05
+
+    async def test_aio(self, fake) -> None:
+        c = consul.aio.Consul(port=fake.port)
+        try:
+            assert await c.kv.put("foo", "bar")
+            assert (await c.kv.get("foo"))[1]["Value"] == b"bar"
+        finally:
+            await c.close()
@@ -0,0 +1,121 @@
+import asyncio
+import threading
+
+import consul.aio
+import consul.std
+from consul import ConsulException, Timeout
+from consul.fanout import FanOut
+
+
+def state(check_state, dc=None):
+    if dc == "broken":
+        raise ConsulException("500 no path to datacenter")
+    return [{"CheckID": f"{dc}-check", "Status": check_state}]
+
+
+class TestFanOut:
+    def test_results_and_errors(self) -> None:
+        c = consul.std.Consul()
+        result = c.fan_out(state, "critical", dcs=["dc1", "broken", "dc2"])
+
+        assert list(result.results) == ["dc1", "dc2"]
+        assert isinstance(result.errors["broken"], ConsulException)
+        assert not result.complete
+        assert result.merged() == [
+            ("dc1", {"CheckID": "dc1-check", "Status": "critical"}),
+            ("dc2", {"CheckID": "dc2-check", "Status": "critical"}),
+        ]
+
+    def test_default_dcs(self, monkeypatch) -> None:
+        c = consul.std.Consul()
+        monkeypatch.setattr(c.catalog, "datacenters", lambda: ["dc1", "dc2"])
+        result = c.fan_out(state, "passing")
+
+        assert result.complete
+        assert sorted(result.results) == ["dc1", "dc2"]
+
+    def test_concurrency(self) -> None:
+        lock = threading.Lock()
+        running, peak = [0], [0]
+
+        def endpoint(dc=None):
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            threading.Event().wait(0.02)
+            with lock:
+                running[0] -= 1
+            return dc
+
+        result = consul.std.Consul().fan_out(endpoint, dcs=[f"dc{i}" for i in range(8)], concurrency=2)
+
+        assert len(result.results) == 8
+        assert peak[0] == 2
+
+    def test_timeout(self) -> None:
+        release = threading.Event()
+
+        def endpoint(dc=None):
+            if dc == "slow":
+                release.wait(5)
+            return dc
+
+        try:
+            result = consul.std.Consul().fan_out(endpoint, dcs=["dc1", "slow"], timeout=0.1)
+        finally:
+            release.set()
+
+        assert result.results == {"dc1": "dc1"}
+        assert isinstance(result.errors["slow"], Timeout)
+
+    def test_merged(self) -> None:
+        result = FanOut()
+        result.results = {
+            "dc1": ("42", [{"Key": "a"}]),
+            "dc2": {"web": []},
+            "dc3": None,
+            "dc4": {"Key": "b"},
+        }
+
+        assert result.merged() == [
+            ("dc1", {"Key": "a"}),
+            ("dc2", ("web", [])),
+            ("dc4", ("Key", "b")),
+        ]
+
+
+class TestAsyncFanOut:
+    async def test_results_errors_and_timeout(self) -> None:
+        async def endpoint(dc=None):
+            if dc == "slow":
+                await asyncio.sleep(5)
+            return state("critical", dc=dc)
+
+        c = consul.aio.Consul()
+        try:
+            result = await c.fan_out(endpoint, dcs=["dc1", "broken", "slow"], timeout=0.1)
+        finally:
+            await c.close()
+
+        assert list(result.results) == ["dc1"]
+        assert isinstance(result.errors["broken"], ConsulException)
+        assert isinstance(result.errors["slow"], Timeout)
+
+    async def test_concurrency(self) -> None:
+        running, peak = [0], [0]
+
+        async def endpoint(dc=None):
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+            await asyncio.sleep(0.01)
+            running[0] -= 1
+            return [dc]
+
+        c = consul.aio.Consul()
+        try:
+            result = await c.fan_out(endpoint, dcs=["dc1", "dc2", "dc3"], concurrency=1)
+        finally:
+            await c.close()
+
+        assert peak[0] == 1
+        assert result.merged() == [("dc1", "dc1"), ("dc2", "dc2"), ("dc3", "dc3")]
@@ -0,0 +1,106 @@
+import json
+
+import requests
+
+import consul.std
+from consul.freshness import ReadYourWrites
+from tests.utils import http_response
+
+
+class TestReadYourWrites:
+    def test_untouched(self) -> None:
+        tracker = ReadYourWrites()
+        assert tracker.requirement("/v1/kv/foo") is None
+        tracker.wrote("/v1/catalog/register")
+        assert tracker.requirement("/v1/kv/foo") is None
+        assert tracker.requirement("/v1/agent/self") is None
+
+    def test_floor(self) -> None:
+        tracker = ReadYourWrites()
+        tracker.wrote("/v1/kv/foo")
+        requirement = tracker.requirement("/v1/kv/foo")
+        assert requirement is not None
+        generation, floor = requirement
+        assert floor is None
+        tracker.observed("/v1/kv/foo", generation, 10)
+        assert tracker.requirement("/v1/kv/foo") == (generation, 10)
+        # any other path of the family must be read from the leader
+        assert tracker.requirement("/v1/kv/bar") == (generation, None)
+        # a new write invalidates the floor
+        tracker.wrote("/v1/kv/bar")
+        assert tracker.requirement("/v1/kv/foo") == (generation + 1, None)
+
+    def test_outdated_observation(self) -> None:
+        tracker = ReadYourWrites()
+        tracker.wrote("/v1/kv/foo")
+        requirement = tracker.requirement("/v1/kv/foo")
+        assert requirement is not None
+        tracker.wrote("/v1/kv/foo")
+        tracker.observed("/v1/kv/foo", requirement[0], 10)
+        assert tracker.requirement("/v1/kv/foo") == (requirement[0] + 1, None)
+
+    def test_families(self) -> None:
+        tracker = ReadYourWrites()
+        tracker.wrote("/v1/catalog/register")
+        assert tracker.requirement("/v1/health/service/web") is not None
+        tracker.wrote("/v1/session/destroy/abc")
+        assert tracker.requirement("/v1/kv/lock") is not None
+
+    def test_size(self) -> None:
+        tracker = ReadYourWrites(size=2)
+        tracker.wrote("/v1/kv/a")
+        for key in "abc":
+            tracker.set_floor(f"/v1/kv/{key}", 5)
+        # the floor of a was evicted
+        assert tracker.requirement("/v1/kv/a") == (1, None)
+        assert tracker.requirement("/v1/kv/c") == (1, 5)
+
+
+class TestTransport:
+    def read(self, index: int) -> requests.Response:
+        return http_response(200, '[{"Key": "foo", "Value": "YmFy"}]', {"X-Consul-Index": str(index)})
+
+    def test_kv(self, fake_session) -> None:
+        c = consul.std.Consul(consistency="stale", read_your_writes=True)
+        c.http.session = fake_session
+
+        # nothing written yet, any server answers
+        fake_session.outcomes = [self.read(5)]
+        c.kv.get("foo")
+        # the first read after a write is served by the leader
+        fake_session.outcomes = [http_response(200, "true"), self.read(10)]
+        c.kv.put("foo", "bar")
+        c.kv.get("foo")
+        # then by any server up to date, or by the leader
+        fake_session.outcomes = [self.read(10), self.read(8), self.read(10)]
+        c.kv.get("foo")
+        c.kv.get("foo")
+        assert [uri for method, uri, _ in fake_session.calls if method == "GET"] == [
+            "http://127.0.0.1:8500/v1/kv/foo?stale=1",
+            "http://127.0.0.1:8500/v1/kv/foo",
+            "http://127.0.0.1:8500/v1/kv/foo?stale=1",
+            "http://127.0.0.1:8500/v1/kv/foo?stale=1",
+            "http://127.0.0.1:8500/v1/kv/foo",
+        ]
+
+    def test_txn(self, fake_session) -> None:
+        c = consul.std.Consul(consistency="stale", read_your_writes=True)
+        c.http.session = fake_session
+        results = {"Results": [{"KV": {"Key": "foo", "ModifyIndex": 12}}], "Errors": None}
+        fake_session.outcomes = [http_response(200, json.dumps(results)), self.read(11), self.read(12)]
+        c.txn.put([{"KV": {"Verb": "set", "Key": "foo", "Value": "YmFy"}}])
+        c.kv.get("foo")
+        assert [uri for method, uri, _ in fake_session.calls if method == "GET"] == [
+            "http://127.0.0.1:8500/v1/kv/foo?stale=1",
+            "http://127.0.0.1:8500/v1/kv/foo",
+        ]
+
+    def test_shared(self, fake_session) -> None:
+        tracker = ReadYourWrites()
+        writer = consul.std.Consul(read_your_writes=tracker)
+        reader = consul.std.Consul(consistency="stale", read_your_writes=tracker)
+        writer.http.session = reader.http.session = fake_session
+        fake_session.outcomes = [http_response(200, "true"), self.read(10)]
+        writer.kv.put("foo", "bar")
+        reader.kv.get("foo")
+        assert fake_session.calls[-1][1] == "http://127.0.0.1:8500/v1/kv/foo"
@@ -0,0 +1,55 @@
+import pytest
+
+from benchmarks import harness
+
+
+@pytest.mark.parametrize("client", ["std", "aio"])
+def test_harness(client, capsys) -> None:
+    results = harness.main([
+        f"--client={client}",
+        "--watchers=4",
+        "--writers=2",
+        "--keys=2",
+        "--rate=50",
+        "--duration=0.5",
+        "--wait=5s",
+    ])
+
+    assert results["requests"] > 0
+    assert results["errors"] == 0
+    assert results["samples"] > 0
+    assert results["propagation"]["p50"] is not None
+    assert "per watch" in capsys.readouterr().out
+
+
+def test_tracker() -> None:
+    tracker = harness.Tracker([2])
+    tracker.recording = True
+    value = tracker.value().encode()
+    tracker.received(0, value)
+    assert len(tracker.latencies) == 1
+    assert not tracker.propagations
+    tracker.received(0, value)
+    tracker.received(0, b"unknown:0.0")
+    assert len(tracker.latencies) == 2
+    assert len(tracker.propagations) == 1
+
+
+def test_percentiles() -> None:
+    assert harness.percentiles([3.0, 1.0, 2.0, 4.0]) == {"p50": 3.0, "p90": 4.0, "p99": 4.0, "max": 4.0}
+    assert harness.percentiles([])["p50"] is None
+
+
+def test_std_pool(caplog) -> None:
+    # more threads than requests' default pool of 10 connections
+    harness.main([
+        "--client=std",
+        "--watchers=12",
+        "--writers=2",
+        "--keys=2",
+        "--rate=50",
+        "--duration=0.5",
+        "--wait=1s",
+    ])
+
+    assert "Connection pool is full" not in caplog.text
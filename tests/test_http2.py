@@ -0,0 +1,76 @@
+import httpx
+import pytest
+
+import consul
+import consul.aio
+import consul.http2
+import consul.std
+from consul.callback import CB
+
+
+def _timeout(request: httpx.Request) -> httpx.Response:
+    raise httpx.ReadTimeout("timed out", request=request)
+
+
+def _handler(request: httpx.Request) -> httpx.Response:
+    assert request.headers["X-Consul-Token"] == "secret"
+    if request.method == "PUT":
+        return httpx.Response(200, text=str(request.content == b"bar").lower())
+    return httpx.Response(200, headers={"X-Consul-Index": "42"}, json=[{"Key": request.url.path}])
+
+
+class TestSelection:
+    def test_std(self) -> None:
+        c = consul.std.Consul(scheme="https", http2=True)
+        assert isinstance(c.http, consul.http2.HTTPClient)
+        assert c.http.base_uri == "https://127.0.0.1:8500"
+        c.http.close()
+
+    async def test_aio(self) -> None:
+        c = consul.aio.Consul(scheme="https", http2=True)
+        assert isinstance(c.http, consul.http2.AsyncHTTPClient)
+        await c.close()
+
+
+class TestHTTPClient:  # pylint: disable=protected-access
+    def test_request(self) -> None:
+        http = consul.http2.HTTPClient()
+        http._client = httpx.Client(transport=httpx.MockTransport(_handler))
+        headers = {"X-Consul-Token": "secret"}
+        assert http.get(CB.json(index=True), "/v1/kv/foo", headers=headers) == ("42", [{"Key": "/v1/kv/foo"}])
+        assert http.put(CB.json(), "/v1/kv/foo", data="bar", headers=headers) is True
+        http.close()
+
+    async def test_async_request(self) -> None:
+        http = consul.http2.AsyncHTTPClient()
+        http._client = httpx.AsyncClient(transport=httpx.MockTransport(_handler))
+        headers = {"X-Consul-Token": "secret"}
+        assert await http.get(CB.json(index=True), "/v1/kv/foo", headers=headers) == ("42", [{"Key": "/v1/kv/foo"}])
+        assert await http.put(CB.json(), "/v1/kv/foo", data="bar", headers=headers) is True
+        await http.close()
+
+    def test_timeout(self) -> None:
+        http = consul.http2.HTTPClient()
+        http._client = httpx.Client(transport=httpx.MockTransport(_timeout))
+        with pytest.raises(consul.Timeout):
+            http.get(CB.json(), "/v1/kv/foo")
+        http.close()
+
+    async def test_async_timeout(self) -> None:
+        http = consul.http2.AsyncHTTPClient()
+        http._client = httpx.AsyncClient(transport=httpx.MockTransport(_timeout))
+        with pytest.raises(consul.Timeout):
+            await http.get(CB.json(), "/v1/kv/foo")
+        http._client = httpx.AsyncClient(transport=httpx.MockTransport(lambda request: httpx.Response(599)))
+        with pytest.raises(consul.Timeout):
+            await http.get(CB.json(), "/v1/kv/foo")
+        await http.close()
+
+    def test_insecure(self) -> None:
+        http = consul.http2.HTTPClient(scheme="https", verify=False)
+        assert http._ssl_context() is False
+        http.close()
+
+    def test_ca_bundle(self) -> None:
+        with pytest.raises(FileNotFoundError):
+            consul.http2.HTTPClient(scheme="https", verify="/nonexistent/ca.pem")
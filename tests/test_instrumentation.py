@@ -0,0 +1,254 @@
+import logging
+
+import httpx
+import pytest
+import requests
+from aiohttp import web
+
+import consul.aio
+import consul.http2
+import consul.std
+from consul.callback import CB
+from consul.exceptions import ConsulException
+from consul.instrumentation import (
+    Hook,
+    LatencyHistogram,
+    OpenTelemetryHook,
+    PrometheusHook,
+    Request,
+    SlowRequestLog,
+    endpoint,
+)
+from consul.retry import Retry
+from tests.utils import http_response
+
+
+class Recorder(Hook):
+    def __init__(self) -> None:
+        self.calls: list = []
+        self.requests: list = []
+
+    def before(self, request: Request) -> None:
+        self.calls.append(("before", request.endpoint, request.attempts))
+        self.requests.append(("before", request))
+
+    def after(self, request: Request) -> None:
+        self.calls.append(("after", request.endpoint, request.attempts, request.status, request.error, request.size))
+        self.requests.append(("after", request))
+
+
+class Broken(Hook):
+    def after(self, request: Request) -> None:
+        raise RuntimeError("boom")
+
+
+@pytest.mark.parametrize(
+    ("path", "template"),
+    [
+        ("/v1/kv/config/web/port", "/v1/kv/:key"),
+        ("/v1/health/service/web", "/v1/health/service/:service"),
+        ("/v1/agent/service/register", "/v1/agent/service/register"),
+        ("/v1/agent/service/web-1", "/v1/agent/service/:service_id"),
+        ("/v1/acl/token/self", "/v1/acl/token/self"),
+        ("/v1/acl/token/1234/clone", "/v1/acl/token/:accessor_id/clone"),
+        ("/v1/config/service-defaults/web", "/v1/config/:kind/:name"),
+        ("/v1/catalog/nodes", "/v1/catalog/nodes"),
+    ],
+)
+def test_endpoint(path, template) -> None:
+    assert endpoint(path) == template
+
+
+class TestHooks:
+    def test_request(self, fake_session) -> None:
+        recorder = Recorder()
+        c = consul.std.Consul(hooks=[recorder])
+        c.http.session = fake_session
+        fake_session.outcomes = [http_response(200, '[{"Key": "foo/bar"}]', {"X-Consul-Index": "1"})]
+        c.kv.get("foo/bar")
+
+        assert recorder.calls == [
+            ("before", "/v1/kv/:key", 0),
+            ("after", "/v1/kv/:key", 1, 200, None, 20),
+        ]
+
+    def test_retries_and_errors(self, fake_session) -> None:
+        latency = LatencyHistogram()
+        c = consul.std.Consul(hooks=[latency, Broken()], retry=Retry(attempts=3))
+        c.http.session = fake_session
+        error = requests.ConnectionError("refused")
+        fake_session.outcomes = [http_response(503, "busy"), error, error]
+        with pytest.raises(requests.ConnectionError):
+            c.kv.get("foo")
+        fake_session.outcomes = [http_response(200, "[]", {"X-Consul-Index": "2"})]
+        c.kv.get("foo", index=1, wait="1s")
+
+        snapshot = latency.snapshot()
+        assert snapshot[("GET", "/v1/kv/:key", False)]["count"] == 1
+        assert snapshot[("GET", "/v1/kv/:key", False)]["errors"] == 1
+        assert snapshot[("GET", "/v1/kv/:key", False)]["retries"] == 2
+        assert snapshot[("GET", "/v1/kv/:key", True)]["count"] == 1
+        assert latency.percentile("GET", "/v1/kv/:key", 0.5) is not None
+        assert latency.percentile("PUT", "/v1/kv/:key", 0.5) is None
+
+    def test_no_hooks(self) -> None:
+        http = consul.std.Consul().http
+        assert not http.hooks
+
+    async def test_async(self) -> None:
+        def handler(request: httpx.Request) -> httpx.Response:  # pylint: disable=unused-argument
+            return httpx.Response(200, content=b'"leader:8300"')
+
+        recorder = Recorder()
+        http = consul.http2.AsyncHTTPClient(hooks=[recorder])
+        http._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))  # pylint: disable=protected-access
+        assert await http.get(CB.json(), "/v1/status/leader") == "leader:8300"
+        assert recorder.calls[-1] == ("after", "/v1/status/leader", 1, 200, None, 13)
+
+
+class TestTimings:
+    def test_std(self, fake_session) -> None:
+        recorder = Recorder()
+        c = consul.std.Consul(hooks=[recorder])
+        c.http.session = fake_session
+        fake_session.outcomes = [http_response(200, "[]", {"X-Consul-Index": "1"})]
+        c.kv.get("foo", recurse=True)
+
+        request = recorder.requests[-1][1]
+        assert request.params == [("recurse", "1")]
+        assert set(request.timings) == {"ttfb", "read", "decode"}
+        assert request.duration >= request.timings["decode"]
+
+    def test_callback_error(self, fake_session) -> None:
+        recorder = Recorder()
+        c = consul.std.Consul(hooks=[recorder])
+        c.http.session = fake_session
+        fake_session.outcomes = [http_response(200, "not json", {"X-Consul-Index": "1"})]
+        with pytest.raises(ConsulException):
+            c.kv.get("foo")
+
+        request = recorder.requests[-1][1]
+        assert request.status == 200
+        assert isinstance(request.error, ConsulException)
+
+    async def test_aio_connect(self) -> None:
+        async def leader(request: web.Request) -> web.Response:  # pylint: disable=unused-argument
+            return web.json_response("leader:8300")
+
+        app = web.Application()
+        app.router.add_get("/v1/status/leader", leader)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = runner.addresses[0][1]
+        recorder = Recorder()
+        c = consul.aio.Consul(port=port, hooks=[recorder])
+        try:
+            assert await c.status.leader() == "leader:8300"
+            assert await c.status.leader() == "leader:8300"
+        finally:
+            await c.close()
+            await runner.cleanup()
+
+        first, second = (request for name, request in recorder.requests if name == "after")
+        assert set(first.timings) == {"connect", "ttfb", "read", "decode"}
+        # the connection is reused
+        assert "connect" not in second.timings
+
+    async def test_http2(self) -> None:
+        def handler(request: httpx.Request) -> httpx.Response:  # pylint: disable=unused-argument
+            return httpx.Response(200, content=b'"leader:8300"')
+
+        recorder = Recorder()
+        http = consul.http2.HTTPClient(hooks=[recorder])
+        http._client = httpx.Client(transport=httpx.MockTransport(handler))  # pylint: disable=protected-access
+        assert http.get(CB.json(), "/v1/status/leader") == "leader:8300"
+        assert set(recorder.requests[-1][1].timings) == {"ttfb", "read", "decode"}
+
+
+class TestSlowRequestLog:
+    @staticmethod
+    def request(duration: float = 0.1, size: int = 10, blocking: bool = False) -> Request:
+        request = Request("GET", "/v1/catalog/service/web", blocking, [("dc", "dc1"), ("token", "secret")])
+        request.attempts = 1
+        request.status = 200
+        request.size = size
+        request.duration = duration
+        request.timings = {"ttfb": 0.05, "read": 0.04, "decode": 0.01}
+        return request
+
+    def test_thresholds(self, caplog) -> None:
+        hook = SlowRequestLog(latency=1.0, size=1000)
+        with caplog.at_level(logging.WARNING, "consul.slow"):
+            hook.after(self.request())
+            hook.after(self.request(duration=5.0, blocking=True))
+            assert not caplog.records
+            hook.after(self.request(duration=1.5))
+            hook.after(self.request(size=2000, blocking=True))
+
+        slow, large = caplog.records
+        assert slow.getMessage() == (
+            "slow consul request GET /v1/catalog/service/:service params=[('dc', 'dc1'), ('token', '<redacted>')] "
+            "status=200 size=10 attempts=1 duration=1500.0ms connect=- ttfb=50.0ms read=40.0ms decode=10.0ms"
+        )
+        assert "secret" not in large.getMessage()
+        assert large.consul_request["size"] == 2000
+        assert large.consul_request["connect"] is None
+
+    def test_disabled(self, caplog) -> None:
+        hook = SlowRequestLog(latency=None, size=None)
+        with caplog.at_level(logging.WARNING, "consul.slow"):
+            hook.after(self.request(duration=60.0, size=10**9))
+        assert not caplog.records
+
+    def test_sample(self, caplog, monkeypatch) -> None:
+        draws = iter([0.5, 0.05])
+        monkeypatch.setattr("consul.instrumentation.random.random", lambda: next(draws))
+        hook = SlowRequestLog(latency=1.0, sample=0.1)
+        with caplog.at_level(logging.WARNING, "consul.slow"):
+            for _ in range(3):
+                hook.after(self.request())
+            hook.after(self.request(duration=2.0))
+            hook.after(self.request(duration=2.0))
+        assert len(caplog.records) == 1
+
+
+class TestHistogram:
+    def test_buckets(self) -> None:
+        latency = LatencyHistogram(buckets=(0.1, 1.0))
+        for duration in (0.05, 0.05, 0.5, 3.0):
+            request = Request("GET", "/v1/catalog/nodes")
+            request.duration = duration
+            request.status = 200
+            latency.after(request)
+
+        series = latency.snapshot()[("GET", "/v1/catalog/nodes", False)]
+        assert series["buckets"] == [2, 1, 1]
+        assert series["max"] == 3.0
+        assert latency.percentile("GET", "/v1/catalog/nodes", 0.5) == 0.1
+        assert latency.percentile("GET", "/v1/catalog/nodes", 0.75) == 1.0
+        assert latency.percentile("GET", "/v1/catalog/nodes", 1) == 3.0
+        latency.reset()
+        assert not latency.snapshot()
+
+
+def test_prometheus() -> None:
+    prometheus_client = pytest.importorskip("prometheus_client")
+    registry = prometheus_client.CollectorRegistry()
+    hook = PrometheusHook(registry=registry)
+    request = Request("GET", "/v1/kv/foo")
+    request.done(None)
+    request.status = 200
+    hook.after(request)
+
+    assert registry.get_sample_value(
+        "consul_client_requests_total", {"method": "GET", "endpoint": "/v1/kv/:key", "status": "200"}
+    )
+
+
+def test_opentelemetry() -> None:
+    pytest.importorskip("opentelemetry")
+    request = Request("GET", "/v1/kv/foo")
+    request.done(ConnectionError())
+    OpenTelemetryHook().after(request)
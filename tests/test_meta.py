@@ -0,0 +1,117 @@
+import pytest
+
+import consul.std
+from consul.base import Response
+from consul.callback import CB
+from consul.meta import QueryMeta
+from tests.utils import http_response
+
+
+class TestQueryMeta:
+    def test_headers(self) -> None:
+        meta = QueryMeta({"X-Consul-Index": "42", "X-Cache": "HIT", "Age": "13"})
+        assert meta.index == "42"
+        assert meta.cache_hit is True
+        assert meta.age == 13
+
+    def test_miss(self) -> None:
+        meta = QueryMeta({"X-Cache": "MISS", "Age": "0"})
+        assert meta.cache_hit is False
+        assert meta.age == 0
+
+    def test_consistency(self) -> None:
+        meta = QueryMeta({
+            "X-Consul-Index": "42",
+            "X-Consul-KnownLeader": "true",
+            "X-Consul-LastContact": "1500",
+            "X-Consul-Effective-Consistency": "stale",
+        })
+        assert meta.known_leader is True
+        assert meta.last_contact == 1.5
+        assert meta.effective_consistency == "stale"
+        assert meta.content_hash is None
+        assert QueryMeta({"X-Consul-ContentHash": "a1b2"}).content_hash == "a1b2"
+        assert QueryMeta({"X-Consul-KnownLeader": "false"}).known_leader is False
+        assert "known_leader=True" in repr(meta)
+
+    def test_not_cached(self) -> None:
+        meta = QueryMeta({})
+        assert meta.index is None
+        assert meta.known_leader is None
+        assert meta.last_contact is None
+        assert meta.effective_consistency is None
+        assert meta.cache_hit is None
+        assert meta.age is None
+
+    def test_callback(self) -> None:
+        meta, data = CB.json(meta=True)(Response(200, {"X-Consul-Index": "7"}, '["a"]'))
+        assert isinstance(meta, QueryMeta)
+        assert meta.index == "7"
+        assert data == ["a"]
+
+
+class TestCached:
+    def test_health_service(self, fake_session) -> None:
+        c = consul.std.Consul()
+        c.http.session = fake_session
+        fake_session.outcomes = [http_response(200, "[]", {"X-Consul-Index": "5", "X-Cache": "HIT", "Age": "3"})]
+        meta, nodes = c.health.service("foo", cached=True, max_age="1m", stale_if_error=600)
+        assert nodes == []
+        assert (meta.index, meta.cache_hit, meta.age) == ("5", True, 3)
+        _, uri, kwargs = fake_session.calls[0]
+        assert uri == "http://127.0.0.1:8500/v1/health/service/foo?cached=1"
+        assert kwargs["headers"]["Cache-Control"] == "max-age=60, stale-if-error=600"
+
+    def test_catalog_services(self, fake_session) -> None:
+        c = consul.std.Consul()
+        c.http.session = fake_session
+        fake_session.outcomes = [http_response(200, "{}", {"X-Consul-Index": "5", "X-Cache": "MISS"})]
+        meta, services = c.catalog.services(cached=True)
+        assert services == {}
+        assert meta.cache_hit is False
+        _, uri, kwargs = fake_session.calls[0]
+        assert uri == "http://127.0.0.1:8500/v1/catalog/services?cached=1"
+        assert "Cache-Control" not in kwargs["headers"]
+
+    def test_consistent_client(self, fake_session) -> None:
+        c = consul.std.Consul(consistency="consistent")
+        c.http.session = fake_session
+        fake_session.outcomes = [http_response(200, "{}", {"X-Consul-Index": "5"})]
+        c.catalog.services(cached=True)
+        _, uri, _ = fake_session.calls[0]
+        assert uri == "http://127.0.0.1:8500/v1/catalog/services?cached=1"
+        with pytest.raises(AssertionError):
+            c.catalog.services(cached=True, consistency="consistent")
+
+    def test_query_execute(self, fake_session) -> None:
+        c = consul.std.Consul()
+        c.http.session = fake_session
+        fake_session.outcomes = [http_response(200, '{"Nodes": []}', {"X-Cache": "HIT", "Age": "1"})]
+        meta, result = c.query.execute("web", cached=True, max_age=30)
+        assert result == {"Nodes": []}
+        assert meta.age == 1
+        _, uri, kwargs = fake_session.calls[0]
+        assert uri == "http://127.0.0.1:8500/v1/query/web/execute?cached=1"
+        assert kwargs["headers"]["Cache-Control"] == "max-age=30"
+
+
+class TestMeta:
+    def test_kv_get(self, fake_session) -> None:
+        c = consul.std.Consul()
+        c.http.session = fake_session
+        headers = {"X-Consul-Index": "9", "X-Consul-KnownLeader": "true", "X-Consul-LastContact": "0"}
+        fake_session.outcomes = [http_response(200, '[{"Key": "foo", "Value": "YmFy"}]', headers)] * 2
+        meta, value = c.kv.get("foo", meta=True)
+        assert value["Value"] == b"bar"
+        assert (meta.index, meta.known_leader, meta.last_contact) == ("9", True, 0.0)
+        # the default return value is unchanged
+        index, value = c.kv.get("foo")
+        assert index == "9"
+
+    def test_health_ingress(self, fake_session) -> None:
+        c = consul.std.Consul()
+        c.http.session = fake_session
+        fake_session.outcomes = [http_response(200, "[]", {"X-Consul-Index": "3"})]
+        meta, nodes = c.health.ingress("web", meta=True)
+        assert nodes == []
+        assert meta.index == "3"
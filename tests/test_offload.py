@@ -0,0 +1,66 @@
+import json
+import threading
+
+import httpx
+
+import consul.aio
+import consul.http2
+from consul.base import Response
+from consul.callback import CB
+from consul.offload import Offloader
+
+BODY = json.dumps([{"Node": f"node{i}", "Address": "10.0.0.1"} for i in range(100)]).encode()
+
+
+def on_thread(response):
+    return threading.current_thread(), response.body
+
+
+class TestOffloader:
+    async def test_inline(self) -> None:
+        offloader = Offloader(threshold=len(BODY))
+        nodes = await offloader.decode(CB.json(), Response(200, {}, BODY))
+
+        assert len(nodes) == 100
+        assert offloader.offloaded == 0
+        assert offloader.blocked > 0
+
+    async def test_offloaded(self) -> None:
+        offloader = Offloader(threshold=len(BODY) - 1)
+        thread, body = await offloader.decode(on_thread, Response(200, {}, BODY))
+
+        assert thread is not threading.current_thread()
+        assert body == BODY.decode()
+        assert offloader.offloaded == 1
+        assert offloader.blocked == 0
+
+    async def test_disabled(self) -> None:
+        offloader = Offloader(threshold=None)
+        thread, _ = await offloader.decode(on_thread, Response(200, {}, BODY))
+
+        assert thread is threading.current_thread()
+
+    async def test_raw(self) -> None:
+        offloader = Offloader(threshold=0)
+        _, body = await offloader.decode(on_thread, Response(200, {}, BODY), raw=True)
+
+        assert body == BODY
+
+    async def test_client_options(self) -> None:
+        c = consul.aio.Consul(offload_threshold=None)
+        try:
+            assert c.http.offloader.threshold is None
+        finally:
+            await c.close()
+
+    async def test_http2(self) -> None:
+        def handler(request: httpx.Request) -> httpx.Response:  # pylint: disable=unused-argument
+            return httpx.Response(200, headers={"X-Consul-Index": "42"}, content=BODY)
+
+        http = consul.http2.AsyncHTTPClient(offload_threshold=0)
+        http._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))  # pylint: disable=protected-access
+        index, nodes = await http.get(CB.json(index=True), "/v1/catalog/nodes")
+
+        assert index == "42"
+        assert nodes[0] == {"Node": "node0", "Address": "10.0.0.1"}
+        assert http.offloader.offloaded == 1
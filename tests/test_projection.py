@@ -0,0 +1,59 @@
+import json
+from typing import Any
+
+from consul.base import Response
+from consul.callback import CB
+from consul.projection import Projection
+
+ENTRY: dict[str, Any] = {
+    "Node": {"ID": "n1", "Node": "node1", "Address": "10.0.0.1", "Meta": {"rack": "r1"}},
+    "Service": {"ID": "web1", "Service": "web", "Tags": ["a", "b"], "Port": 80, "Weights": {"Passing": 1}},
+    "Checks": [
+        {"CheckID": "serfHealth", "Status": "passing", "Output": "Agent alive and reachable"},
+        {"CheckID": "service:web1", "Status": "critical", "Output": "connection refused"},
+    ],
+}
+
+
+class TestProjection:
+    def test_paths(self) -> None:
+        projection = Projection({"Node.Address", "Service.Port", "Service.Tags", "Checks[].Status"})
+
+        assert projection(ENTRY) == {
+            "Node": {"Address": "10.0.0.1"},
+            "Service": {"Tags": ["a", "b"], "Port": 80},
+            "Checks": [{"Status": "passing"}, {"Status": "critical"}],
+        }
+        # the decoded objects are left untouched
+        assert ENTRY["Node"]["Node"] == "node1"
+
+    def test_lists(self) -> None:
+        assert Projection({"Checks.CheckID"})([ENTRY, {"Checks": None}, {}]) == [
+            {"Checks": [{"CheckID": "serfHealth"}, {"CheckID": "service:web1"}]},
+            {"Checks": None},
+            {},
+        ]
+
+    def test_whole_field(self) -> None:
+        for fields in (["Node", "Node.Address"], ["Node.Address", "Node"]):
+            assert Projection(fields)(ENTRY) == {"Node": ENTRY["Node"]}
+
+    def test_callback(self) -> None:
+        response = Response(200, {"X-Consul-Index": "3"}, json.dumps([ENTRY]))
+        cb = CB.json(index=True, fields={"Service.Port"})
+
+        assert cb(response) == ("3", [{"Service": {"Port": 80}}])
+        assert cb.key != CB.json(index=True).key
+        assert cb.key == CB.json(index=True, fields=["Service.Port"]).key
+
+    def test_callback_decode(self) -> None:
+        body = json.dumps([{"Key": "foo", "Value": "YmFy", "Flags": 0}, {"Key": "dir/", "Value": None}])
+        cb = CB.json(decode="Value", fields={"Key", "Value"})
+
+        assert cb(Response(200, {}, body)) == [{"Key": "foo", "Value": b"bar"}, {"Key": "dir/", "Value": None}]
+
+    def test_callback_stream(self) -> None:
+        body = iter([json.dumps([ENTRY, ENTRY]).encode()])
+        cb = CB.json(stream=True, fields={"Node.Node"})
+
+        assert list(cb(Response(200, {}, body))) == [{"Node": {"Node": "node1"}}] * 2
@@ -0,0 +1,78 @@
+import pytest
+
+import consul.std
+from consul.base import Response
+from consul.exceptions import RateLimited
+from consul.ratelimit import RateLimiter, TokenBucket
+from tests.utils import http_response
+
+
+class TestTokenBucket:
+    def test_burst(self) -> None:
+        bucket = TokenBucket(10, burst=3)
+        assert [bucket.acquire() for _ in range(3)] == [0.0, 0.0, 0.0]
+        assert bucket.acquire() == pytest.approx(0.1, abs=0.01)
+        # reservations queue up behind each other
+        assert bucket.acquire() == pytest.approx(0.2, abs=0.01)
+
+    def test_multiplicative_decrease(self) -> None:
+        bucket = TokenBucket(100)
+        bucket.feedback(Response(429, {}, ""))
+        assert bucket.rate == 50
+        # concurrent rejections within the cooldown only count once
+        bucket.feedback(Response(503, {}, ""))
+        assert bucket.rate == 50
+
+    def test_min_rate(self) -> None:
+        bucket = TokenBucket(100, min_rate=40, cooldown=0)
+        for _ in range(5):
+            bucket.feedback(Response(429, {}, ""))
+        assert bucket.rate == 40
+
+    def test_additive_increase(self) -> None:
+        bucket = TokenBucket(100, increase=10)
+        bucket.feedback(Response(429, {}, ""))
+        for _ in range(50):
+            bucket.feedback(Response(200, {}, ""))
+        # 50 requests at ~50 req/s make up a second, worth +10 req/s
+        assert bucket.rate == pytest.approx(60, abs=1)
+        for _ in range(10000):
+            bucket.feedback(Response(200, {}, ""))
+        assert bucket.rate == 100
+
+    def test_burst_recovery(self) -> None:
+        bucket = TokenBucket(100, burst=20, cooldown=0)
+        for _ in range(5):
+            bucket.feedback(Response(429, {}, ""))
+        assert bucket.burst == 3.125
+        for _ in range(100000):
+            bucket.feedback(Response(200, {}, ""))
+        assert bucket.rate == 100
+        assert bucket.burst == 20
+
+    def test_errors_ignored(self) -> None:
+        bucket = TokenBucket(100)
+        bucket.feedback(ConnectionError())
+        bucket.feedback(Response(404, {}, ""))
+        assert bucket.rate == 100
+
+
+class TestRateLimiter:
+    def test_classes(self) -> None:
+        limiter = RateLimiter(read=10, write=TokenBucket(5))
+        assert limiter.bucket("GET", [("dc", "dc1")]) is limiter.read
+        assert limiter.bucket("GET", [("index", "12")]) is limiter.blocking is None
+        assert limiter.bucket("GET", [("hash", "a1b2")]) is limiter.blocking
+        assert limiter.bucket("PUT") is limiter.write
+        assert limiter.write is not None
+        assert limiter.write.rate == 5
+
+    def test_transport(self, fake_session) -> None:
+        limiter = RateLimiter(read=100)
+        c = consul.std.Consul(rate_limit=limiter)
+        c.http.session = fake_session
+        fake_session.outcomes = [http_response(429, "rate limit exceeded")]
+        with pytest.raises(RateLimited):
+            c.status.leader()
+        assert limiter.read is not None
+        assert limiter.read.rate == 50
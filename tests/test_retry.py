@@ -0,0 +1,124 @@
+import email.utils
+import time
+
+import pytest
+import requests
+
+import consul
+import consul.std
+from consul.base import Response
+from consul.callback import CB
+from consul.retry import Retry
+from tests.utils import http_response
+
+
+class TestRetry:
+    def test_backoff_full_jitter(self) -> None:
+        retry = Retry(backoff=1, backoff_max=5)
+        error = ConnectionError()
+        for attempt in range(10):
+            delay = retry.delay(attempt, error)
+            assert delay is not None
+            assert 0 <= delay <= min(5, 2**attempt)
+
+    def test_final_status(self) -> None:
+        retry = Retry()
+        assert retry.delay(0, Response(200, {}, "")) is None
+        assert retry.delay(0, Response(404, {}, "")) is None
+        assert retry.delay(0, Response(503, {}, "")) is not None
+
+    def test_retry_after_seconds(self) -> None:
+        assert Retry().delay(0, Response(429, {"Retry-After": "7"}, "")) == 7.0
+
+    def test_retry_after_date(self) -> None:
+        date = email.utils.formatdate(time.time() + 60, usegmt=True)
+        delay = Retry().delay(0, Response(503, {"Retry-After": date}, ""))
+        assert delay is not None
+        assert 55 < delay <= 60
+
+    def test_retry_after_invalid(self) -> None:
+        assert Retry.retry_after(Response(503, {"Retry-After": "soon"}, "")) is None
+
+
+class TestTransport:
+    def test_retries_get(self, fake_session) -> None:
+        c = consul.std.Consul(retry=Retry(attempts=3))
+        c.http.session = fake_session
+        fake_session.outcomes = [
+            requests.ConnectionError(),
+            http_response(500, "No cluster leader"),
+            http_response(200, '"l:8300"'),
+        ]
+        assert c.status.leader() == "l:8300"
+        assert len(fake_session.calls) == 3
+
+    def test_gives_up(self, fake_session) -> None:
+        c = consul.std.Consul(retry=Retry(attempts=2))
+        c.http.session = fake_session
+        fake_session.outcomes = [http_response(500, "No cluster leader"), http_response(500, "No cluster leader")]
+        with pytest.raises(consul.ConsulException):
+            c.status.leader()
+        assert len(fake_session.calls) == 2
+
+    def test_connection_error_raised(self, fake_session) -> None:
+        c = consul.std.Consul(retry=Retry(attempts=2))
+        c.http.session = fake_session
+        fake_session.outcomes = [requests.ConnectionError(), requests.ConnectionError("refused")]
+        with pytest.raises(requests.ConnectionError, match="refused"):
+            c.status.leader()
+
+    def test_writes_not_retried(self, fake_session) -> None:
+        c = consul.std.Consul(retry=Retry(attempts=3))
+        c.http.session = fake_session
+        fake_session.outcomes = [http_response(500, "rpc error")]
+        with pytest.raises(consul.ConsulException):
+            c.kv.put("foo", "bar")
+        assert len(fake_session.calls) == 1
+
+    def test_idempotent_writes(self, fake_session) -> None:
+        c = consul.std.Consul(retry=Retry(attempts=3, methods={"GET", "PUT"}))
+        c.http.session = fake_session
+        fake_session.outcomes = [http_response(503, "rpc error"), http_response(200, "true")]
+        assert c.kv.put("foo", "bar") is True
+        assert [method for method, _, _ in fake_session.calls] == ["PUT", "PUT"]
+
+    @pytest.mark.parametrize(
+        "call",
+        [
+            lambda c: c.kv.put("foo", "bar", cas=1),
+            lambda c: c.kv.put("foo", "bar", acquire="1234"),
+            lambda c: c.session.create(),
+            lambda c: c.event.fire("deploy"),
+            lambda c: c.txn.put([{"KV": {"Verb": "get", "Key": "foo"}}]),
+        ],
+    )
+    def test_non_idempotent_writes(self, fake_session, call) -> None:
+        c = consul.std.Consul(retry=Retry(attempts=3, methods={"GET", "PUT"}))
+        c.http.session = fake_session
+        fake_session.outcomes = [http_response(503, "rpc error"), http_response(200, "true")]
+        with pytest.raises(consul.ConsulException):
+            call(c)
+        assert len(fake_session.calls) == 1
+
+    def test_idempotent_predicate(self) -> None:
+        retry = Retry(methods={"GET", "PUT"}, idempotent=lambda method, path, params: path == "/v1/session/create")
+        assert retry.allows("PUT", "/v1/session/create")
+        assert not retry.allows("PUT", "/v1/kv/foo")
+        assert not retry.allows("DELETE", "/v1/kv/foo")
+        assert retry.allows("GET", "/v1/kv/foo", [("cas", "1")])
+
+    def test_deadline(self, fake_session) -> None:
+        c = consul.std.Consul(retry=Retry(attempts=5, deadline=1))
+        c.http.session = fake_session
+        fake_session.outcomes = [http_response(429, "rate limited", {"Retry-After": "2"})]
+        with pytest.raises(consul.ConsulException):
+            c.status.leader()
+        assert len(fake_session.calls) == 1
+
+    def test_no_policy(self, fake_session) -> None:
+        c = consul.std.Consul()
+        c.http.session = fake_session
+        fake_session.outcomes = [http_response(500, "No cluster leader")]
+        with pytest.raises(consul.ConsulException):
+            c.http.get(CB.json(), "/v1/status/leader")
+        assert len(fake_session.calls) == 1
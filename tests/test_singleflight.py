@@ -0,0 +1,190 @@
+import asyncio
+import threading
+
+import pytest
+
+import consul.aio
+import consul.std
+from consul.callback import CB
+from consul.singleflight import AsyncSingleFlight, SingleFlight
+from tests.utils import http_response
+
+
+class TestSingleFlight:
+    # pylint: disable=protected-access
+
+    def test_collapse(self) -> None:
+        flights = SingleFlight()
+        started, release = threading.Event(), threading.Event()
+        calls = []
+
+        def fn(value):
+            calls.append(value)
+            started.set()
+            release.wait(5)
+            return [value]
+
+        results = []
+        leader = threading.Thread(target=lambda: results.append(flights.do("k", fn, 1)))
+        leader.start()
+        started.wait(5)
+        followers = [threading.Thread(target=lambda: results.append(flights.do("k", fn, 2))) for _ in range(3)]
+        for thread in followers:
+            thread.start()
+        while flights.collapsed < 3:
+            pass
+        release.set()
+        for thread in [leader, *followers]:
+            thread.join(5)
+
+        assert calls == [1]
+        assert results == [[1]] * 4
+        # the result is shared, not copied
+        assert all(result is results[0] for result in results)
+        assert flights.collapsed == 3
+
+        # once the call is over, a new one is made
+        release.set()
+        assert flights.do("k", fn, 3) == [3]
+
+    def test_exception(self) -> None:
+        flights = SingleFlight()
+
+        def fn():
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError, match="boom"):
+            flights.do("k", fn)
+        assert not flights._calls
+
+    def test_cached_bounded(self) -> None:
+        flights = SingleFlight()
+        flights.MAX_RESULTS = 2
+        calls = []
+
+        def fn(value):
+            calls.append(value)
+            return value
+
+        for value in (1, 2, 1, 3, 1, 2):
+            assert flights.cached(value, 60, fn, value) == value
+        # 1 was used more recently than 2 when 3 was cached
+        assert calls == [1, 2, 3, 2]
+
+
+class TestAsyncSingleFlight:
+    # pylint: disable=protected-access
+
+    async def test_collapse(self) -> None:
+        flights = AsyncSingleFlight()
+        calls = []
+
+        async def fn(value):
+            calls.append(value)
+            await asyncio.sleep(0.01)
+            return [value]
+
+        results = await asyncio.gather(*(flights.do("k", fn, i) for i in range(4)))
+        assert calls == [0]
+        assert results == [[0]] * 4
+        assert flights.collapsed == 3
+        assert not flights._calls
+
+    async def test_cached(self) -> None:
+        flights = AsyncSingleFlight()
+        calls = []
+
+        async def fn(value):
+            calls.append(value)
+            return [value]
+
+        first = await flights.cached("k", 60, fn, 1)
+        assert await flights.cached("k", 60, fn, 2) is first
+        assert await flights.cached("other", 0, fn, 3) == [3]
+        assert await flights.cached("other", 0, fn, 4) == [4]
+        assert calls == [1, 3, 4]
+
+    async def test_cancelled_caller(self) -> None:
+        flights = AsyncSingleFlight()
+
+        async def fn():
+            await asyncio.sleep(0.01)
+            return 42
+
+        first = asyncio.ensure_future(flights.do("k", fn))
+        second = asyncio.ensure_future(flights.do("k", fn))
+        await asyncio.sleep(0)
+        first.cancel()
+        # the shared call goes on for the remaining callers
+        assert await second == 42
+
+
+class TestCoalescing:
+    # pylint: disable=protected-access
+
+    def test_key(self) -> None:
+        c = consul.std.Consul(coalesce=True)
+        cb = CB.json()
+        key = c.http._coalescing_key("GET", "/v1/kv/foo", [("dc", "dc1")], {"X-Consul-Token": "t"}, cb)
+        assert key == c.http._coalescing_key("GET", "/v1/kv/foo", [("dc", "dc1")], {"X-Consul-Token": "t"}, CB.json())
+        assert key != c.http._coalescing_key("GET", "/v1/kv/foo", [("dc", "dc1")], {"X-Consul-Token": "u"}, cb)
+        assert key != c.http._coalescing_key(
+            "GET", "/v1/kv/foo", [("dc", "dc1")], {"X-Consul-Token": "t"}, CB.json(index=True)
+        )
+        # the Cache-Control directives too, the callers may accept data of different ages
+        assert c.http._coalescing_key(
+            "GET", "/v1/health/service/web", [("cached", "1")], {"Cache-Control": "max-age=1"}, cb
+        ) != c.http._coalescing_key(
+            "GET", "/v1/health/service/web", [("cached", "1")], {"Cache-Control": "max-age=3600"}, cb
+        )
+        assert c.http._coalescing_key("PUT", "/v1/kv/foo", None, None, cb) is None
+        assert c.http._coalescing_key("GET", "/v1/kv/foo", None, None, CB.json(postprocess=len)) is None
+        # the transport options of the request are part of the key
+        assert key != c.http._coalescing_key(
+            "GET", "/v1/kv/foo", [("dc", "dc1")], {"X-Consul-Token": "t"}, cb, (("max_stale", 5),)
+        )
+        assert not consul.std.Consul().http.coalesce
+
+    def test_std(self, fake_session) -> None:
+        c = consul.std.Consul(coalesce=True)
+        started, release = threading.Event(), threading.Event()
+
+        class Session:
+            def request(self, method, uri, **kwargs):
+                started.set()
+                release.wait(5)
+                return fake_session.request(method, uri, **kwargs)
+
+        c.http.session = Session()
+        fake_session.outcomes = [http_response(200, '{"Config": {}}')]
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(c.agent.self())) for _ in range(3)]
+        threads[0].start()
+        started.wait(5)
+        for thread in threads[1:]:
+            thread.start()
+        while c.http.coalesced < 2:
+            pass
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        assert len(fake_session.calls) == 1
+        assert results == [{"Config": {}}] * 3
+        assert c.http.coalesced == 2
+
+    async def test_aio(self) -> None:
+        c = consul.aio.Consul(coalesce=True)
+        calls = []
+
+        async def request(callback, method, path, params=None, **kwargs):  # pylint: disable=unused-argument
+            calls.append((method, path))
+            await asyncio.sleep(0.01)
+            return callback(consul.base.Response(200, {}, '{"Config": {}}'))
+
+        c.http._request = request
+        results = await asyncio.gather(*(c.agent.self() for _ in range(3)))
+        assert calls == [("GET", "/v1/agent/self")]
+        assert results == [{"Config": {}}] * 3
+        assert c.http.coalesced == 2
+        await c.http.close()
@@ -1,6 +1,14 @@
+import os
+import time
+
+import pytest
+import requests
+
 import consul
 import consul.check
 import consul.std
+from consul.ratelimit import RateLimiter
+from tests.utils import CannedHandler, http_response, serve_unix
 
 
 class TestHTTPClient:
@@ -8,3 +16,170 @@ class TestHTTPClient:
         http = consul.std.HTTPClient()
         assert http.uri("/v1/kv") == "http://127.0.0.1:8500/v1/kv"
         assert http.uri("/v1/kv", params=[("index", 1)]) == "http://127.0.0.1:8500/v1/kv?index=1"
+
+    def test_uri_socket_path(self) -> None:
+        http = consul.std.HTTPClient(socket_path="/var/run/consul.sock")
+        assert http.uri("/v1/kv") == "http://localhost/v1/kv"
+
+
+class LeaderHandler(CannedHandler):
+    body = b'"leader:8300"'
+
+
+@pytest.fixture
+def unix_socket(tmp_path):
+    with serve_unix(os.path.join(tmp_path, "consul.sock"), LeaderHandler) as path:
+        yield path
+
+
+class TestUnixSocket:
+    def test_request(self, monkeypatch, unix_socket) -> None:
+        monkeypatch.setenv("CONSUL_HTTP_ADDR", f"unix://{unix_socket}")
+        c = consul.std.Consul()
+        assert c.status.leader() == "leader:8300"
+
+
+class TestTimeout:
+    def test_default_timeout(self, fake_session) -> None:
+        c = consul.std.Consul()
+        c.http.session = fake_session
+        fake_session.outcomes = [http_response(200, '"l:8300"')]
+        c.status.leader()
+        assert fake_session.calls[0][2]["timeout"] == c.http.DEFAULT_TIMEOUT
+
+    def test_no_timeout(self, fake_session) -> None:
+        c = consul.std.Consul(connections_timeout=(None, None))
+        c.http.session = fake_session
+        fake_session.outcomes = [http_response(200, '"l:8300"')]
+        c.status.leader()
+        assert fake_session.calls[0][2]["timeout"] == (None, None)
+
+    def test_client_timeout(self, fake_session) -> None:
+        c = consul.std.Consul(connections_timeout=(1, 3))
+        c.http.session = fake_session
+        fake_session.outcomes = [http_response(200, '"l:8300"'), http_response(200, "[]", {"X-Consul-Index": "1"})]
+        c.status.leader()
+        c.kv.get("foo", connections_timeout=7)
+        assert [kwargs["timeout"] for _, _, kwargs in fake_session.calls] == [(1, 3), (7, 7)]
+
+    @pytest.mark.parametrize(
+        ("timeout", "wait", "want"),
+        [
+            (None, "16s", (10.0, 60.0)),
+            (None, "5m", (10.0, 323.75)),
+            (3, "16s", (3, 22.0)),
+            (3, None, (3, 323.75)),
+            ((1, 600), "1m", (1, 600)),
+        ],
+    )
+    def test_blocking_query(self, fake_session, timeout, wait, want) -> None:
+        c = consul.std.Consul(connections_timeout=timeout)
+        c.http.session = fake_session
+        fake_session.outcomes = [http_response(200, "[]", {"X-Consul-Index": "2"})]
+        c.kv.get("foo", index=1, wait=wait)
+        assert fake_session.calls[0][2]["timeout"] == want
+
+    def test_hash_blocking_query(self, fake_session) -> None:
+        c = consul.std.Consul(connections_timeout=3)
+        c.http.session = fake_session
+        fake_session.outcomes = [http_response(200, '{"ID": "web"}', {"X-Consul-ContentHash": "b2"})]
+        meta, definition = c.agent.service_definition("web", content_hash="a1", wait="16s", meta=True)
+        assert definition == {"ID": "web"}
+        assert meta.content_hash == "b2"
+        _, uri, kwargs = fake_session.calls[0]
+        assert uri == "http://127.0.0.1:8500/v1/agent/service/web?hash=a1&wait=16s"
+        assert kwargs["timeout"] == (3, 22.0)
+
+
+class TestMaxStale:
+    BODY = '[{"Key": "foo", "Value": "YmFy"}]'
+
+    def response(self, known_leader: str = "true", last_contact: str = "0") -> requests.Response:
+        return http_response(
+            200,
+            self.BODY,
+            {"X-Consul-Index": "1", "X-Consul-KnownLeader": known_leader, "X-Consul-LastContact": last_contact},
+        )
+
+    def test_fresh(self, fake_session) -> None:
+        c = consul.std.Consul(consistency="stale", max_stale="5s")
+        c.http.session = fake_session
+        fake_session.outcomes = [self.response(last_contact="4000")]
+        c.kv.get("foo")
+        assert [uri for _, uri, _ in fake_session.calls] == ["http://127.0.0.1:8500/v1/kv/foo?stale=1"]
+
+    @pytest.mark.parametrize(("known_leader", "last_contact"), [("true", "6000"), ("false", "0")])
+    def test_too_stale(self, fake_session, known_leader, last_contact) -> None:
+        c = consul.std.Consul(consistency="stale", max_stale="5s")
+        c.http.session = fake_session
+        fake_session.outcomes = [self.response(known_leader, last_contact), self.response()]
+        _, value = c.kv.get("foo")
+        assert value["Value"] == b"bar"
+        assert [uri for _, uri, _ in fake_session.calls] == [
+            "http://127.0.0.1:8500/v1/kv/foo?stale=1",
+            "http://127.0.0.1:8500/v1/kv/foo",
+        ]
+
+    def test_per_call(self, fake_session) -> None:
+        c = consul.std.Consul(consistency="stale")
+        c.http.session = fake_session
+        fake_session.outcomes = [self.response(last_contact="6000")]
+        c.kv.get("foo")
+        assert len(fake_session.calls) == 1
+
+        fake_session.outcomes = [self.response(last_contact="6000"), self.response()]
+        c.kv.get("foo", max_stale=1)
+        assert len(fake_session.calls) == 3
+
+    def test_not_stale(self, fake_session) -> None:
+        c = consul.std.Consul(max_stale=1)
+        c.http.session = fake_session
+        fake_session.outcomes = [self.response(known_leader="false")]
+        c.catalog.nodes()
+        assert len(fake_session.calls) == 1
+
+
+class TestAgentHealth:
+    BODY = '{"AggregatedStatus": "%s", "Service": {"ID": "web"}, "Checks": []}'
+
+    @pytest.mark.parametrize(("code", "status"), [(200, "passing"), (429, "warning"), (503, "critical")])
+    def test_status(self, fake_session, code, status) -> None:
+        c = consul.std.Consul(retry=consul.Retry(), rate_limit=RateLimiter(read=10))
+        c.http.session = fake_session
+        fake_session.outcomes = [http_response(code, self.BODY % status)]
+        health = c.agent.service.health_by_id("web")
+        assert health is not None
+        assert health["AggregatedStatus"] == status
+        # these statuses are neither retried nor throttled
+        assert len(fake_session.calls) == 1
+        assert c.rate_limit is not None
+        assert c.rate_limit.read is not None
+        assert c.rate_limit.read.rate == 10
+
+    def test_not_found(self, fake_session) -> None:
+        c = consul.std.Consul()
+        c.http.session = fake_session
+        fake_session.outcomes = [http_response(404, "not found")] * 2
+        assert c.agent.service.health_by_id("web") is None
+        assert c.agent.service.health_by_name("web") == []
+
+    def test_error(self, fake_session) -> None:
+        c = consul.std.Consul()
+        c.http.session = fake_session
+        fake_session.outcomes = [http_response(503, "Service Unavailable")]
+        with pytest.raises(consul.ConsulException):
+            c.agent.service.health_by_name("web")
+
+    def test_reuse_for(self, fake_session, monkeypatch) -> None:
+        c = consul.std.Consul()
+        c.http.session = fake_session
+        fake_session.outcomes = [http_response(200, f"[{self.BODY % 'passing'}]")] * 2
+        now = [100.0]
+        monkeypatch.setattr(time, "monotonic", lambda: now[0])
+        first = c.agent.service.health_by_name("web", reuse_for=1)
+        assert c.agent.service.health_by_name("web", reuse_for=1) is first
+        assert len(fake_session.calls) == 1
+        now[0] += 2
+        c.agent.service.health_by_name("web", reuse_for=1)
+        assert len(fake_session.calls) == 2
+        assert fake_session.calls[0][1] == "http://127.0.0.1:8500/v1/agent/health/service/name/web"
@@ -0,0 +1,156 @@
+import base64
+import http.server
+import json
+import threading
+from typing import Any
+
+import httpx
+import pytest
+
+import consul
+import consul.aio
+import consul.http2
+import consul.std
+from consul.stream import ArrayParser
+
+ENTRIES = [
+    {"Key": f"big/{i}", "Value": base64.b64encode(f"é{i}".encode()).decode(), "ModifyIndex": i} for i in range(500)
+]
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:
+        if self.path.startswith("/v1/kv/missing"):
+            self.send_response(404)
+            self.send_header("X-Consul-Index", "7")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if self.path.startswith("/v1/health/state/"):
+            body = b"rpc error: No cluster leader"
+            self.send_response(500)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        body = json.dumps(ENTRIES).encode()
+        self.send_response(200)
+        self.send_header("X-Consul-Index", "42")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        for start in range(0, len(body), 1000):
+            self.wfile.write(body[start : start + 1000])
+
+    def log_message(self, format, *args) -> None:  # pylint: disable=redefined-builtin
+        pass
+
+
+@pytest.fixture
+def server():
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server.server_address[1]
+    server.shutdown()
+    server.server_close()
+
+
+def feed(document: bytes, size: int) -> list:
+    parser = ArrayParser()
+    items = []
+    for start in range(0, len(document), size):
+        items += parser.feed(document[start : start + size])
+    return items + parser.close()
+
+
+class TestArrayParser:
+    @pytest.mark.parametrize("size", [1, 2, 7, 100, 1 << 20])
+    def test_chunks(self, size) -> None:
+        document: list[Any] = [{"Node": "é" * i, "Tags": ["a", "b"]} for i in range(50)] + [
+            12345,
+            1.5,
+            True,
+            None,
+            "x",
+            [],
+        ]
+        assert feed(json.dumps(document).encode(), size) == document
+
+    def test_empty(self) -> None:
+        assert not feed(b" [ ]\n", 1)
+
+    def test_number_split(self) -> None:
+        parser = ArrayParser()
+        assert not parser.feed(b"[12")
+        assert parser.feed(b"34, 5") == [1234]
+        assert parser.feed(b"]") == [5]
+        assert not parser.close()
+
+    def test_items_as_received(self) -> None:
+        parser = ArrayParser()
+        assert parser.feed(b'[{"a": 1}, {"b"') == [{"a": 1}]
+        assert parser.feed(b": 2}]") == [{"b": 2}]
+
+    @pytest.mark.parametrize("document", [b"", b"[", b"[1,", b'{"a": 1}', b"[1 2]", b"[1,]"])
+    def test_invalid(self, document) -> None:
+        with pytest.raises(json.JSONDecodeError):
+            feed(document, 1)
+
+
+class TestStream:
+    def test_kv(self, server) -> None:
+        c = consul.std.Consul(port=server)
+        index, entries = c.kv.get("big", recurse=True, stream=True)
+
+        assert index == "42"
+        assert not isinstance(entries, list)
+        assert [entry["Value"] for entry in entries] == [f"é{i}".encode() for i in range(500)]
+
+    def test_close(self, server) -> None:
+        c = consul.std.Consul(port=server)
+        _, entries = c.kv.get("big", recurse=True, stream=True)
+        assert next(entries)["Key"] == "big/0"
+        entries.close()
+        # the connection was released
+        _, entries = c.kv.get("big", recurse=True, stream=True)
+        assert len(list(entries)) == 500
+
+    def test_not_found(self, server) -> None:
+        c = consul.std.Consul(port=server)
+        assert c.kv.get("missing", recurse=True, stream=True) == ("7", None)
+
+    def test_error(self, server) -> None:
+        c = consul.std.Consul(port=server)
+        with pytest.raises(consul.ConsulException, match="No cluster leader"):
+            c.health.state("any", stream=True)
+
+    def test_not_a_list(self) -> None:
+        with pytest.raises(AssertionError):
+            consul.std.Consul().kv.get("foo", stream=True)
+
+    async def test_aio(self, server) -> None:
+        c = consul.aio.Consul(port=server)
+        try:
+            index, entries = await c.kv.get("big", recurse=True, stream=True)
+            assert index == "42"
+            assert [entry["Key"] async for entry in entries] == [f"big/{i}" for i in range(500)]
+            with pytest.raises(consul.ConsulException, match="No cluster leader"):
+                await c.health.state("any", stream=True)
+        finally:
+            await c.close()
+
+    def test_http2(self) -> None:
+        def handler(request: httpx.Request) -> httpx.Response:  # pylint: disable=unused-argument
+            return httpx.Response(200, headers={"X-Consul-Index": "42"}, json=ENTRIES[:3])
+
+        http = consul.http2.HTTPClient()
+        http._client = httpx.Client(transport=httpx.MockTransport(handler))  # pylint: disable=protected-access
+        c = consul.std.Consul()
+        c.http = http
+        index, nodes = c.catalog.nodes(stream=True)
+
+        assert index == "42"
+        assert list(nodes) == ENTRIES[:3]
@@ -0,0 +1,202 @@
+import contextlib
+import http.server
+import json
+import os
+import select
+import shutil
+import socket
+import ssl
+import subprocess
+import threading
+
+import pytest
+
+import consul.aio
+import consul.http2
+import consul.std
+from consul.tls import client_context, reload
+
+
+class ConnectProxy(http.server.BaseHTTPRequestHandler):
+    """HTTP proxy tunnelling the connections it's asked to CONNECT"""
+
+    tunnels: list[str] = []
+
+    def do_CONNECT(self) -> None:
+        host, port = self.path.rsplit(":", 1)
+        self.tunnels.append(self.path)
+        self.close_connection = True
+        with socket.create_connection((host, int(port))) as upstream:
+            self.send_response(200)
+            self.end_headers()
+            peers = {self.connection: upstream, upstream: self.connection}
+            while True:
+                readable, _, _ = select.select(list(peers), [], [], 5)
+                if not readable:
+                    return
+                for sock in readable:
+                    data = sock.recv(65536)
+                    if not data:
+                        return
+                    peers[sock].sendall(data)
+
+    def log_message(self, format, *args) -> None:  # noqa: A002 pylint: disable=redefined-builtin
+        pass
+
+
+class Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:
+        body = json.dumps(self.connection.session_reused).encode()  # type: ignore[attr-defined]
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args) -> None:  # noqa: A002 pylint: disable=redefined-builtin
+        pass
+
+
+@pytest.fixture(scope="module")
+def certificate(tmp_path_factory) -> tuple[str, str]:
+    if shutil.which("openssl") is None:
+        pytest.skip("openssl is required to generate a certificate")
+    path = tmp_path_factory.mktemp("tls")
+    cert, key = str(path / "cert.pem"), str(path / "key.pem")
+    subprocess.run(
+        [
+            "openssl",
+            "req",
+            "-x509",
+            "-newkey",
+            "rsa:2048",
+            "-nodes",
+            "-days",
+            "1",
+            "-subj",
+            "/CN=localhost",
+            "-addext",
+            "subjectAltName=IP:127.0.0.1",
+            "-keyout",
+            key,
+            "-out",
+            cert,
+        ],
+        check=True,
+        capture_output=True,
+    )
+    return cert, key
+
+
+@contextlib.contextmanager
+def serve(certificate):
+    """Port of an HTTPS server answering whether the TLS session was resumed"""
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+    context.load_cert_chain(*certificate)
+    server.socket = context.wrap_socket(server.socket, server_side=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server.server_address[1]
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture(scope="module")
+def agent(certificate):
+    with serve(certificate) as port:
+        yield port
+
+
+class TestClientContext:
+    def test_shared(self, certificate) -> None:
+        cert, key = certificate
+        context = client_context(cert, [cert, key])
+        assert client_context(cert, (cert, key)) is context
+        assert client_context(cert, (cert, key), http2=True) is not context
+        assert client_context(False) is not client_context(True)
+        assert client_context(False).verify_mode == ssl.CERT_NONE
+
+    def test_rotation(self, certificate, tmp_path) -> None:
+        cert = tmp_path / "ca.pem"
+        shutil.copy(certificate[0], cert)
+        context = client_context(str(cert))
+        assert client_context(str(cert)) is context
+        os.utime(cert, ns=(0, cert.stat().st_mtime_ns + 1))
+        rotated = client_context(str(cert))
+        assert rotated is not context
+        reload()
+        assert client_context(str(cert)) is not rotated
+
+    def test_transports(self, certificate) -> None:
+        cert, _ = certificate
+        std = consul.std.HTTPClient(scheme="https", verify=cert)
+        http2 = consul.http2.HTTPClient(scheme="https", verify=cert)
+        try:
+            adapter = std.session.get_adapter("https://")
+            assert isinstance(adapter, consul.std.TLSAdapter)
+            assert adapter.ssl_context is client_context(cert)
+            assert http2._ssl_context() is client_context(cert, http2=True)  # pylint: disable=protected-access
+        finally:
+            std.close()
+            http2.close()
+
+
+class TestProxy:
+    def test_std(self, agent, certificate, monkeypatch) -> None:
+        proxy = http.server.ThreadingHTTPServer(("127.0.0.1", 0), ConnectProxy)
+        threading.Thread(target=proxy.serve_forever, daemon=True).start()
+        for name in ("NO_PROXY", "no_proxy", "https_proxy"):
+            monkeypatch.delenv(name, raising=False)
+        monkeypatch.setenv("HTTPS_PROXY", f"http://127.0.0.1:{proxy.server_address[1]}")
+        c = consul.std.Consul(port=agent, scheme="https", verify=certificate[0])
+        try:
+            # the agent certificate is verified against the custom CA
+            assert c.status.leader() in (True, False)
+        finally:
+            c.http.close()
+            proxy.shutdown()
+            proxy.server_close()
+        assert ConnectProxy.tunnels == [f"127.0.0.1:{agent}"]
+
+
+class TestResumption:
+    def test_std(self, agent, certificate) -> None:
+        for _ in range(2):
+            c = consul.std.Consul(port=agent, scheme="https", verify=certificate[0])
+            resumed = c.status.leader()
+            c.http.close()
+        assert resumed is True
+
+    async def test_aio(self, agent, certificate) -> None:
+        for _ in range(2):
+            c = consul.aio.Consul(port=agent, scheme="https", verify=certificate[0])
+            try:
+                resumed = await c.status.leader()
+            finally:
+                await c.close()
+        assert resumed is True
+
+    async def test_http2(self, agent, certificate) -> None:
+        for _ in range(2):
+            c = consul.aio.Consul(port=agent, scheme="https", verify=certificate[0], http2=True)
+            try:
+                resumed = await c.status.leader()
+            finally:
+                await c.close()
+        assert resumed is True
+
+    def test_agent_restart(self, agent, certificate) -> None:
+        consul.std.Consul(port=agent, scheme="https", verify=certificate[0]).status.leader()
+        # the new agent doesn't know the session, hence a full handshake
+        with serve(certificate) as port:
+            for resumed in (False, True):
+                c = consul.std.Consul(port=port, scheme="https", verify=certificate[0])
+                try:
+                    assert c.status.leader() is resumed
+                finally:
+                    c.http.close()
@@ -1,7 +1,17 @@
 from __future__ import annotations
 
+import contextlib
+import http.server
+import socketserver
+import threading
+from typing import TYPE_CHECKING
+
+import requests
 from packaging import version
 
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
 
 def find_recursive(list_or_single_dict: list[dict] | dict, wanted: list[dict] | dict) -> bool:
     """
@@ -58,3 +68,58 @@ def should_skip(version_str: str, comparator: str, ref_version_str: str) -> bool
         return True
 
     return False
+
+
+def http_response(code: int, body: str = "", headers: dict[str, str] | None = None) -> requests.Response:
+    """Builds a `requests.Response` as returned by the std transport's session"""
+    response = requests.Response()
+    response.status_code = code
+    response._content = body.encode("utf-8")  # pylint: disable=protected-access
+    response.headers.update(headers or {})
+    return response
+
+
+class CannedHandler(http.server.BaseHTTPRequestHandler):
+    """Answers every request with the JSON *body* and the *extra_headers* of the class"""
+
+    protocol_version = "HTTP/1.1"
+    body = b"null"
+    extra_headers: dict[str, str] = {}
+
+    def _reply(self) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(self.body)))
+        for name, value in self.extra_headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(self.body)
+
+    do_GET = do_PUT = do_DELETE = do_POST = _reply
+
+    def log_message(self, format, *args) -> None:  # noqa: A002 pylint: disable=redefined-builtin
+        pass
+
+    def address_string(self) -> str:
+        # unix socket peers have no (host, port) address
+        return "local"
+
+
+class ThreadingUnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+@contextlib.contextmanager
+def serve_unix(path: str, handler: type[CannedHandler]) -> Iterator[str]:
+    """Serves *handler* on the unix socket at *path* in a thread"""
+    server = ThreadingUnixHTTPServer(path, handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield path
+    finally:
+        server.shutdown()
+        server.server_close()